@@ -0,0 +1,95 @@
+#-------------------------------------------------------------------------------
+# rbtlib: composite.py
+#
+# Measure composite construction for a large Review Request List Resource.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+import sys
+import timeit
+from rbtlib.resource.record import Record
+from rbtlib.resource.registry import TypeRegistry
+from rbtlib.resource.resource import Resource
+from rbtlib.standin import Dataset, payload
+
+
+def measure(resource, response, repeat, number):
+    """Time the construction of a composite.
+
+    Args:
+        resource: the resource building the composite.
+        response: the decoded JSON response.
+        repeat: the number of measurements taken.
+        number: the number of composites built in each measurement.
+
+    Returns:
+        The best time, in seconds, required to build one composite.
+    """
+    build = lambda: resource.component(resource.name, response, { 'json': response })
+    return min(timeit.repeat(build, repeat = repeat, number = number)) / number
+
+
+def footprint(composite):
+    """Measure the memory held by the components of a composite.
+
+    Only the components are counted; the values they hold are shared with the
+    decoded JSON response.
+
+    Args:
+        composite: a composite object.
+
+    Returns:
+        The size, in bytes, of the components and the lists holding them.
+    """
+    if isinstance(composite, (Record, tuple, list)):
+        return sys.getsizeof(composite) + sum(footprint(x) for x in composite)
+    return 0
+
+
+def main(count = 200, repeat = 3, number = 3):
+    """Compare composite construction using named tuples and records."""
+    response = payload.review_requests(Dataset(count),
+            'https://reviews.example.com', { 'max-results': count,
+                'status': 'all' })
+    uncached = Resource(None, 'review_requests')
+    uncached.registry = TypeRegistry(maxsize = 0, table = dict())
+    cached = Resource(None, 'review_requests')
+    cached.registry = TypeRegistry(table = dict())
+    records = Resource(None, 'review_requests')
+    before = measure(uncached, response, repeat, number)
+    after = measure(cached, response, repeat, number)
+    slots = measure(records, response, repeat, number)
+    tuples = footprint(cached.component(cached.name, response,
+        { 'json': response }))
+    fields = footprint(records.component(records.name, response,
+        { 'json': response }))
+    print 'review_requests with {0} items'.format(count)
+    print '  uncached types: {0:8.2f} ms'.format(before * 1000)
+    print '  cached types:   {0:8.2f} ms'.format(after * 1000)
+    print '  records:        {0:8.2f} ms'.format(slots * 1000)
+    print '  speed-up:       {0:8.1f}x'.format(before / slots)
+    print '  named tuples:   {0:8d} bytes'.format(tuples)
+    print '  records:        {0:8d} bytes'.format(fields)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,117 @@
+#-------------------------------------------------------------------------------
+# rbtlib: decode.py
+#
+# Compare JSON decoders on a large Review Request List Resource.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+import json
+import requests
+from rbtlib.resource import decoder
+from rbtlib.standin import Dataset, payload
+import sys
+import timeit
+
+
+def response(content):
+    """Construct the HTTP response returned by Review Board.
+
+    Args:
+        content: the response content.
+
+    Returns:
+        A requests Response without a character set, as Review Board sends.
+    """
+    r = requests.Response()
+    r._content = content
+    return r
+
+
+def measure(decode, content, repeat, number):
+    """Time the decoding of a response.
+
+    Args:
+        decode: a function object decoding the response content.
+        content: the response content.
+        repeat: the number of measurements taken.
+        number: the number of responses decoded in each measurement.
+
+    Returns:
+        The best time, in seconds, required to decode one response.
+    """
+    return min(timeit.repeat(lambda: decode(content), repeat = repeat,
+        number = number)) / number
+
+
+def decoders():
+    """Name the decoders to compare.
+
+    Returns:
+        A list of tuples containing the name of a decoder and a function object
+        decoding response content.
+    """
+    result = [
+        ('response.json()', lambda content: response(content).json()),
+        ('json', lambda content: decoder.loads(content, json.loads)),
+    ]
+    for name in ( 'orjson', 'ujson' ):
+        parse = decoder.fastest(( name, ))
+        if json.loads != parse:
+            result.append((name, lambda content, parse = parse:
+                decoder.loads(content, parse)))
+    return result
+
+
+def payloads(count):
+    """Provide the synthetic payloads.
+
+    Args:
+        count: the number of review requests in the list payload.
+
+    Returns:
+        A list of tuples containing a payload name and its content.
+    """
+    url = 'https://reviews.example.com'
+    dataset = Dataset(count)
+    result = [
+        ('root', payload.root(url)),
+        ('session', payload.session(url, 'admin')),
+        ('review_request', { 'review_request':
+            payload.review_request(dataset.get(1), url), 'stat': 'ok' }),
+        ('review_requests with {0} items'.format(count),
+            payload.review_requests(dataset, url, { 'max-results': count,
+                'status': 'all' })),
+    ]
+    return [ (x, json.dumps(y)) for x, y in result ]
+
+
+def main(count = 200, repeat = 3, number = 20):
+    """Compare decoding using requests and each installed parser."""
+    for name, content in payloads(count):
+        print '{0} ({1} bytes)'.format(name, len(content))
+        for decoder_name, decode in decoders():
+            print '  {0:16} {1:8.3f} ms'.format(decoder_name,
+                    measure(decode, content, repeat, number) * 1000)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,70 @@
+#-------------------------------------------------------------------------------
+# rbtlib: paging.py
+#
+# Page through review requests served by the stand-in Review Board server.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+from rbtlib import Root
+from rbtlib.standin import Application, Dataset, Server
+import sys
+import time
+
+
+def measure(review_requests, query_dict, jobs):
+    """Time paging through a list resource.
+
+    Args:
+        review_requests: the Review Request List Resource factory.
+        query_dict: the HTTP command parameters.
+        jobs: the maximum number of pages requested concurrently.
+
+    Returns:
+        A tuple containing the number of review requests and the time, in
+        seconds, required to obtain them.
+    """
+    start = time.time()
+    count = sum(len(x.json['review_requests']) for x in
+            review_requests.iter_pages(query_dict, jobs))
+    return count, time.time() - start
+
+
+def main(count = 10000, max_results = 200, jobs = ( 1, 4, 8 )):
+    """Compare paging sequentially and concurrently.
+
+    The server runs in this process, so the measurements are repeatable but
+    client and server compete for the interpreter.
+    """
+    with Server(Application(Dataset(count))) as server:
+        review_requests = Root(None, server.url)().review_requests
+        query_dict = { 'status': 'all', 'max-results': max_results }
+        print 'review_requests with {0} items, {1} per page'.format(count,
+                max_results)
+        for n in jobs:
+            items, elapsed = measure(review_requests, query_dict, n)
+            assert count == items
+            print '  jobs {0:2}: {1:8.2f} s {2:8.0f} items/s'.format(n,
+                    elapsed, items / elapsed)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -24,10 +24,13 @@
 # FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
 # IN THE SOFTWARE.
 #-------------------------------------------------------------------------------
+import json
 import pytest
 from rbtlib import Root, user
+from rbtlib.standin import Application, Dataset, Server
 import re
 import requests
+import urlparse
 
 
 class ReviewBoardServer(object):
@@ -74,10 +77,35 @@ class DemonstrationServer(ReviewBoardServer):
         return True
 
 
+class StandInServer(ReviewBoardServer):
+    """Server parameters for the stand-in Review Board server on localhost.
+    """
+
+    def __init__(self, standin):
+        super(StandInServer, self).__init__('http', standin.fqdn)
+
+    def can_authenticate(self):
+        """Determine if the these can authenticate to the server.
+
+        The stand-in login page is worded as the demo login page.
+        """
+        return True
+
+
+def pytest_addoption(parser):
+    """Add the --offline option, using the stand-in server only."""
+    parser.addoption('--offline', action = 'store_true', default = False,
+            help = 'skip tests using reviews.reviewboard.org and '
+            'demo.reviewboard.org')
+
+
 def pytest_generate_tests(metafunc):
     """Create parameterized tests for different server classes."""
     if 'server' in metafunc.fixturenames:
-        metafunc.parametrize("server", ['production', 'demonstration'], indirect=True)
+        servers = ['production', 'demonstration', 'standin']
+        if metafunc.config.getoption('offline'):
+            servers = ['standin']
+        metafunc.parametrize("server", servers, indirect=True)
 
 
 @pytest.fixture
@@ -87,9 +115,22 @@ def server(request):
         return ReviewBoardServer('https', 'reviews.reviewboard.org')
     if 'demonstration' == request.param:
         return DemonstrationServer()
+    if 'standin' == request.param:
+        return StandInServer(request.getfixturevalue('standin_server'))
     raise ValueError("invalid internal test config")
 
 
+@pytest.fixture(autouse = True)
+def rbtlib_home(monkeypatch, tmpdir):
+    """Keep the sessions, API tokens and hosts saved by tests out of ~/.rbtlib.
+
+    The environment is inherited by the scripts tests run as subprocesses.
+    """
+    home = tmpdir.join('rbtlib')
+    monkeypatch.setenv('RBTLIB_HOME', str(home))
+    return home
+
+
 @pytest.fixture
 def session():
     """Return the HTTP session.
@@ -161,3 +202,242 @@ def login(session, server, credentials):
         pytest.skip("cannot authenticate to server: {}".format(server.fqdn))
     if 200 != user.login(session, server.url, credentials['username'], credentials['password']):
         pytest.fail("cannot login to server: {}".format(server.fqdn))
+
+
+class RecordedSession(object):
+    """HTTP session replaying recorded Review Board responses.
+
+    Attributes:
+        responses: recorded responses keyed by HTTP method and URL.
+        requests: the HTTP commands issued through the session.
+    """
+
+    def __init__(self):
+        self.responses = dict()
+        self.requests = list()
+        self.headers = dict()
+
+    def add(self, method, url, payload, content_type, status_code = 200,
+            headers = dict()):
+        """Record a response.
+
+        Args:
+            method: the HTTP method.
+            url: the URL, without a query string.
+            payload: the JSON payload or a function object computing the
+                payload from the HTTP command parameters.
+            content_type: the HTTP Content-Type.
+            status_code: the HTTP status code.
+            headers: additional HTTP headers.
+        """
+        self.responses[(method, url)] = (payload, content_type, status_code,
+                headers)
+
+    def request(self, method, url, params = None, data = None, headers = None,
+            **kwargs):
+        """Replay the response recorded for the HTTP command."""
+        url, query = urlparse.urldefrag(url)[0].partition('?')[::2]
+        params = dict(urlparse.parse_qsl(query), **(params or dict()))
+        self.requests.append((method, url, params or data, headers))
+        payload, content_type, status_code, extra_headers = \
+                self.responses[(method, url)]
+        if callable(payload):
+            payload = payload(params or data or dict())
+        response = requests.Response()
+        response.status_code = status_code
+        response.url = url
+        response.encoding = 'utf-8'
+        response.headers['Content-Type'] = content_type
+        response.headers.update(extra_headers)
+        response._content = json.dumps(payload) if None != payload else ''
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request('PUT', url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+
+# Recorded server URL.
+recorded_url = 'https://reviews.example.com'
+
+
+@pytest.fixture
+def recorded_session():
+    """Return an HTTP session replaying a recorded Root List Resource."""
+    session = RecordedSession()
+    api = recorded_url + '/api/'
+    session.add('GET', api, {
+        'stat': 'ok',
+        'links': {
+            'self': { 'href': api, 'method': 'GET' },
+            'review_requests': { 'href': api + 'review-requests/', 'method': 'GET' },
+            'session': { 'href': api + 'session/', 'method': 'GET' },
+        },
+        'uri_templates': {
+            'review_request': api + 'review-requests/{review_request_id}/',
+            'user': api + 'users/{username}/',
+        },
+    }, 'application/vnd.reviewboard.org.root+json')
+    return session
+
+
+def recorded_review_requests(total_results, max_results_limit = 200):
+    """Create a recorded Review Request List Resource.
+
+    Args:
+        total_results: the number of review requests in the list.
+        max_results_limit: the largest page returned, as Review Board caps
+            the page size.
+
+    Returns:
+        A function object computing a page of the list from the HTTP command
+        parameters.
+    """
+    href = recorded_url + '/api/review-requests/'
+    def page(query_dict):
+        if query_dict.get('counts-only'):
+            return { 'stat': 'ok', 'count': total_results }
+        start = int(query_dict.get('start', 0))
+        max_results = min(max_results_limit,
+                int(query_dict.get('max-results', 25)))
+        links = {
+            'create': { 'href': href, 'method': 'POST' },
+            'self': { 'href': href, 'method': 'GET' },
+        }
+        if start + max_results < total_results:
+            links['next'] = {
+                'href': href + '?start={0}&max-results={1}'.format(
+                    start + max_results, max_results),
+                'method': 'GET',
+            }
+        end = min(start + max_results, total_results)
+        return {
+            'links': links,
+            'review_requests': [ { 'id': i, 'summary': 'Review request {0}'.format(i) }
+                for i in range(start, end) ],
+            'stat': 'ok',
+            'total_results': total_results,
+        }
+    return page
+
+
+def review_request_history(review_requests):
+    """Create a Review Request List Resource filtering recorded review requests.
+
+    Supports the status, last-updated-from, time-added-from, time-added-to,
+    counts-only, start, max-results and only-fields parameters. Review
+    requests are listed in order of last update, most recent first.
+
+    Args:
+        review_requests: a list of review requests, which may be changed
+            between requests.
+
+    Returns:
+        A function object computing a page of the list from the HTTP command
+        parameters.
+    """
+    href = recorded_url + '/api/review-requests/'
+    def page(query_dict):
+        status = query_dict.get('status', 'pending')
+        selected = sorted([ x for x in review_requests
+            if ('all' == status or status == x['status'])
+            and query_dict.get('last-updated-from', '') <= x['last_updated']
+            and query_dict.get('time-added-from', '') <= x['time_added']
+            and x['time_added'] < query_dict.get('time-added-to', '~') ],
+            key = lambda x: x['last_updated'], reverse = True)
+        if query_dict.get('counts-only'):
+            return { 'stat': 'ok', 'count': len(selected) }
+        start = int(query_dict.get('start', 0))
+        max_results = int(query_dict.get('max-results', 25))
+        links = { 'self': { 'href': href, 'method': 'GET' } }
+        if start + max_results < len(selected):
+            links['next'] = {
+                'href': href + '?start={0}&max-results={1}'.format(
+                    start + max_results, max_results),
+                'method': 'GET',
+            }
+        items = selected[start:start + max_results]
+        if 'only-fields' in query_dict:
+            fields = query_dict['only-fields'].split(',')
+            items = [ dict((x, y) for x, y in item.iteritems() if x in fields)
+                    for item in items ]
+        return {
+            'links': links,
+            'review_requests': items,
+            'stat': 'ok',
+            'total_results': len(selected),
+        }
+    return page
+
+
+def review_request(i, status = 'pending', submitter = 'admin',
+        repository = 'rbtlib', summary = None, description = '',
+        time_added = '2016-01-01T00:00:00Z', last_updated = None):
+    """Create a recorded review request.
+
+    Returns:
+        A dictionary containing the review request.
+    """
+    return {
+        'id': i,
+        'status': status,
+        'summary': summary or 'Review request {0}'.format(i),
+        'description': description,
+        'time_added': time_added,
+        'last_updated': last_updated or time_added,
+        'links': {
+            'submitter': { 'href': recorded_url + '/api/users/' + submitter + '/',
+                'method': 'GET', 'title': submitter },
+            'repository': { 'href': recorded_url + '/api/repositories/1/',
+                'method': 'GET', 'title': repository },
+        },
+    }
+
+
+@pytest.fixture
+def review_requests_session(recorded_session):
+    """Return an HTTP session replaying a recorded Review Request List Resource.
+    """
+    recorded_session.add('GET', recorded_url + '/api/review-requests/',
+            recorded_review_requests(60),
+            'application/vnd.reviewboard.org.review-requests+json')
+    return recorded_session
+
+
+@pytest.fixture(scope = 'session')
+def standin():
+    """Start a stand-in Review Board server on localhost.
+
+    The server is shared by the test suite. It serves 1,000 synthetic review
+    requests, which are the same every run.
+    """
+    with Server(Application(Dataset(count = 1000))) as server:
+        yield server
+
+
+@pytest.fixture(scope = 'session')
+def standin_server():
+    """Start the stand-in Review Board server used in place of live servers.
+
+    Tests using the server fixture create review requests, so they do not
+    share the server started by the standin fixture.
+    """
+    with Server(Application(Dataset(count = 1000))) as server:
+        yield server
+
+
+@pytest.fixture
+def standin_login(session, standin):
+    """Login to the stand-in Review Board server."""
+    application = standin.application
+    if 200 != user.login(session, standin.url, application.username,
+            application.password):
+        pytest.fail("cannot login to server: {}".format(standin.fqdn))
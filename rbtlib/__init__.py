@@ -28,6 +28,7 @@ __all__ = [
     "Resource",
     "ResourceFactory",
     "Root",
+    "fetch_all",
     "rbt",
     "user",
 ]
@@ -37,6 +38,7 @@ from rbt import rbt
 from root import Root
 from resource import Resource
 from resource import ResourceFactory
+from resource import fetch_all
 import user
 
 
@@ -0,0 +1,182 @@
+#-------------------------------------------------------------------------------
+# rbtlib: formats.py
+#
+# Output formats for lists of records.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+import collections
+import csv
+import json
+from types import DictType, ListType, UnicodeType
+
+
+# Output formats supported by write.
+formats = [ 'json', 'ndjson', 'csv' ]
+
+
+def select(record, fields):
+    """Select fields from a record.
+
+    Args:
+        record: a dictionary.
+        fields: a list of field names or None to select every field. Names of
+            fields in nested dictionaries are joined using a period (e.g.,
+            links.submitter.title).
+
+    Returns:
+        A dictionary containing the selected fields, in the order given. Fields
+        missing from the record are None.
+    """
+    if not fields:
+        return record
+    result = collections.OrderedDict()
+    for field in fields:
+        value = record
+        for key in field.split('.'):
+            value = value.get(key) if type(value) is DictType else None
+        result[field] = value
+    return result
+
+
+def json_array(pages):
+    """Format records as a JSON array, formatted for readability.
+
+    Args:
+        pages: an iterable containing lists of records.
+
+    Returns:
+        A generator yielding the JSON array in chunks. The records of each page
+        are yielded as soon as the page is obtained; None separates pages.
+    """
+    separator = '['
+    for page in pages:
+        for record in page:
+            yield separator + '\n  ' + json.dumps(record,
+                    sort_keys = type(record) is not collections.OrderedDict,
+                    indent = 2).replace('\n', '\n  ')
+            separator = ','
+        yield None
+    yield '[]\n' if '[' == separator else '\n]\n'
+
+
+def ndjson_lines(pages):
+    """Format records as newline-delimited JSON.
+
+    Args:
+        pages: an iterable containing lists of records.
+
+    Returns:
+        A generator yielding one compact JSON line for each record. None
+        separates pages.
+    """
+    for page in pages:
+        for record in page:
+            yield json.dumps(record, separators = (',', ':')) + '\n'
+        yield None
+
+
+def csv_value(value):
+    """Convert a value into a CSV field.
+
+    Args:
+        value: a value contained in a record.
+
+    Returns:
+        A UTF-8 byte string. Lists and dictionaries are encoded as JSON.
+    """
+    if None == value:
+        return ''
+    if type(value) is DictType or type(value) is ListType:
+        return json.dumps(value, separators = (',', ':'))
+    if type(value) is UnicodeType:
+        return value.encode('utf-8')
+    return str(value)
+
+
+class Rows(object):
+    """Accumulate the rows written by a CSV writer."""
+
+    def __init__(self):
+        self.rows = list()
+
+    def write(self, row):
+        self.rows.append(row)
+
+
+def csv_rows(pages, fields = None):
+    """Format records as comma separated values.
+
+    Args:
+        pages: an iterable containing lists of records.
+        fields: the columns, or None to use the fields of the first record
+            (sorted, unless the record is ordered).
+
+    Returns:
+        A generator yielding the header row followed by one row for each
+        record. None separates pages.
+    """
+    rows = Rows()
+    writer = csv.writer(rows, lineterminator = '\n')
+    header = True
+    for page in pages:
+        for record in page:
+            if header:
+                fields = fields or (list(record) if type(record) is
+                        collections.OrderedDict else sorted(record))
+                writer.writerow(fields)
+                header = False
+            writer.writerow([ csv_value(record.get(x)) for x in fields ])
+            for row in rows.rows:
+                yield row
+            del rows.rows[:]
+        yield None
+
+
+# Chunk generators for each format.
+writers = {
+    'json': lambda pages, fields: json_array(pages),
+    'ndjson': lambda pages, fields: ndjson_lines(pages),
+    'csv': csv_rows,
+}
+
+
+def write(stream, pages, output_format, fields = None):
+    """Write records page by page.
+
+    Each page is written, and the stream flushed, as soon as the page is
+    obtained, so only one page is held at any time and consumers can start
+    before the last page is obtained.
+
+    Args:
+        stream: the output file.
+        pages: an iterable containing lists of records.
+        output_format: one of formats.
+        fields: a list of the fields to write, or None to write every field.
+    """
+    pages = ([ select(x, fields) for x in page ] for page in pages)
+    for chunk in writers[output_format](pages, fields):
+        if None == chunk:
+            stream.flush()
+        else:
+            stream.write(chunk)
+    stream.flush()
@@ -0,0 +1,87 @@
+#-------------------------------------------------------------------------------
+# rbtlib: hosts.py
+#
+# Remember the URL scheme supported by each Review Board host.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+import state
+import time
+
+
+class HostTable(object):
+    """Persistent record of the URL scheme supported by each host.
+
+    Determining whether a host supports HTTPS requires a request. The table
+    records the outcome so later invocations can skip it. Entries expire and
+    should be forgotten whenever a request using the recorded scheme fails.
+
+    Attributes:
+        path: the file containing the table.
+        ttl: seconds an entry remains valid.
+    """
+
+    def __init__(self, path, ttl = 7 * 24 * 60 * 60):
+        super(HostTable, self).__init__()
+        self._path = path
+        self._ttl = ttl
+
+    @property
+    def path(self):
+        return self._path
+
+    def lookup(self, host):
+        """Obtain the scheme supported by a host.
+
+        Args:
+            host: the host name, including the port if any.
+
+        Returns:
+            The scheme (e.g., https) or None if the host is unknown or its
+            entry has expired.
+        """
+        entry = state.load(self._path, dict()).get(host)
+        if None == entry or entry['expires'] <= time.time():
+            return None
+        return entry['scheme']
+
+    def remember(self, host, scheme):
+        """Record the scheme supported by a host.
+
+        Args:
+            host: the host name, including the port if any.
+            scheme: the scheme (e.g., https).
+        """
+        table = state.load(self._path, dict())
+        table[host] = dict(scheme = scheme, expires = time.time() + self._ttl)
+        state.save(self._path, table)
+
+    def forget(self, host):
+        """Discard the scheme recorded for a host.
+
+        Args:
+            host: the host name, including the port if any.
+        """
+        table = state.load(self._path, dict())
+        if host in table:
+            del table[host]
+            state.save(self._path, table)
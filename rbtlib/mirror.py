@@ -0,0 +1,435 @@
+#-------------------------------------------------------------------------------
+# rbtlib: mirror.py
+#
+# Local SQLite mirror of the review requests on a Review Board server.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+import collections
+from functools import partial
+import json
+import os
+import requests
+from resource import pool
+import sqlite3
+
+
+schema = [
+    '''CREATE TABLE IF NOT EXISTS review_requests (
+        id INTEGER PRIMARY KEY,
+        status TEXT,
+        submitter TEXT,
+        repository TEXT,
+        summary TEXT,
+        time_added TEXT,
+        last_updated TEXT,
+        body TEXT NOT NULL)''',
+    'CREATE INDEX IF NOT EXISTS review_requests_last_updated '
+        'ON review_requests (last_updated)',
+    '''CREATE TABLE IF NOT EXISTS properties (
+        name TEXT PRIMARY KEY,
+        value TEXT)''',
+    'CREATE INDEX IF NOT EXISTS review_requests_status '
+        'ON review_requests (status, last_updated)',
+    'CREATE INDEX IF NOT EXISTS review_requests_submitter '
+        'ON review_requests (submitter, last_updated)',
+    'CREATE INDEX IF NOT EXISTS review_requests_repository '
+        'ON review_requests (repository, last_updated)',
+    'CREATE INDEX IF NOT EXISTS review_requests_time_added '
+        'ON review_requests (time_added)',
+]
+
+
+# Full-text index of the review requests. Triggers keep it up to date as review
+# requests are stored and deleted. The REPLACE conflict resolution does not
+# fire delete triggers, so the insert trigger discards the replaced entry.
+text_columns = '''summary, description, testing_done, submitter, branch,
+        bugs_closed'''
+text_values = '''{0}.id, {0}.summary, json_extract({0}.body, '$.description'),
+        json_extract({0}.body, '$.testing_done'), {0}.submitter,
+        json_extract({0}.body, '$.branch'),
+        json_extract({0}.body, '$.bugs_closed')'''
+text_schema = [
+    '''CREATE VIRTUAL TABLE review_requests_text USING fts5({0},
+        tokenize = 'porter unicode61')'''.format(text_columns),
+    '''INSERT INTO review_requests_text (rowid, {0})
+        SELECT {1} FROM review_requests AS r'''.format(text_columns,
+            text_values.format('r')),
+]
+text_triggers = [
+    '''CREATE TRIGGER IF NOT EXISTS review_requests_inserted
+        AFTER INSERT ON review_requests BEGIN
+            DELETE FROM review_requests_text WHERE rowid = new.id;
+            INSERT INTO review_requests_text (rowid, {0}) VALUES ({1});
+        END'''.format(text_columns, text_values.format('new')),
+    '''CREATE TRIGGER IF NOT EXISTS review_requests_updated
+        AFTER UPDATE ON review_requests BEGIN
+            DELETE FROM review_requests_text WHERE rowid = old.id;
+            INSERT INTO review_requests_text (rowid, {0}) VALUES ({1});
+        END'''.format(text_columns, text_values.format('new')),
+    '''CREATE TRIGGER IF NOT EXISTS review_requests_deleted
+        AFTER DELETE ON review_requests BEGIN
+            DELETE FROM review_requests_text WHERE rowid = old.id;
+        END''',
+]
+
+
+# The outcome of a synchronization.
+Sync = collections.namedtuple('Sync', 'stored deleted watermark')
+
+
+class FullTextUnavailable(Exception):
+    """SQLite lacks the FTS5 or JSON1 extension needed for full-text search."""
+
+
+def full_text_supported(connection):
+    """Determine whether SQLite supports the full-text index.
+
+    Args:
+        connection: the database connection.
+
+    Returns:
+        True if the FTS5 and JSON1 extensions are available; False otherwise.
+    """
+    try:
+        connection.execute("SELECT json_extract('{}', '$')")
+        connection.execute('CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)')
+        connection.execute('DROP TABLE temp.fts5_probe')
+    except sqlite3.OperationalError:
+        return False
+    return True
+
+
+def title(review_request, link):
+    """Obtain the title of a link in a review request.
+
+    Args:
+        review_request: the review request.
+        link: the link name (e.g., submitter).
+
+    Returns:
+        The title or None if the link is missing.
+    """
+    return review_request.get('links', dict()).get(link, dict()).get('title')
+
+
+def deleted(review_requests, ids, jobs = 1):
+    """Find the review requests deleted from the server.
+
+    Review requests missing from a listing may only have been skipped, as the
+    offsets of later pages shift whenever review requests are deleted while
+    the list is paged. Each one is requested and only those Review Board
+    reports missing (404 Not Found) are considered deleted.
+
+    Args:
+        review_requests: the Review Request List Resource (a
+            ResourceFactory).
+        ids: the ids of the review requests missing from the listing.
+        jobs: the maximum number of review requests requested concurrently.
+
+    Returns:
+        A list containing the ids of the deleted review requests.
+    """
+    def gone(review_request_id):
+        try:
+            review_requests.link('review_request', review_requests.url +
+                    '{0}/'.format(review_request_id), 'GET')()
+        except requests.exceptions.HTTPError as e:
+            return 404 == e.response.status_code
+        return False
+    ids = list(ids)
+    results = pool.gather([ partial(gone, x) for x in ids ], jobs)
+    return [ x for x, y in zip(ids, results) if True == y ]
+
+
+class Mirror(object):
+    """Review requests obtained from one Review Board server.
+
+    Review requests are stored by id, together with the latest last_updated
+    time seen (i.e., the watermark). Each synchronization requests only the
+    review requests updated since the watermark, whatever their status, so
+    status changes are picked up with them. Review requests deleted from the
+    server are found by comparing ids and confirmed by requesting each one.
+
+    Stored review requests can be queried without contacting the server. The
+    summary, description, testing done, submitter, branch and bugs closed are
+    indexed for full-text search as review requests are stored. Full-text
+    search requires the SQLite FTS5 and JSON1 extensions; without them, the
+    mirror is kept without the index. The index is rebuilt whenever the mirror
+    is next opened with them.
+
+    Attributes:
+        path: the database file name.
+    """
+
+    def __init__(self, path):
+        super(Mirror, self).__init__()
+        self._path = os.path.expanduser(path)
+        self._connection = sqlite3.connect(self._path, timeout = 30)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._full_text = full_text_supported(self._connection)
+        with self._connection as connection:
+            for statement in schema:
+                connection.execute(statement)
+            if self._full_text:
+                self._index(connection)
+            else:
+                for name in self._triggers(connection):
+                    connection.execute('DROP TRIGGER ' + name)
+
+    def _triggers(self, connection):
+        """Name the triggers maintaining the full-text index."""
+        return [ x for x, in connection.execute('SELECT name FROM sqlite_master '
+            "WHERE type = 'trigger' AND tbl_name = 'review_requests'") ]
+
+    def _index(self, connection):
+        """Create the full-text index and the triggers maintaining it.
+
+        An index left without its triggers, by opening the mirror without FTS5
+        or JSON1, is rebuilt.
+
+        Args:
+            connection: the database connection.
+        """
+        if None == connection.execute('SELECT name FROM sqlite_master '
+                'WHERE name = ?', ('review_requests_text',)).fetchone():
+            for statement in text_schema:
+                connection.execute(statement)
+        elif not self._triggers(connection):
+            connection.execute('DELETE FROM review_requests_text')
+            connection.execute(text_schema[1])
+        for statement in text_triggers:
+            connection.execute(statement)
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def full_text(self):
+        return self._full_text
+
+    def close(self):
+        """Close the database."""
+        self._connection.close()
+
+    def __len__(self):
+        return self._connection.execute(
+                'SELECT COUNT(*) FROM review_requests').fetchone()[0]
+
+    def get_property(self, name):
+        """Obtain a property of the mirror.
+
+        Args:
+            name: the property name (e.g., url or watermark).
+
+        Returns:
+            The value or None if the property is not set.
+        """
+        row = self._connection.execute('SELECT value FROM properties '
+                'WHERE name = ?', (name,)).fetchone()
+        return None if None == row else row[0]
+
+    def set_property(self, name, value):
+        """Set a property of the mirror.
+
+        Args:
+            name: the property name.
+            value: the value.
+        """
+        with self._connection as connection:
+            connection.execute('INSERT OR REPLACE INTO properties '
+                    '(name, value) VALUES (?, ?)', (name, value))
+
+    def get(self, review_request_id):
+        """Obtain a review request.
+
+        Args:
+            review_request_id: the review request id.
+
+        Returns:
+            The review request, as returned by Review Board, or None.
+        """
+        row = self._connection.execute('SELECT body FROM review_requests '
+                'WHERE id = ?', (review_request_id,)).fetchone()
+        return None if None == row else json.loads(row[0])
+
+    def store(self, review_requests):
+        """Store review requests, replacing those stored earlier.
+
+        The review requests are committed together.
+
+        Args:
+            review_requests: a list of review requests.
+        """
+        with self._connection as connection:
+            connection.executemany('INSERT OR REPLACE INTO review_requests '
+                    '(id, status, submitter, repository, summary, time_added, '
+                    'last_updated, body) VALUES (?, ?, ?, ?, ?, ?, ?, ?)', [
+                        (x['id'], x.get('status'), title(x, 'submitter'),
+                            title(x, 'repository'), x.get('summary'),
+                            x.get('time_added'), x.get('last_updated'),
+                            json.dumps(x, separators = (',', ':')))
+                        for x in review_requests ])
+
+    def prune(self, ids, confirm = list):
+        """Delete the review requests missing from the server.
+
+        Args:
+            ids: the ids of every review request listed by the server.
+            confirm: a function object returning the ids, of those given, of
+                the review requests deleted from the server (see deleted).
+
+        Returns:
+            The number of review requests deleted.
+        """
+        ids = set(ids)
+        missing = [ x for x, in self._connection.execute(
+            'SELECT id FROM review_requests') if x not in ids ]
+        confirmed = [ (x,) for x in confirm(missing) ] if missing else list()
+        with self._connection as connection:
+            connection.executemany('DELETE FROM review_requests WHERE id = ?',
+                    confirmed)
+        return len(confirmed)
+
+    def sync(self, review_requests, jobs = 1, prune = True,
+            max_results = 200):
+        """Bring the mirror up to date.
+
+        Each page is committed as soon as it is obtained. The watermark is
+        recorded once every page is stored, so an interrupted synchronization
+        is repeated in full by the next one. Review requests last updated at
+        the watermark are requested again, so none updated at the same time
+        as the last one stored are missed.
+
+        Pages are requested by offset, so a review request deleted or updated
+        during the synchronization shifts others across a page boundary,
+        where they are skipped. The watermark is therefore only advanced when
+        at least as many distinct review requests are stored as the first page
+        reports; otherwise, the next synchronization requests them again.
+
+        Args:
+            review_requests: the Review Request List Resource (a
+                ResourceFactory).
+            jobs: the maximum number of pages requested concurrently.
+            prune: set to True to delete review requests deleted from the
+                server.
+            max_results: the number of review requests on each page.
+
+        Returns:
+            A Sync object.
+
+        Raises:
+            ValueError: the mirror contains another server's review requests.
+        """
+        url = self.get_property('url')
+        if None == url:
+            self.set_property('url', review_requests.url)
+        elif url != review_requests.url:
+            raise ValueError('{0} mirrors {1}'.format(self._path, url))
+        watermark = self.get_property('watermark')
+        query_dict = { 'status': 'all', 'max-results': max_results }
+        if None != watermark:
+            query_dict['last-updated-from'] = watermark
+        stored = 0
+        ids = set()
+        total_results = None
+        latest = watermark
+        for page in review_requests.iter_pages(query_dict, jobs):
+            items = page.json['review_requests']
+            if None == total_results:
+                total_results = page.json.get('total_results', 0)
+            self.store(items)
+            stored += len(items)
+            ids.update(x['id'] for x in items)
+            latest = max([ latest ] + [ x['last_updated'] for x in items ])
+        if total_results <= len(ids):
+            watermark = latest
+        pruned = 0
+        if prune:
+            pages = review_requests.iter_pages({ 'status': 'all',
+                'max-results': max_results }, jobs, only_fields = [ 'id' ],
+                only_links = [])
+            pruned = self.prune((x['id'] for page in pages for x in
+                page.json['review_requests']),
+                partial(deleted, review_requests, jobs = jobs))
+        if None != watermark:
+            self.set_property('watermark', watermark)
+        return Sync(stored, pruned, watermark)
+
+    def query(self, text = None, status = None, submitter = None,
+            repository = None, time_added_from = None, time_added_to = None,
+            limit = None):
+        """Find stored review requests.
+
+        Args:
+            text: an FTS5 full-text query (e.g., "crash AND summary:login") or
+                None.
+            status: the review request status (e.g., pending) or None.
+            submitter: the submitter's user name or None.
+            repository: the repository name or None.
+            time_added_from: the earliest time added, in ISO 8601 format (e.g.,
+                2016-01-01 or 2016-01-01T12:00:00Z), or None.
+            time_added_to: the time added before which review requests were
+                added or None.
+            limit: the maximum number of review requests or None.
+
+        Returns:
+            A generator yielding the review requests, best match first when
+            searching text and most recently updated first otherwise.
+
+        Raises:
+            FullTextUnavailable: text is given but SQLite lacks full-text
+                search.
+        """
+        if text and not self._full_text:
+            raise FullTextUnavailable('full-text search requires the SQLite '
+                    'FTS5 and JSON1 extensions')
+        return self._query(text, status, submitter, repository,
+                time_added_from, time_added_to, limit)
+
+    def _query(self, text, status, submitter, repository, time_added_from,
+            time_added_to, limit):
+        """Find stored review requests (see query)."""
+        sql = 'SELECT r.body FROM review_requests AS r'
+        clauses = list()
+        params = list()
+        if text:
+            sql += ' JOIN review_requests_text ON review_requests_text.rowid = r.id'
+            clauses.append('review_requests_text MATCH ?')
+            params.append(text)
+        for clause, value in [ ('r.status = ?', status),
+                ('r.submitter = ?', submitter),
+                ('r.repository = ?', repository),
+                ('r.time_added >= ?', time_added_from),
+                ('r.time_added < ?', time_added_to) ]:
+            if None != value:
+                clauses.append(clause)
+                params.append(value)
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += ' ORDER BY rank' if text else ' ORDER BY r.last_updated DESC'
+        if None != limit:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        for body, in self._connection.execute(sql, params):
+            yield json.loads(body)
@@ -25,11 +25,24 @@
 # IN THE SOFTWARE.
 #-------------------------------------------------------------------------------
 import click
+import collections
+import datetime
+import formats
+from hosts import HostTable
 import json
 import magic
+from mirror import FullTextUnavailable, Mirror
 import requests
+from resource import connection
+from resource.resource import BadContentType, projection
+from resource.retry import policy
+from resource.store import ResponseStore
 from root import Root
+import sqlite3
+import state
+import stats as statistics
 import sys
+import timerange
 import user
 from urlparse import urlparse
 
@@ -43,20 +56,44 @@ def canonify_url(ctx, url):
 
     Returns:
         The provided URL if it contains a scheme; if the URL is missing a
-        scheme generate one.  Try HTTPS then HTTP and include the supported
-        scheme with the returned URL.
+        scheme generate one.  Use the scheme recorded for the host in the
+        host table, if any; otherwise, try HTTPS then HTTP and record the
+        supported scheme. Include the supported scheme with the returned URL.
     """
     url_components = urlparse(url)
     if 0 == len(url_components.scheme):
-        scheme = 'https://'
-        try:
-            ctx.obj['session'].get(scheme + url)
-        except requests.exceptions.SSLError:
-            scheme = 'http://'
-        url = scheme + url
+        hosts = ctx.obj.get('hosts')
+        host = url.split('/')[0]
+        scheme = hosts.lookup(host) if None != hosts else None
+        if None == scheme:
+            scheme = probe(ctx, url)
+            if None != hosts:
+                hosts.remember(host, scheme)
+        url = scheme + '://' + url
     return url
 
 
+def probe(ctx, url):
+    """Determine the scheme supported by a Review Board host.
+
+    Request the Root List Resource using HTTPS. Every command needs the Root
+    List Resource, so the response is retained in the context for reuse.
+
+    Args:
+        ctx: RBTLIB context.
+        url: URL without a scheme.
+
+    Returns:
+        The scheme: https if the request succeeds; http if it fails to
+        establish a secure connection.
+    """
+    try:
+        ctx.obj['probe'] = ctx.obj['session'].get('https://' + url + '/api/')
+        return 'https'
+    except requests.exceptions.SSLError:
+        return 'http'
+
+
 def beautify(resource):
     """Beautify response.
 
@@ -69,6 +106,52 @@ def beautify(resource):
     return json.dumps(resource.json, sort_keys = True, indent = 2)
 
 
+def root_resource(ctx, url):
+    """Construct the Root List Resource.
+
+    Args:
+        ctx: RBTLIB context.
+        url: Review Board URL.
+
+    Returns:
+        The Root List Resource using the session and response store in the
+        context. Commands print the decoded responses, so no components are
+        built (see RawResource).
+    """
+    return Root(ctx.obj['session'], url, raw = True,
+            store = ctx.obj.get('store'))
+
+
+def root_list(ctx, url):
+    """Obtain the Root List Resource.
+
+    Authenticate using the API token saved for the server by an earlier
+    invocation, if any, unless a token was specified. Reuse the response
+    obtained when probing the host, if any, unless the server rejected it
+    (e.g., the probe was made before restoring saved credentials). Forget the
+    scheme recorded for the host if the Root List Resource is unreachable.
+
+    Args:
+        ctx: RBTLIB context.
+        url: Review Board URL.
+
+    Returns:
+        The Root List Resource composite.
+    """
+    if 'Authorization' not in ctx.obj['session'].headers:
+        user.load_token(ctx.obj['session'], url)
+    root = root_resource(ctx, url)
+    response = ctx.obj.pop('probe', None)
+    if None != response and response.ok and root.url == response.url:
+        return root.amalgamate(root.process(root.url, response))
+    try:
+        return root()
+    except requests.exceptions.ConnectionError:
+        if None != ctx.obj.get('hosts'):
+            ctx.obj['hosts'].forget(urlparse(url).netloc)
+        raise
+
+
 def login(ctx, url, username, password):
     """User login.
 
@@ -111,32 +194,147 @@ def url(f):
 
 
 @click.group()
+@click.option('--cache', type = click.Path(dir_okay = False),
+    envvar = 'RBT_CACHE',
+    help='File caching responses between invocations.')
+@click.option('--token', envvar = 'RBT_TOKEN',
+    help='API token used instead of a user name and password.')
+@click.option('--connections', default = 10, type = click.IntRange(1),
+    help='Number of connections kept open to each server.')
+@click.option('--timeout', default = 60.0, type = click.FloatRange(0),
+    help='Seconds to wait for the server to respond.')
+@click.option('--stats', is_flag = True,
+    help='If specified, connection and retry counts are written to standard error.')
 @click.pass_context
-def rbt(ctx):
+def rbt(ctx, cache, token, connections, timeout, stats):
     """Declare the command group.
 
     Ensures the same HTTP session is used by all RBT commands in this session.
 
     Args:
         ctx: RBTLIB context.
+        cache: name of the response store file or None.
+        token: API token or None.
+        connections: number of connections kept open to each server.
+        timeout: seconds to wait for the server to respond.
+        stats: set to True to write connection and retry counts to standard
+            error.
+    """
+    ctx.obj['connection'] = dict(pool_maxsize = connections,
+            timeout = (min(10, timeout), timeout))
+    ctx.obj['session'] = connection.session(**ctx.obj['connection'])
+    if stats:
+        ctx.call_on_close(lambda: print_statistics(ctx.obj['session']))
+    if token:
+        user.token_login(ctx.obj['session'], token)
+    ctx.obj['hosts'] = HostTable(state.path('hosts.json'))
+    ctx.obj['store'] = ResponseStore(cache) if cache else None
+
+
+def print_statistics(session):
+    """Write the connection and retry counts to standard error.
+
+    Args:
+        session: the HTTP session.
+    """
+    counts = connection.statistics(session)
+    print >> sys.stderr, '{0} requests, {1} connections opened, {2} reused'.format(
+            counts.requests, counts.connections, counts.reused)
+    print >> sys.stderr, '{0} retries adding {1:.1f}s, {2} refused'.format(
+            policy.retries, policy.delay, policy.exhausted)
+
+
+def comma_separated(ctx, param, names):
+    """Split comma-separated names.
+
+    Args:
+        ctx: RBTLIB context.
+        param: the option.
+        names: comma-separated names or None.
+
+    Returns:
+        A list of names, which is empty if names is empty, or None.
     """
-    ctx.obj['session'] = requests.Session()
+    if None == names:
+        return None
+    return [ x.strip() for x in names.split(',') if x.strip() ]
+
+
+def time_range(time_added_from, time_added_to):
+    """Parse the range of times in which review requests are added.
+
+    Args:
+        time_added_from: earliest date/time the review request is added.
+        time_added_to: latest date/time the review request is added or None
+            for now.
+
+    Returns:
+        A tuple containing the datetimes starting and ending the range.
+
+    Raises:
+        click.BadParameter: a date/time is missing or not supported.
+    """
+    if None == time_added_from:
+        raise click.BadParameter('required with --bucket',
+                param_hint = '--time-added-from')
+    try:
+        start = timerange.parse(time_added_from)
+        end = timerange.parse(time_added_to) if time_added_to \
+                else datetime.datetime.utcnow()
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+    return start, end
+
+
+def size_pool(ctx, jobs):
+    """Keep a connection open for each concurrent request.
+
+    Args:
+        ctx: RBTLIB context.
+        jobs: the maximum number of concurrent requests.
+    """
+    if jobs > ctx.obj['connection']['pool_maxsize']:
+        ctx.obj['connection']['pool_maxsize'] = jobs
+        connection.mount(ctx.obj['session'], **ctx.obj['connection'])
+
+
+def output_format(f):
+    """Define the output format and field selection options.
+
+    Args:
+        f: callback function.
+
+    Returns:
+        The callback function with the --format and --fields options.
+    """
+    f = click.option('--fields', callback = comma_separated,
+        help='Comma-separated fields to print (e.g., id,links.submitter.title).')(f)
+    return click.option('--format', 'output_format', default = 'json',
+        type = click.Choice(formats.formats),
+        help='Output format; ndjson and csv print one line per item.')(f)
 
 
 @rbt.command()
 @url
+@output_format
 @click.pass_context
-def root(ctx, url):
+def root(ctx, url, output_format, fields):
     """Print the Root List Resource.
 
     Args:
         ctx: RBTLIB context.
         url: Review Board URL.
+        output_format: json, ndjson or csv.
+        fields: the fields to print or None to print every field.
 
     Returns:
         Writes to standard output.
     """
-    print beautify(Root(ctx.obj['session'], url)())
+    root = root_list(ctx, url)
+    if 'json' == output_format and None == fields:
+        print beautify(root)
+    else:
+        formats.write(sys.stdout, [ [ root.json ] ], output_format, fields)
     sys.exit
 
 
@@ -147,15 +345,47 @@ def root(ctx, url):
     help='Earliest date/time the review request is added.')
 @click.option('--time-added-to',
     help='Latest date/time the review request is added.')
+@click.option('--all', 'all_pages', is_flag = True,
+    help='If specified, review requests from every page are returned.')
+@click.option('--bucket', type = click.Choice(timerange.sizes),
+    help='If specified, the review requests added each day, week or month are counted.')
+@click.option('--shard', type = click.Choice([ 'auto' ]),
+    help='If specified, review requests are obtained in time shards, implying --all.')
+@click.option('--shard-size', default = 1000, type = click.IntRange(1),
+    help='Number of review requests in each shard.')
+@click.option('--jobs', type = click.IntRange(1),
+    help='Number of requests made concurrently with --all (default 1), --bucket or --shard (default 8).')
+@click.option('--only-fields', callback = comma_separated,
+    help='Comma-separated fields Review Board returns for each review request.')
+@click.option('--only-links', callback = comma_separated,
+    help='Comma-separated links Review Board returns; empty for none.')
+@click.option('--expand', callback = comma_separated,
+    help='Comma-separated links Review Board replaces with their resources.')
 @url
+@output_format
 @click.pass_context
-def review_requests(ctx, url, counts_only, time_added_from, time_added_to):
+def review_requests(ctx, url, counts_only, time_added_from, time_added_to,
+        all_pages, bucket, shard, shard_size, jobs, only_fields, only_links,
+        expand, output_format, fields):
     """Print the Review Requests List Resource.
 
     The date and time format is YYYY-MM-DD HH:MM:SS or
     {yyyy}-{mm}-{dd}T{HH}:{MM}:{SS} with an optional timezone appended as
     -{HH:MM}.
 
+    The json format prints the first page, or the counts, as returned by
+    Review Board. With --all or --fields, or with the other formats, the
+    review requests are printed instead, each page as soon as it is obtained.
+
+    With --bucket, the range from --time-added-from to --time-added-to (or
+    now) is divided into days, weeks or months, and the review requests added
+    in each are counted.
+
+    With --shard auto, the same range (from 1970 if --time-added-from is not
+    specified) is divided into shards holding about --shard-size review
+    requests each, which are obtained concurrently. Each review request is
+    printed once.
+
     Args:
         ctx: RBTLIB context.
         url: Review Board URL.
@@ -163,10 +393,59 @@ def review_requests(ctx, url, counts_only, time_added_from, time_added_to):
             otherwise.
         time_added_from: earliest date from which to select review requests.
         time__added_to: latest date from which to select review requests.
+        all_pages: set to True to print review requests from every page as a
+            JSON array; False to print the first page only.
+        bucket: day, week or month to count the review requests added in
+            each; None otherwise.
+        shard: auto to obtain review requests in time shards; None otherwise.
+        shard_size: number of review requests in each shard.
+        jobs: number of requests made concurrently or None.
+        only_fields: the fields Review Board returns or None for every field.
+        only_links: the links Review Board returns or None for every link.
+        expand: the links Review Board expands or None.
+        output_format: json, ndjson or csv.
+        fields: the fields of each review request to print or None to print
+            every field.
 
     Returns:
         Writes to standard output.
     """
+    query_dict = review_requests_query(counts_only, time_added_from,
+            time_added_to, only_fields, only_links, expand)
+    if bucket or shard:
+        jobs = jobs or 8
+        start, end = time_range(time_added_from or (None if bucket else
+            '1970-01-01'), time_added_to)
+    jobs = jobs or 1
+    size_pool(ctx, jobs)
+    review_requests = root_list(ctx, url).review_requests
+    if bucket:
+        write_histogram(review_requests, query_dict, start, end, bucket, jobs,
+                output_format, fields)
+    elif shard and not counts_only:
+        formats.write(sys.stdout, timerange.iter_shards(review_requests,
+            start, end, query_dict, shard_size, jobs), output_format, fields)
+    else:
+        write_pages(review_requests, query_dict, counts_only, all_pages, jobs,
+                output_format, fields)
+    sys.exit
+
+
+def review_requests_query(counts_only, time_added_from, time_added_to,
+        only_fields, only_links, expand):
+    """Construct the query for the Review Request List Resource.
+
+    Args:
+        counts_only: set to True to obtain review request counts only.
+        time_added_from: earliest date from which to select review requests.
+        time_added_to: latest date from which to select review requests.
+        only_fields: the fields Review Board returns or None for every field.
+        only_links: the links Review Board returns or None for every link.
+        expand: the links Review Board expands or None.
+
+    Returns:
+        A dictionary containing the HTTP command parameters.
+    """
     query_dict = dict()
     if counts_only:
         query_dict['counts-only'] = True
@@ -174,8 +453,57 @@ def review_requests(ctx, url, counts_only, time_added_from, time_added_to):
         query_dict['time-added-from'] = time_added_from
     if time_added_to:
         query_dict['time-added-to'] = time_added_to
-    print beautify(Root(ctx.obj['session'], url)().review_requests(query_dict))
-    sys.exit
+    return projection(query_dict, only_fields, only_links, expand)
+
+
+def write_histogram(review_requests, query_dict, start, end, bucket, jobs,
+        output_format, fields):
+    """Print the number of review requests added in each bucket.
+
+    Args:
+        review_requests: the Review Request List Resource.
+        query_dict: the HTTP command parameters.
+        start: the datetime starting the range.
+        end: the datetime ending the range.
+        bucket: day, week or month.
+        jobs: number of requests made concurrently.
+        output_format: json, ndjson or csv.
+        fields: the fields of each bucket to print or None.
+    """
+    formats.write(sys.stdout, [ [ collections.OrderedDict([
+        ('from', timerange.isoformat(x)), ('to', timerange.isoformat(y)),
+        ('count', z) ]) for x, y, z in timerange.histogram(review_requests,
+            start, end, bucket, query_dict, jobs) ] ], output_format, fields)
+
+
+def write_pages(review_requests, query_dict, counts_only, all_pages, jobs,
+        output_format, fields):
+    """Print the counts, the first page or every page of review requests.
+
+    The json format prints the response as returned by Review Board unless
+    every page or only some fields are printed.
+
+    Args:
+        review_requests: the Review Request List Resource.
+        query_dict: the HTTP command parameters.
+        counts_only: set to True to print the counts.
+        all_pages: set to True to print every page.
+        jobs: number of pages requested concurrently.
+        output_format: json, ndjson or csv.
+        fields: the fields of each review request to print or None.
+    """
+    if 'json' == output_format and None == fields and (counts_only
+            or not all_pages):
+        print beautify(review_requests(query_dict))
+        return
+    if counts_only:
+        pages = [ [ review_requests(query_dict).json ] ]
+    elif all_pages:
+        pages = (page.json['review_requests'] for page in
+                review_requests.iter_pages(query_dict, jobs))
+    else:
+        pages = [ review_requests(query_dict).json['review_requests'] ]
+    formats.write(sys.stdout, pages, output_format, fields)
 
 
 def file_name(f):
@@ -202,15 +530,70 @@ def file_name(f):
     return click.argument('file_name', callback=callback)(f)
 
 
+def authenticate(ctx, url, credentials):
+    """Log in and save the session for later invocations.
+
+    Prompt for the user name and password if they are not available. Create an
+    API token and save it for later invocations, so they need not log in. The
+    session remains usable on servers that do not support API tokens.
+
+    Args:
+        ctx: RBTLIB context.
+        url: Review Board URL.
+        credentials: a dictionary containing the username and password.
+
+    Returns:
+        True if the login request succeeds; False otherwise.
+    """
+    if None == credentials['username']:
+        credentials['username'] = click.prompt('Username')
+    if None == credentials['password']:
+        credentials['password'] = click.prompt('Password', hide_input = True,
+                confirmation_prompt = True)
+    if 200 != login(ctx, url, credentials['username'], credentials['password']):
+        return False
+    user.save_session(ctx.obj['session'], url)
+    try:
+        user.save_token(url, user.create_token(ctx.obj['session'], url))
+    except (requests.exceptions.RequestException, BadContentType, ValueError):
+        pass
+    return True
+
+
+def create_review_request(review_requests, file_name):
+    """Create a review request for a file.
+
+    Args:
+        review_requests: the Review Request List Resource.
+        file_name: name of file.
+
+    Returns:
+        The response to the create command.
+    """
+    return review_requests.create({
+        'file': (file_name, open(file_name, 'rb'),
+        magic.from_file(file_name, mime = True), {'Expires': '0'})
+    })
+
+
+# HTTP status codes returned whenever the session is rejected.
+authentication_errors = [ 401, 403 ]
+
+
 @rbt.command()
 @click.pass_context
-@click.option('--username', prompt=True)
-@click.option('--password', prompt=True, hide_input=True, confirmation_prompt=True)
+@click.option('--username')
+@click.option('--password')
 @url
 @file_name
 def post(ctx, url, file_name, username, password):
     """Post file to Review Board.
 
+    Authenticate using the API token specified or saved by an earlier
+    invocation, if any, or reuse the session saved by an earlier invocation.
+    Log in whenever neither is available or Review Board rejects them,
+    prompting for the user name and password if they are not specified.
+
     Args:
         ctx: RBTLIB context.
         url: Review Board URL.
@@ -220,16 +603,176 @@ def post(ctx, url, file_name, username, password):
     Returns:
         The file_name argument to the RBT command.
     """
-    review_requests = Root(ctx.obj['session'], url)().review_requests()
-    if 200 == login(ctx, url, username, password):
-        create = review_requests.create({
-            'file': (file_name, open(file_name, 'rb'),
-            magic.from_file(file_name, mime = True), {'Expires': '0'})
-        })
-        if 'ok' == create.stat:
-            print >> sys.stderr, 'posted review {0}'.format(create.review_request.id)
-        else:
-            print >> sys.stderr, 'failed to post review'
-    else:
+    credentials = dict(username = username, password = password)
+    session = ctx.obj['session']
+    restored = 'Authorization' in session.headers \
+            or user.load_token(session, url) or user.load_session(session, url)
+    review_requests = root_list(ctx, url).review_requests()
+    create = None
+    if restored or authenticate(ctx, url, credentials):
+        try:
+            create = create_review_request(review_requests, file_name)
+        except requests.exceptions.HTTPError as e:
+            if not restored or e.response.status_code not in authentication_errors:
+                raise
+            user.token_logout(session)
+            if authenticate(ctx, url, credentials):
+                create = create_review_request(review_requests, file_name)
+    if None == create:
         print >> sys.stderr, 'failed to login'
+    elif 'ok' == create.stat:
+        print >> sys.stderr, 'posted review {0}'.format(create.json['review_request']['id'])
+    else:
+        print >> sys.stderr, 'failed to post review'
+    sys.exit
+
+
+@rbt.command()
+@click.option('--db', required = True, type = click.Path(dir_okay = False),
+    envvar = 'RBT_DB',
+    help='File mirroring the review requests.')
+@click.option('--jobs', default = 1, type = click.IntRange(1),
+    help='Number of pages requested concurrently.')
+@click.option('--prune/--no-prune', default = True,
+    help='Whether review requests deleted from Review Board are deleted.')
+@url
+@click.pass_context
+def sync(ctx, url, db, jobs, prune):
+    """Mirror the review requests in a local database.
+
+    Only the review requests updated since the last sync are requested.
+
+    Args:
+        ctx: RBTLIB context.
+        url: Review Board URL.
+        db: name of the database file.
+        jobs: number of pages requested concurrently.
+        prune: set to True to delete review requests deleted from Review
+            Board; False otherwise.
+
+    Returns:
+        Writes to standard error.
+    """
+    size_pool(ctx, jobs)
+    mirror = Mirror(db)
+    try:
+        result = mirror.sync(root_list(ctx, url).review_requests, jobs, prune)
+        print >> sys.stderr, 'stored {0}, deleted {1}, {2} review requests ' \
+                'up to {3}'.format(result.stored, result.deleted, len(mirror),
+                        result.watermark)
+    finally:
+        mirror.close()
+    sys.exit
+
+
+@rbt.command()
+@click.option('--db', required = True, type = click.Path(exists = True,
+    dir_okay = False), envvar = 'RBT_DB',
+    help='File mirroring the review requests (see sync).')
+@click.option('--status', type = click.Choice([ 'pending', 'submitted',
+    'discarded' ]),
+    help='Status of the review requests.')
+@click.option('--submitter',
+    help='User name of the submitter.')
+@click.option('--repository',
+    help='Name of the repository.')
+@click.option('--time-added-from',
+    help='Earliest date/time the review request is added.')
+@click.option('--time-added-to',
+    help='Date/time before which the review request is added.')
+@click.option('--limit', type = click.IntRange(1),
+    help='Maximum number of review requests printed.')
+@output_format
+@click.argument('text', required = False)
+def query(db, status, submitter, repository, time_added_from, time_added_to,
+        limit, output_format, fields, text):
+    """Print review requests from the local mirror.
+
+    The text is a full-text query (e.g., "crash AND submitter:alice") matched
+    against the summary, description, testing done, submitter, branch and
+    bugs closed. Dates and times are in UTC and ISO 8601 format (e.g.,
+    2016-01-01 or 2016-01-01T12:00:00Z).
+
+    Args:
+        db: name of the database file.
+        status: review request status or None.
+        submitter: submitter user name or None.
+        repository: repository name or None.
+        time_added_from: earliest date from which to select review requests.
+        time_added_to: date before which to select review requests.
+        limit: maximum number of review requests or None.
+        output_format: json, ndjson or csv.
+        fields: the fields of each review request to print or None to print
+            every field.
+        text: full-text query or None.
+
+    Returns:
+        Writes to standard output.
+    """
+    mirror = Mirror(db)
+    try:
+        formats.write(sys.stdout, [ mirror.query(text, status, submitter,
+            repository, time_added_from, time_added_to, limit) ],
+            output_format, fields)
+    except FullTextUnavailable as e:
+        raise click.UsageError(str(e))
+    except sqlite3.OperationalError as e:
+        raise click.BadParameter(str(e), param_hint = 'TEXT')
+    finally:
+        mirror.close()
+    sys.exit
+
+
+@rbt.command()
+@click.option('--time-added-from',
+    help='Earliest date/time the review request is added.')
+@click.option('--time-added-to',
+    help='Latest date/time the review request is added.')
+@click.option('--status', default = 'all', type = click.Choice([ 'all',
+    'pending', 'submitted', 'discarded' ]),
+    help='Status of the review requests.')
+@click.option('--jobs', default = 1, type = click.IntRange(1),
+    help='Number of pages requested concurrently.')
+@click.option('--format', 'output_format', default = 'json',
+    type = click.Choice(formats.formats),
+    help='Output format; ndjson and csv print one line per statistic.')
+@url
+@click.pass_context
+def stats(ctx, url, time_added_from, time_added_to, status, jobs,
+        output_format):
+    """Print review request statistics.
+
+    Prints the number of review requests, by status, by submitter and by week
+    added, and the hours taken to close them. Requires NumPy.
+
+    Args:
+        ctx: RBTLIB context.
+        url: Review Board URL.
+        time_added_from: earliest date from which to select review requests.
+        time_added_to: latest date from which to select review requests.
+        status: status of the review requests.
+        jobs: number of pages requested concurrently.
+        output_format: json, ndjson or csv.
+
+    Returns:
+        Writes to standard output.
+    """
+    if None == statistics.numpy:
+        raise click.UsageError('stats requires NumPy (pip install rbtlib[stats])')
+    query_dict = { 'status': status, 'max-results': 200 }
+    if time_added_from:
+        query_dict['time-added-from'] = time_added_from
+    if time_added_to:
+        query_dict['time-added-to'] = time_added_to
+    size_pool(ctx, jobs)
+    review_requests = root_list(ctx, url).review_requests
+    summary = statistics.summarize(statistics.columns(
+        review_requests.iter_items(query_dict, jobs, only_fields = [ 'id',
+            'status', 'time_added', 'last_updated' ],
+            only_links = [ 'submitter' ])))
+    if 'json' == output_format:
+        print json.dumps(summary, indent = 2)
+    else:
+        formats.write(sys.stdout, [ statistics.records(summary) ],
+                output_format)
     sys.exit
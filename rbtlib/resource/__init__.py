@@ -27,8 +27,10 @@
 __all__ = [
     "Resource",
     "ResourceFactory",
+    "fetch_all",
 ]
 
 
 from resource import Resource
 from resource import ResourceFactory
+from resource import fetch_all
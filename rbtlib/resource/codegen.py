@@ -0,0 +1,218 @@
+#-------------------------------------------------------------------------------
+# rbtlib: codegen.py
+#
+# Generate record classes from recorded Review Board responses.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+import json
+import keyword
+import os
+from record import replace
+import re
+import sys
+import textwrap
+from types import DictionaryType, DictType, ListType
+
+
+# The preamble of the generated module.
+preamble = '''#-------------------------------------------------------------------------------
+# rbtlib: records.py
+#
+# Records for known Review Board resources.
+#
+# Generated by codegen.py from recorded responses. Do not edit.
+#-------------------------------------------------------------------------------
+{license}from record import Record'''
+
+
+def shapes(name, response, extra_args = ()):
+    """Find the components contained in a response.
+
+    Args:
+        name: the component name.
+        response: the response defining the component.
+        extra_args: names of the arguments added to the component.
+
+    Returns:
+        A generator yielding the name and field names of each component.
+    """
+    yield name, tuple(extra_args) + tuple(response)
+    for x, value in response.iteritems():
+        if type(value) is DictType or type(value) is DictionaryType:
+            for shape in shapes(x, value):
+                yield shape
+        elif type(value) is ListType:
+            for element in value:
+                if type(element) is DictType or type(element) is DictionaryType:
+                    for shape in shapes(x, element):
+                        yield shape
+
+
+def resource_shapes(name, response):
+    """Find the components built by a resource factory for a response.
+
+    The resource factory adds the JSON response and a resource factory for
+    each link to the composite.
+
+    Args:
+        name: the resource name.
+        response: the response returned by the resource.
+
+    Returns:
+        A generator yielding the name and field names of each component.
+    """
+    for shape in shapes(name, response, ('json',)):
+        yield shape
+    links = tuple(response.get('links', dict()))
+    yield name, links
+    yield name, links + ('json',) + tuple(response)
+
+
+identifier = re.compile(r'^[A-Za-z][A-Za-z0-9_]*$')
+
+
+def is_valid(name, fields):
+    """Determine if a named tuple can represent the component.
+
+    Args:
+        name: the component name.
+        fields: the field names.
+
+    Returns:
+        True if the name and every field is a valid identifier and the field
+        names are unique; False otherwise.
+    """
+    names = (name,) + fields
+    return len(set(fields)) == len(fields) and all(identifier.match(x)
+            and not keyword.iskeyword(x) for x in names)
+
+
+def records(samples):
+    """Determine the record required for each component in the samples.
+
+    Args:
+        samples: a list of resource names and recorded responses.
+
+    Returns:
+        A sorted list containing the name and field names of each record.
+    """
+    found = dict()
+    for name, response in samples:
+        for x, fields in resource_shapes(name, response):
+            x, fields = str(replace(x)), tuple(str(replace(y)) for y in fields)
+            if is_valid(x, fields):
+                found.setdefault((x, frozenset(fields)), (x, tuple(sorted(fields))))
+    return sorted(found.values())
+
+
+def wrap(text, indent):
+    """Wrap a line of generated source code.
+
+    Args:
+        text: the line to wrap.
+        indent: the indentation of continuation lines.
+
+    Returns:
+        A string containing the wrapped line.
+    """
+    return '\n'.join(textwrap.wrap(text, width = 79, subsequent_indent = indent,
+        break_long_words = False, break_on_hyphens = False))
+
+
+def generate(samples, license = ''):
+    """Generate the source code for the records module.
+
+    Args:
+        samples: a list of resource names and recorded responses.
+        license: the license text included in the preamble.
+
+    Returns:
+        A string containing the records module.
+    """
+    lines = [ preamble.format(license = license) ]
+    table = list()
+    count = dict()
+    for name, fields in records(samples):
+        count[name] = count.get(name, -1) + 1
+        class_name = '{0}_{1}'.format(name, count[name])
+        lines.append('\n\nclass {0}(Record):'.format(class_name))
+        lines.append(wrap('    __slots__ = {0!r}'.format(fields), ' ' * 8))
+        lines.append('    _fields = __slots__')
+        lines.append('')
+        lines.append(wrap('    def __init__({0}):'.format(', '.join(('_self',) +
+            fields)), ' ' * 12))
+        for field in fields:
+            lines.append('        _self.{0} = {0}'.format(field))
+        if 0 == len(fields):
+            lines.append('        pass')
+        lines.append('\n\n{0}.__name__ = {1!r}'.format(class_name, name))
+        table.append((name, fields, class_name))
+    lines.append('\n\n# Records keyed by component name and field names.')
+    lines.append('table = {')
+    for name, fields, class_name in table:
+        lines.append(wrap('    ({0!r}, frozenset({1!r})): {2},'.format(name,
+            fields, class_name), ' ' * 8))
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+def load(file_names):
+    """Load recorded responses.
+
+    Each file contains a response from Review Board and is named after the
+    resource returning the response (e.g., review_requests.json).
+
+    Args:
+        file_names: the recorded response file names.
+
+    Returns:
+        A list of resource names and recorded responses.
+    """
+    samples = list()
+    for file_name in sorted(file_names):
+        name = os.path.splitext(os.path.basename(file_name))[0]
+        with open(file_name) as f:
+            samples.append((name, json.load(f)))
+    return samples
+
+
+def license():
+    """Obtain the license text from this file."""
+    with open(__file__.replace('.pyc', '.py')) as f:
+        text = f.read()
+    start = text.index('# The MIT License')
+    end = text.index('#---', start)
+    return text[start:end] + '#' + '-' * 79 + '\n'
+
+
+def main(argv):
+    """Write the records module for the recorded responses to standard output.
+
+    Args:
+        argv: the recorded response file names.
+    """
+    sys.stdout.write(generate(load(argv), license()))
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,144 @@
+#-------------------------------------------------------------------------------
+# rbtlib: connection.py
+#
+# HTTP sessions sized for concurrent use.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+import collections
+import requests
+from requests.adapters import DEFAULT_POOLSIZE
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.connection import HTTPConnection
+import socket
+
+
+# Connection counters for a session.
+Statistics = collections.namedtuple('Statistics',
+        [ 'connections', 'requests', 'reused' ])
+
+
+class Adapter(HTTPAdapter):
+    """Transport adapter with a sized connection pool and default timeout.
+
+    Attributes:
+        pool_connections: number of hosts whose connection pools are kept.
+        pool_maxsize: number of connections kept for each host.
+        timeout: default timeout in seconds, or a (connect, read) tuple.
+        keep_alive: enable TCP keep-alive probes when True.
+        nodelay: disable Nagle's algorithm when True.
+        kwargs: other HTTPAdapter arguments.
+    """
+
+    def __init__(self, pool_connections = 10, pool_maxsize = 10,
+            timeout = (10, 60), keep_alive = True, nodelay = True, **kwargs):
+        self._timeout = timeout
+        self._socket_options = [ x for x in HTTPConnection.default_socket_options
+                if (socket.IPPROTO_TCP, socket.TCP_NODELAY) != x[:2] ]
+        if nodelay:
+            self._socket_options.append((socket.IPPROTO_TCP, socket.TCP_NODELAY, 1))
+        if keep_alive:
+            self._socket_options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+        super(Adapter, self).__init__(pool_connections = pool_connections,
+                pool_maxsize = pool_maxsize, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        """Create the pool manager using the socket options."""
+        kwargs['socket_options'] = self._socket_options
+        super(Adapter, self).init_poolmanager(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        """Send the request, applying the default timeout if none is given."""
+        if None == kwargs.get('timeout'):
+            kwargs['timeout'] = self._timeout
+        return super(Adapter, self).send(request, **kwargs)
+
+
+def mount(session, **kwargs):
+    """Replace the transport adapters used by a session.
+
+    Args:
+        session: the HTTP session.
+        kwargs: Adapter arguments.
+
+    Returns:
+        The HTTP session.
+    """
+    adapter = Adapter(**kwargs)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def session(**kwargs):
+    """Create an HTTP session sized for concurrent use.
+
+    The default requests session keeps up to ten connections for each host and
+    discards the rest, so concurrent requests above this limit each open a new
+    connection.
+
+    Args:
+        kwargs: Adapter arguments.
+
+    Returns:
+        The HTTP session.
+    """
+    return mount(requests.Session(), **kwargs)
+
+
+def pool_size(session, url):
+    """Find the number of connections a session keeps for a host.
+
+    Args:
+        session: the HTTP session.
+        url: a URL on the host.
+
+    Returns:
+        The connection pool size of the transport adapter used for the URL,
+        or the requests default for sessions without transport adapters.
+    """
+    if not hasattr(session, 'get_adapter'):
+        return DEFAULT_POOLSIZE
+    return getattr(session.get_adapter(url), '_pool_maxsize', DEFAULT_POOLSIZE)
+
+
+def statistics(session):
+    """Count the connections opened and requests made using a session.
+
+    Only connection pools still held by the session are counted.
+
+    Args:
+        session: the HTTP session.
+
+    Returns:
+        A Statistics object.
+    """
+    connections = 0
+    made = 0
+    for adapter in set(session.adapters.values()):
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if None != pool:
+                connections += pool.num_connections
+                made += pool.num_requests
+    return Statistics(connections, made, max(0, made - connections))
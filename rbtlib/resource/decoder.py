@@ -0,0 +1,72 @@
+#-------------------------------------------------------------------------------
+# rbtlib: decoder.py
+#
+# Decode JSON responses directly from their content.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+import importlib
+import json
+from requests.utils import guess_json_utf
+
+
+def fastest(names = ( 'orjson', 'ujson' )):
+    """Find the fastest JSON parser installed.
+
+    Args:
+        names: the modules to try, fastest first.
+
+    Returns:
+        The loads function of the first module installed, or that of the json
+        module if none are.
+    """
+    for name in names:
+        try:
+            return importlib.import_module(name).loads
+        except ImportError:
+            pass
+    return json.loads
+
+
+# Parser used to decode responses.
+parse = fastest()
+
+
+def loads(content, parse = parse):
+    """Decode a JSON response.
+
+    The encoding is detected from the first bytes of the content, as RFC 4627
+    permits, instead of guessing the character set of the whole response. UTF-8
+    content, which is what Review Board returns, is parsed without decoding it
+    first.
+
+    Args:
+        content: the response content.
+        parse: a function object parsing JSON.
+
+    Returns:
+        The decoded response.
+    """
+    encoding = guess_json_utf(content)
+    if None != encoding and 'utf-8' != encoding:
+        content = content.decode(encoding)
+    return parse(content)
@@ -0,0 +1,160 @@
+#-------------------------------------------------------------------------------
+# rbtlib: lazy.py
+#
+# Build the whole-part hierarchy on demand.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+from registry import replace
+from types import DictionaryType, DictType, ListType
+
+
+def node(name, value):
+    """Wrap a value contained in the response.
+
+    Args:
+        name: the key identifying the value in the response.
+        value: the value.
+
+    Returns:
+        A lazy component for dictionaries, a lazy list for lists and the value
+        itself otherwise.
+    """
+    if type(value) is DictType or type(value) is DictionaryType:
+        return LazyComponent(name, value)
+    elif type(value) is ListType:
+        return LazyList(name, value)
+    return value
+
+
+class LazyComponent(object):
+    """A component whose parts are built when they are first accessed.
+
+    Provides the same attribute access as the named tuple built by
+    Resource.component. The decoded response is retained and each part is
+    converted into a component the first time it is read. Parts are cached
+    once built.
+
+    Attributes:
+        name: the component name.
+        response: the response defining the component.
+        extra_args: arguments to add to the component.
+    """
+    __slots__ = ('_name', '_response', '_extra_args', '_keys', '_parts')
+
+    def __init__(self, name, response, extra_args = dict()):
+        self._name = name
+        self._response = response
+        self._extra_args = extra_args
+        self._keys = None
+        self._parts = dict()
+
+    @property
+    def _fields(self):
+        return tuple(self._extra_args) + tuple(replace(x) for x in self._response)
+
+    def _key(self, field):
+        """Map a field name onto the key used in the response."""
+        if self._keys is None:
+            self._keys = dict((replace(x), x) for x in self._response)
+        return self._keys.get(field)
+
+    def __getattr__(self, field):
+        if field.startswith('_'):
+            raise AttributeError(field)
+        if field in self._extra_args:
+            return self._extra_args[field]
+        try:
+            return self._parts[field]
+        except KeyError:
+            pass
+        key = self._key(field)
+        if key is None:
+            raise AttributeError("'{0}' object has no attribute '{1}'".format(
+                replace(self._name), field))
+        part = node(key, self._response[key])
+        self._parts[field] = part
+        return part
+
+    def __iter__(self):
+        for field in self._fields:
+            yield getattr(self, field)
+
+    def __len__(self):
+        return len(self._extra_args) + len(self._response)
+
+    def __getitem__(self, index):
+        return getattr(self, self._fields[index])
+
+    def __repr__(self):
+        return '{0}({1})'.format(replace(self._name), ', '.join(self._fields))
+
+    def extend(self, extra_args):
+        """Add arguments to the component.
+
+        Args:
+            extra_args: arguments to add to the component.
+
+        Returns:
+            A lazy component containing this component's parts and the extra
+            arguments.
+        """
+        args = dict(self._extra_args)
+        args.update(extra_args)
+        return LazyComponent(self._name, self._response, args)
+
+
+class LazyList(object):
+    """A list whose elements are built when they are first accessed.
+
+    Attributes:
+        name: the key identifying the list in the response.
+        response: a list.
+    """
+    __slots__ = ('_name', '_response', '_elements')
+
+    def __init__(self, name, response):
+        self._name = name
+        self._response = response
+        self._elements = dict()
+
+    def __len__(self):
+        return len(self._response)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [ self[i] for i in range(*index.indices(len(self))) ]
+        if index < 0:
+            index += len(self._response)
+        try:
+            return self._elements[index]
+        except KeyError:
+            element = node(self._name, self._response[index])
+            self._elements[index] = element
+            return element
+
+    def __iter__(self):
+        for index in range(len(self._response)):
+            yield self[index]
+
+    def __repr__(self):
+        return repr(list(self))
@@ -0,0 +1,117 @@
+#-------------------------------------------------------------------------------
+# rbtlib: pool.py
+#
+# Run HTTP commands concurrently.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+import collections
+from multiprocessing.pool import ThreadPool
+import threading
+
+
+# Thread pool shared by the library (see shared).
+_shared = None
+_shared_size = 0
+_shared_lock = threading.Lock()
+
+
+def shared(size):
+    """Obtain the thread pool shared by the library.
+
+    The pool is created on first use and replaced by a larger one whenever a
+    caller needs more threads. A replaced pool is never closed, since other
+    callers may still be submitting calls to it; its threads are idle once
+    those calls complete. Pools only grow, so few are ever replaced.
+
+    Args:
+        size: the minimum number of threads.
+
+    Returns:
+        A ThreadPool.
+    """
+    global _shared, _shared_size
+    with _shared_lock:
+        if _shared_size < size:
+            _shared = ThreadPool(size)
+            _shared_size = size
+        return _shared
+
+
+def ordered(function, iterable, jobs, threads = None):
+    """Apply a function to each element of an iterable concurrently.
+
+    At most jobs calls are outstanding at any time. Results completed out of
+    order are held until the results preceding them are yielded, so the
+    reorder buffer never holds more than jobs results.
+
+    Exceptions raised by the function are raised when the corresponding result
+    is reached. Abandoning the generator discards outstanding calls, unless
+    they run on a thread pool shared with other callers.
+
+    Args:
+        function: a function object accepting one argument.
+        iterable: the arguments passed to the function.
+        jobs: the maximum number of concurrent calls.
+        threads: a thread pool shared with other callers (see shared) or None
+            to create one for this call.
+
+    Returns:
+        A generator yielding the result of each call in the order of the
+        arguments.
+    """
+    pool = threads or ThreadPool(max(1, jobs))
+    try:
+        pending = collections.deque()
+        for x in iterable:
+            pending.append(pool.apply_async(function, (x,)))
+            if jobs <= len(pending):
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+    finally:
+        if None == threads:
+            pool.terminate()
+
+
+def gather(functions, jobs, threads = None):
+    """Call functions concurrently, collecting their results.
+
+    Unlike ordered, an exception raised by one function does not prevent the
+    others from completing. The exception is returned in place of its result.
+
+    Args:
+        functions: function objects accepting no arguments.
+        jobs: the maximum number of concurrent calls.
+        threads: a thread pool shared with other callers (see shared) or None
+            to create one for this call.
+
+    Returns:
+        A list containing the result of each call, or the exception it
+        raised, in the order of the functions.
+    """
+    def call(function):
+        try:
+            return function()
+        except Exception as e:
+            return e
+    return list(ordered(call, functions, jobs, threads))
@@ -0,0 +1,84 @@
+#-------------------------------------------------------------------------------
+# rbtlib: raw.py
+#
+# Responses returned without building a whole-part hierarchy.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+from registry import replace
+
+
+class RawResource(object):
+    """The decoded response and a ResourceFactory for each link.
+
+    Top-level parts of the response are available as attributes, as they are
+    for the named tuple built by Resource.component, but they are returned as
+    decoded (i.e., dictionaries and lists are not converted into components).
+    This avoids building components for callers using the decoded response
+    alone.
+
+    Attributes:
+        name: the resource name.
+        response: the decoded response.
+        links: a ResourceFactory for each link, keyed by the link name.
+    """
+    __slots__ = ('_name', '_response', '_links')
+
+    def __init__(self, name, response, links = dict()):
+        self._name = name
+        self._response = response
+        self._links = links
+
+    @property
+    def json(self):
+        return self._response
+
+    def __getattr__(self, field):
+        if field.startswith('_'):
+            raise AttributeError(field)
+        if field in self._links:
+            return self._links[field]
+        if field in self._response:
+            return self._response[field]
+        for key in self._response:
+            if field == replace(key):
+                return self._response[key]
+        raise AttributeError("'{0}' object has no attribute '{1}'".format(
+            replace(self._name), field))
+
+    def __repr__(self):
+        return '{0}({1})'.format(replace(self._name), ', '.join(
+            [ 'json' ] + sorted(self._links)))
+
+    def extend(self, links):
+        """Add links to the resource.
+
+        Args:
+            links: a ResourceFactory for each link, keyed by the link name.
+
+        Returns:
+            A raw resource containing this resource's response and links, and
+            the links given.
+        """
+        args = dict(self._links)
+        args.update(links)
+        return RawResource(self._name, self._response, args)
@@ -0,0 +1,112 @@
+#-------------------------------------------------------------------------------
+# rbtlib: record.py
+#
+# Base class for records generated ahead of time by codegen.py.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+import collections
+
+
+def replace(s):
+    """Replace forbidden characters in named tuple names and field names.
+
+    Args:
+        s: a string.
+
+    Returns:
+        A string with the required substitutions.
+    """
+    return s.replace("-", "_")
+
+
+class Record(object):
+    """A record describing a known component of a Review Board response.
+
+    Records hold their fields in slots, so they have neither an instance
+    dictionary nor the tuple header of a named tuple. They provide the named
+    tuple interface the rest of the library relies on: fields are read by name
+    or by position, records compare and concatenate as tuples and count,
+    index, _fields, _make, _asdict and _replace behave as they do for named
+    tuples.
+
+    Subclasses are generated by codegen.py and define the slots, the field
+    names and a constructor assigning each field. Like named tuples, records
+    are not modified once built.
+
+    Attributes:
+        _fields: the field names.
+    """
+    __slots__ = ()
+    _fields = ()
+
+    @classmethod
+    def _make(cls, iterable):
+        """Construct a record from a sequence or iterable."""
+        return cls(*iterable)
+
+    def _asdict(self):
+        """Return an ordered dictionary mapping field names to values."""
+        return collections.OrderedDict(zip(self._fields, self))
+
+    def _replace(self, **kwargs):
+        """Return a record replacing the specified fields with new values."""
+        return type(self)(**dict(self._asdict(), **kwargs))
+
+    def count(self, value):
+        """Return the number of fields holding a value, as tuples do."""
+        return tuple(self).count(value)
+
+    def index(self, value):
+        """Return the position of the first field holding a value."""
+        return tuple(self).index(value)
+
+    def __iter__(self):
+        return (getattr(self, x) for x in self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __getitem__(self, index):
+        return tuple(self)[index]
+
+    def __eq__(self, other):
+        if not isinstance(other, (Record, tuple)):
+            return NotImplemented
+        return tuple(self) == tuple(other)
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __add__(self, other):
+        return tuple(self) + tuple(other)
+
+    def __radd__(self, other):
+        return tuple(other) + tuple(self)
+
+    def __repr__(self):
+        return '{0}({1})'.format(type(self).__name__, ', '.join(
+            '{0}={1!r}'.format(x, y) for x, y in zip(self._fields, self)))
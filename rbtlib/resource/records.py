@@ -0,0 +1,1424 @@
+#-------------------------------------------------------------------------------
+# rbtlib: records.py
+#
+# Records for known Review Board resources.
+#
+# Generated by codegen.py from recorded responses. Do not edit.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+from record import Record
+
+
+class administrators_0(Record):
+    __slots__ = ('email', 'name')
+    _fields = __slots__
+
+    def __init__(_self, email, name):
+        _self.email = email
+        _self.name = name
+
+
+administrators_0.__name__ = 'administrators'
+
+
+class api_tokens_0(Record):
+    __slots__ = ('href', 'method')
+    _fields = __slots__
+
+    def __init__(_self, href, method):
+        _self.href = href
+        _self.method = method
+
+
+api_tokens_0.__name__ = 'api_tokens'
+
+
+class archived_review_requests_0(Record):
+    __slots__ = ('href', 'method')
+    _fields = __slots__
+
+    def __init__(_self, href, method):
+        _self.href = href
+        _self.method = method
+
+
+archived_review_requests_0.__name__ = 'archived_review_requests'
+
+
+class branches_0(Record):
+    __slots__ = ('href', 'method')
+    _fields = __slots__
+
+    def __init__(_self, href, method):
+        _self.href = href
+        _self.method = method
+
+
+branches_0.__name__ = 'branches'
+
+
+class capabilities_0(Record):
+    __slots__ = ('diffs', 'scmtools', 'text')
+    _fields = __slots__
+
+    def __init__(_self, diffs, scmtools, text):
+        _self.diffs = diffs
+        _self.scmtools = scmtools
+        _self.text = text
+
+
+capabilities_0.__name__ = 'capabilities'
+
+
+class changes_0(Record):
+    __slots__ = ('href', 'method')
+    _fields = __slots__
+
+    def __init__(_self, href, method):
+        _self.href = href
+        _self.method = method
+
+
+changes_0.__name__ = 'changes'
+
+
+class commits_0(Record):
+    __slots__ = ('href', 'method')
+    _fields = __slots__
+
+    def __init__(_self, href, method):
+        _self.href = href
+        _self.method = method
+
+
+commits_0.__name__ = 'commits'
+
+
+class create_0(Record):
+    __slots__ = ('href', 'method')
+    _fields = __slots__
+
+    def __init__(_self, href, method):
+        _self.href = href
+        _self.method = method
+
+
+create_0.__name__ = 'create'
+
+
+class default_reviewers_0(Record):
+    __slots__ = ('href', 'method')
+    _fields = __slots__
+
+    def __init__(_self, href, method):
+        _self.href = href
+        _self.method = method
+
+
+default_reviewers_0.__name__ = 'default_reviewers'
+
+
+class delete_0(Record):
+    __slots__ = ('href', 'method')
+    _fields = __slots__
+
+    def __init__(_self, href, method):
+        _self.href = href
+        _self.method = method
+
+
+delete_0.__name__ = 'delete'
+
+
+class diff_file_attachments_0(Record):
+    __slots__ = ('href', 'method')
+    _fields = __slots__
+
+    def __init__(_self, href, method):
+        _self.href = href
+        _self.method = method
+
+
+diff_file_attachments_0.__name__ = 'diff_file_attachments'
+
+
+class diffs_0(Record):
+    __slots__ = ('base_commit_id', 'basedir', 'extra_data', 'id', 'links',
+        'name', 'revision', 'timestamp')
+    _fields = __slots__
+
+    def __init__(_self, base_commit_id, basedir, extra_data, id, links, name,
+            revision, timestamp):
+        _self.base_commit_id = base_commit_id
+        _self.basedir = basedir
+        _self.extra_data = extra_data
+        _self.id = id
+        _self.links = links
+        _self.name = name
+        _self.revision = revision
+        _self.timestamp = timestamp
+
+
+diffs_0.__name__ = 'diffs'
+
+
+class diffs_1(Record):
+    __slots__ = ('base_commit_ids', 'moved_files')
+    _fields = __slots__
+
+    def __init__(_self, base_commit_ids, moved_files):
+        _self.base_commit_ids = base_commit_ids
+        _self.moved_files = moved_files
+
+
+diffs_1.__name__ = 'diffs'
+
+
+class diffs_2(Record):
+    __slots__ = ('create', 'diffs', 'json', 'links', 'self', 'stat',
+        'total_results')
+    _fields = __slots__
+
+    def __init__(_self, create, diffs, json, links, self, stat, total_results):
+        _self.create = create
+        _self.diffs = diffs
+        _self.json = json
+        _self.links = links
+        _self.self = self
+        _self.stat = stat
+        _self.total_results = total_results
+
+
+diffs_2.__name__ = 'diffs'
+
+
+class diffs_3(Record):
+    __slots__ = ('create', 'self')
+    _fields = __slots__
+
+    def __init__(_self, create, self):
+        _self.create = create
+        _self.self = self
+
+
+diffs_3.__name__ = 'diffs'
+
+
+class diffs_4(Record):
+    __slots__ = ('diffs', 'json', 'links', 'stat', 'total_results')
+    _fields = __slots__
+
+    def __init__(_self, diffs, json, links, stat, total_results):
+        _self.diffs = diffs
+        _self.json = json
+        _self.links = links
+        _self.stat = stat
+        _self.total_results = total_results
+
+
+diffs_4.__name__ = 'diffs'
+
+
+class diffs_5(Record):
+    __slots__ = ('href', 'method')
+    _fields = __slots__
+
+    def __init__(_self, href, method):
+        _self.href = href
+        _self.method = method
+
+
+diffs_5.__name__ = 'diffs'
+
+
+class draft_0(Record):
+    __slots__ = ('href', 'method')
+    _fields = __slots__
+
+    def __init__(_self, href, method):
+        _self.href = href
+        _self.method = method
+
+
+draft_0.__name__ = 'draft'
+
+
+class draft_files_0(Record):
+    __slots__ = ('href', 'method')
+    _fields = __slots__
+
+    def __init__(_self, href, method):
+        _self.href = href
+        _self.method = method
+
+
+draft_files_0.__name__ = 'draft_files'
+
+
+class extensions_0(Record):
+    __slots__ = ('href', 'method')
+    _fields = __slots__
+
+    def __init__(_self, href, method):
+        _self.href = href
+        _self.method = method
+
+
+extensions_0.__name__ = 'extensions'
+
+
+class extra_data_0(Record):
+    __slots__ = ()
+    _fields = __slots__
+
+    def __init__(_self):
+        pass
+
+
+extra_data_0.__name__ = 'extra_data'
+
+
+class file_attachments_0(Record):
+    __slots__ = ('href', 'method')
+    _fields = __slots__
+
+    def __init__(_self, href, method):
+        _self.href = href
+        _self.method = method
+
+
+file_attachments_0.__name__ = 'file_attachments'
+
+
+class files_0(Record):
+    __slots__ = ('href', 'method')
+    _fields = __slots__
+
+    def __init__(_self, href, method):
+        _self.href = href
+        _self.method = method
+
+
+files_0.__name__ = 'files'
+
+
+class git_0(Record):
+    __slots__ = ('empty_files',)
+    _fields = __slots__
+
+    def __init__(_self, empty_files):
+        _self.empty_files = empty_files
+
+
+git_0.__name__ = 'git'
+
+
+class groups_0(Record):
+    __slots__ = ('href', 'method')
+    _fields = __slots__
+
+    def __init__(_self, href, method):
+        _self.href = href
+        _self.method = method
+
+
+groups_0.__name__ = 'groups'
+
+
+class hosting_service_accounts_0(Record):
+    __slots__ = ('href', 'method')
+    _fields = __slots__
+
+    def __init__(_self, href, method):
+        _self.href = href
+        _self.method = method
+
+
+hosting_service_accounts_0.__name__ = 'hosting_service_accounts'
+
+
+class hosting_services_0(Record):
+    __slots__ = ('href', 'method')
+    _fields = __slots__
+
+    def __init__(_self, href, method):
+        _self.href = href
+        _self.method = method
+
+
+hosting_services_0.__name__ = 'hosting_services'
+
+
+class info_0(Record):
+    __slots__ = ('href', 'method')
+    _fields = __slots__
+
+    def __init__(_self, href, method):
+        _self.href = href
+        _self.method = method
+
+
+info_0.__name__ = 'info'
+
+
+class last_update_0(Record):
+    __slots__ = ('href', 'method')
+    _fields = __slots__
+
+    def __init__(_self, href, method):
+        _self.href = href
+        _self.method = method
+
+
+last_update_0.__name__ = 'last_update'
+
+
+class links_0(Record):
+    __slots__ = ('api_tokens', 'archived_review_requests',
+        'muted_review_requests', 'self', 'user_file_attachments', 'watched')
+    _fields = __slots__
+
+    def __init__(_self, api_tokens, archived_review_requests,
+            muted_review_requests, self, user_file_attachments, watched):
+        _self.api_tokens = api_tokens
+        _self.archived_review_requests = archived_review_requests
+        _self.muted_review_requests = muted_review_requests
+        _self.self = self
+        _self.user_file_attachments = user_file_attachments
+        _self.watched = watched
+
+
+links_0.__name__ = 'links'
+
+
+class links_1(Record):
+    __slots__ = ('branches', 'commits', 'diff_file_attachments', 'info',
+        'self')
+    _fields = __slots__
+
+    def __init__(_self, branches, commits, diff_file_attachments, info, self):
+        _self.branches = branches
+        _self.commits = commits
+        _self.diff_file_attachments = diff_file_attachments
+        _self.info = info
+        _self.self = self
+
+
+links_1.__name__ = 'links'
+
+
+class links_2(Record):
+    __slots__ = ('changes', 'delete', 'diffs', 'draft', 'file_attachments',
+        'last_update', 'repository', 'reviews', 'screenshots', 'self',
+        'submitter', 'update')
+    _fields = __slots__
+
+    def __init__(_self, changes, delete, diffs, draft, file_attachments,
+            last_update, repository, reviews, screenshots, self, submitter,
+            update):
+        _self.changes = changes
+        _self.delete = delete
+        _self.diffs = diffs
+        _self.draft = draft
+        _self.file_attachments = file_attachments
+        _self.last_update = last_update
+        _self.repository = repository
+        _self.reviews = reviews
+        _self.screenshots = screenshots
+        _self.self = self
+        _self.submitter = submitter
+        _self.update = update
+
+
+links_2.__name__ = 'links'
+
+
+class links_3(Record):
+    __slots__ = ('create', 'next', 'self')
+    _fields = __slots__
+
+    def __init__(_self, create, next, self):
+        _self.create = create
+        _self.next = next
+        _self.self = self
+
+
+links_3.__name__ = 'links'
+
+
+class links_4(Record):
+    __slots__ = ('create', 'self')
+    _fields = __slots__
+
+    def __init__(_self, create, self):
+        _self.create = create
+        _self.self = self
+
+
+links_4.__name__ = 'links'
+
+
+class links_5(Record):
+    __slots__ = ('default_reviewers', 'extensions', 'groups',
+        'hosting_service_accounts', 'hosting_services', 'info', 'repositories',
+        'review_requests', 'search', 'self', 'session', 'users', 'validation',
+        'webhooks')
+    _fields = __slots__
+
+    def __init__(_self, default_reviewers, extensions, groups,
+            hosting_service_accounts, hosting_services, info, repositories,
+            review_requests, search, self, session, users, validation,
+            webhooks):
+        _self.default_reviewers = default_reviewers
+        _self.extensions = extensions
+        _self.groups = groups
+        _self.hosting_service_accounts = hosting_service_accounts
+        _self.hosting_services = hosting_services
+        _self.info = info
+        _self.repositories = repositories
+        _self.review_requests = review_requests
+        _self.search = search
+        _self.self = self
+        _self.session = session
+        _self.users = users
+        _self.validation = validation
+        _self.webhooks = webhooks
+
+
+links_5.__name__ = 'links'
+
+
+class links_6(Record):
+    __slots__ = ('delete', 'self', 'user')
+    _fields = __slots__
+
+    def __init__(_self, delete, self, user):
+        _self.delete = delete
+        _self.self = self
+        _self.user = user
+
+
+links_6.__name__ = 'links'
+
+
+class links_7(Record):
+    __slots__ = ('draft_files', 'files', 'repository', 'self')
+    _fields = __slots__
+
+    def __init__(_self, draft_files, files, repository, self):
+        _self.draft_files = draft_files
+        _self.files = files
+        _self.repository = repository
+        _self.self = self
+
+
+links_7.__name__ = 'links'
+
+
+class mercurial_0(Record):
+    __slots__ = ('empty_files',)
+    _fields = __slots__
+
+    def __init__(_self, empty_files):
+        _self.empty_files = empty_files
+
+
+mercurial_0.__name__ = 'mercurial'
+
+
+class muted_review_requests_0(Record):
+    __slots__ = ('href', 'method')
+    _fields = __slots__
+
+    def __init__(_self, href, method):
+        _self.href = href
+        _self.method = method
+
+
+muted_review_requests_0.__name__ = 'muted_review_requests'
+
+
+class next_0(Record):
+    __slots__ = ('href', 'method')
+    _fields = __slots__
+
+    def __init__(_self, href, method):
+        _self.href = href
+        _self.method = method
+
+
+next_0.__name__ = 'next'
+
+
+class perforce_0(Record):
+    __slots__ = ('empty_files', 'moved_files')
+    _fields = __slots__
+
+    def __init__(_self, empty_files, moved_files):
+        _self.empty_files = empty_files
+        _self.moved_files = moved_files
+
+
+perforce_0.__name__ = 'perforce'
+
+
+class product_0(Record):
+    __slots__ = ('is_release', 'name', 'package_version', 'version')
+    _fields = __slots__
+
+    def __init__(_self, is_release, name, package_version, version):
+        _self.is_release = is_release
+        _self.name = name
+        _self.package_version = package_version
+        _self.version = version
+
+
+product_0.__name__ = 'product'
+
+
+class repositories_0(Record):
+    __slots__ = ('href', 'method')
+    _fields = __slots__
+
+    def __init__(_self, href, method):
+        _self.href = href
+        _self.method = method
+
+
+repositories_0.__name__ = 'repositories'
+
+
+class repository_0(Record):
+    __slots__ = ()
+    _fields = __slots__
+
+    def __init__(_self):
+        pass
+
+
+repository_0.__name__ = 'repository'
+
+
+class repository_1(Record):
+    __slots__ = ('bug_tracker', 'id', 'links', 'mirror_path', 'name', 'path',
+        'tool', 'visible')
+    _fields = __slots__
+
+    def __init__(_self, bug_tracker, id, links, mirror_path, name, path, tool,
+            visible):
+        _self.bug_tracker = bug_tracker
+        _self.id = id
+        _self.links = links
+        _self.mirror_path = mirror_path
+        _self.name = name
+        _self.path = path
+        _self.tool = tool
+        _self.visible = visible
+
+
+repository_1.__name__ = 'repository'
+
+
+class repository_2(Record):
+    __slots__ = ('href', 'method', 'title')
+    _fields = __slots__
+
+    def __init__(_self, href, method, title):
+        _self.href = href
+        _self.method = method
+        _self.title = title
+
+
+repository_2.__name__ = 'repository'
+
+
+class repository_3(Record):
+    __slots__ = ('json', 'repository', 'stat')
+    _fields = __slots__
+
+    def __init__(_self, json, repository, stat):
+        _self.json = json
+        _self.repository = repository
+        _self.stat = stat
+
+
+repository_3.__name__ = 'repository'
+
+
+class review_request_0(Record):
+    __slots__ = ()
+    _fields = __slots__
+
+    def __init__(_self):
+        pass
+
+
+review_request_0.__name__ = 'review_request'
+
+
+class review_request_1(Record):
+    __slots__ = ('absolute_url', 'approval_failure', 'approved', 'blocks',
+        'branch', 'bugs_closed', 'changenum', 'close_description',
+        'close_description_text_type', 'commit_id', 'depends_on',
+        'description', 'description_text_type', 'extra_data', 'id',
+        'issue_dropped_count', 'issue_open_count', 'issue_resolved_count',
+        'issue_verifying_count', 'last_updated', 'links', 'public',
+        'ship_it_count', 'status', 'summary', 'target_groups', 'target_people',
+        'testing_done', 'testing_done_text_type', 'text_type', 'time_added',
+        'url')
+    _fields = __slots__
+
+    def __init__(_self, absolute_url, approval_failure, approved, blocks,
+            branch, bugs_closed, changenum, close_description,
+            close_description_text_type, commit_id, depends_on, description,
+            description_text_type, extra_data, id, issue_dropped_count,
+            issue_open_count, issue_resolved_count, issue_verifying_count,
+            last_updated, links, public, ship_it_count, status, summary,
+            target_groups, target_people, testing_done, testing_done_text_type,
+            text_type, time_added, url):
+        _self.absolute_url = absolute_url
+        _self.approval_failure = approval_failure
+        _self.approved = approved
+        _self.blocks = blocks
+        _self.branch = branch
+        _self.bugs_closed = bugs_closed
+        _self.changenum = changenum
+        _self.close_description = close_description
+        _self.close_description_text_type = close_description_text_type
+        _self.commit_id = commit_id
+        _self.depends_on = depends_on
+        _self.description = description
+        _self.description_text_type = description_text_type
+        _self.extra_data = extra_data
+        _self.id = id
+        _self.issue_dropped_count = issue_dropped_count
+        _self.issue_open_count = issue_open_count
+        _self.issue_resolved_count = issue_resolved_count
+        _self.issue_verifying_count = issue_verifying_count
+        _self.last_updated = last_updated
+        _self.links = links
+        _self.public = public
+        _self.ship_it_count = ship_it_count
+        _self.status = status
+        _self.summary = summary
+        _self.target_groups = target_groups
+        _self.target_people = target_people
+        _self.testing_done = testing_done
+        _self.testing_done_text_type = testing_done_text_type
+        _self.text_type = text_type
+        _self.time_added = time_added
+        _self.url = url
+
+
+review_request_1.__name__ = 'review_request'
+
+
+class review_request_2(Record):
+    __slots__ = ('json', 'review_request', 'stat')
+    _fields = __slots__
+
+    def __init__(_self, json, review_request, stat):
+        _self.json = json
+        _self.review_request = review_request
+        _self.stat = stat
+
+
+review_request_2.__name__ = 'review_request'
+
+
+class review_requests_0(Record):
+    __slots__ = ('absolute_url', 'approval_failure', 'approved', 'blocks',
+        'branch', 'bugs_closed', 'changenum', 'close_description',
+        'close_description_text_type', 'commit_id', 'depends_on',
+        'description', 'description_text_type', 'extra_data', 'id',
+        'issue_dropped_count', 'issue_open_count', 'issue_resolved_count',
+        'issue_verifying_count', 'last_updated', 'links', 'public',
+        'ship_it_count', 'status', 'summary', 'target_groups', 'target_people',
+        'testing_done', 'testing_done_text_type', 'text_type', 'time_added',
+        'url')
+    _fields = __slots__
+
+    def __init__(_self, absolute_url, approval_failure, approved, blocks,
+            branch, bugs_closed, changenum, close_description,
+            close_description_text_type, commit_id, depends_on, description,
+            description_text_type, extra_data, id, issue_dropped_count,
+            issue_open_count, issue_resolved_count, issue_verifying_count,
+            last_updated, links, public, ship_it_count, status, summary,
+            target_groups, target_people, testing_done, testing_done_text_type,
+            text_type, time_added, url):
+        _self.absolute_url = absolute_url
+        _self.approval_failure = approval_failure
+        _self.approved = approved
+        _self.blocks = blocks
+        _self.branch = branch
+        _self.bugs_closed = bugs_closed
+        _self.changenum = changenum
+        _self.close_description = close_description
+        _self.close_description_text_type = close_description_text_type
+        _self.commit_id = commit_id
+        _self.depends_on = depends_on
+        _self.description = description
+        _self.description_text_type = description_text_type
+        _self.extra_data = extra_data
+        _self.id = id
+        _self.issue_dropped_count = issue_dropped_count
+        _self.issue_open_count = issue_open_count
+        _self.issue_resolved_count = issue_resolved_count
+        _self.issue_verifying_count = issue_verifying_count
+        _self.last_updated = last_updated
+        _self.links = links
+        _self.public = public
+        _self.ship_it_count = ship_it_count
+        _self.status = status
+        _self.summary = summary
+        _self.target_groups = target_groups
+        _self.target_people = target_people
+        _self.testing_done = testing_done
+        _self.testing_done_text_type = testing_done_text_type
+        _self.text_type = text_type
+        _self.time_added = time_added
+        _self.url = url
+
+
+review_requests_0.__name__ = 'review_requests'
+
+
+class review_requests_1(Record):
+    __slots__ = ('create', 'json', 'links', 'next', 'review_requests', 'self',
+        'stat', 'total_results')
+    _fields = __slots__
+
+    def __init__(_self, create, json, links, next, review_requests, self, stat,
+            total_results):
+        _self.create = create
+        _self.json = json
+        _self.links = links
+        _self.next = next
+        _self.review_requests = review_requests
+        _self.self = self
+        _self.stat = stat
+        _self.total_results = total_results
+
+
+review_requests_1.__name__ = 'review_requests'
+
+
+class review_requests_2(Record):
+    __slots__ = ('create', 'next', 'self')
+    _fields = __slots__
+
+    def __init__(_self, create, next, self):
+        _self.create = create
+        _self.next = next
+        _self.self = self
+
+
+review_requests_2.__name__ = 'review_requests'
+
+
+class review_requests_3(Record):
+    __slots__ = ('href', 'method')
+    _fields = __slots__
+
+    def __init__(_self, href, method):
+        _self.href = href
+        _self.method = method
+
+
+review_requests_3.__name__ = 'review_requests'
+
+
+class review_requests_4(Record):
+    __slots__ = ('json', 'links', 'review_requests', 'stat', 'total_results')
+    _fields = __slots__
+
+    def __init__(_self, json, links, review_requests, stat, total_results):
+        _self.json = json
+        _self.links = links
+        _self.review_requests = review_requests
+        _self.stat = stat
+        _self.total_results = total_results
+
+
+review_requests_4.__name__ = 'review_requests'
+
+
+class reviews_0(Record):
+    __slots__ = ('href', 'method')
+    _fields = __slots__
+
+    def __init__(_self, href, method):
+        _self.href = href
+        _self.method = method
+
+
+reviews_0.__name__ = 'reviews'
+
+
+class root_0(Record):
+    __slots__ = ('capabilities', 'default_reviewers', 'extensions', 'groups',
+        'hosting_service_accounts', 'hosting_services', 'info', 'json',
+        'links', 'product', 'repositories', 'review_requests', 'search',
+        'self', 'session', 'site', 'stat', 'uri_templates', 'users',
+        'validation', 'webhooks')
+    _fields = __slots__
+
+    def __init__(_self, capabilities, default_reviewers, extensions, groups,
+            hosting_service_accounts, hosting_services, info, json, links,
+            product, repositories, review_requests, search, self, session,
+            site, stat, uri_templates, users, validation, webhooks):
+        _self.capabilities = capabilities
+        _self.default_reviewers = default_reviewers
+        _self.extensions = extensions
+        _self.groups = groups
+        _self.hosting_service_accounts = hosting_service_accounts
+        _self.hosting_services = hosting_services
+        _self.info = info
+        _self.json = json
+        _self.links = links
+        _self.product = product
+        _self.repositories = repositories
+        _self.review_requests = review_requests
+        _self.search = search
+        _self.self = self
+        _self.session = session
+        _self.site = site
+        _self.stat = stat
+        _self.uri_templates = uri_templates
+        _self.users = users
+        _self.validation = validation
+        _self.webhooks = webhooks
+
+
+root_0.__name__ = 'root'
+
+
+class root_1(Record):
+    __slots__ = ('capabilities', 'json', 'links', 'product', 'site', 'stat',
+        'uri_templates')
+    _fields = __slots__
+
+    def __init__(_self, capabilities, json, links, product, site, stat,
+            uri_templates):
+        _self.capabilities = capabilities
+        _self.json = json
+        _self.links = links
+        _self.product = product
+        _self.site = site
+        _self.stat = stat
+        _self.uri_templates = uri_templates
+
+
+root_1.__name__ = 'root'
+
+
+class root_2(Record):
+    __slots__ = ('default_reviewers', 'extensions', 'groups',
+        'hosting_service_accounts', 'hosting_services', 'info', 'repositories',
+        'review_requests', 'search', 'self', 'session', 'users', 'validation',
+        'webhooks')
+    _fields = __slots__
+
+    def __init__(_self, default_reviewers, extensions, groups,
+            hosting_service_accounts, hosting_services, info, repositories,
+            review_requests, search, self, session, users, validation,
+            webhooks):
+        _self.default_reviewers = default_reviewers
+        _self.extensions = extensions
+        _self.groups = groups
+        _self.hosting_service_accounts = hosting_service_accounts
+        _self.hosting_services = hosting_services
+        _self.info = info
+        _self.repositories = repositories
+        _self.review_requests = review_requests
+        _self.search = search
+        _self.self = self
+        _self.session = session
+        _self.users = users
+        _self.validation = validation
+        _self.webhooks = webhooks
+
+
+root_2.__name__ = 'root'
+
+
+class scmtools_0(Record):
+    __slots__ = ('git', 'mercurial', 'perforce', 'svn')
+    _fields = __slots__
+
+    def __init__(_self, git, mercurial, perforce, svn):
+        _self.git = git
+        _self.mercurial = mercurial
+        _self.perforce = perforce
+        _self.svn = svn
+
+
+scmtools_0.__name__ = 'scmtools'
+
+
+class screenshots_0(Record):
+    __slots__ = ('href', 'method')
+    _fields = __slots__
+
+    def __init__(_self, href, method):
+        _self.href = href
+        _self.method = method
+
+
+screenshots_0.__name__ = 'screenshots'
+
+
+class search_0(Record):
+    __slots__ = ('href', 'method')
+    _fields = __slots__
+
+    def __init__(_self, href, method):
+        _self.href = href
+        _self.method = method
+
+
+search_0.__name__ = 'search'
+
+
+class self_0(Record):
+    __slots__ = ('href', 'method')
+    _fields = __slots__
+
+    def __init__(_self, href, method):
+        _self.href = href
+        _self.method = method
+
+
+self_0.__name__ = 'self'
+
+
+class session_0(Record):
+    __slots__ = ()
+    _fields = __slots__
+
+    def __init__(_self):
+        pass
+
+
+session_0.__name__ = 'session'
+
+
+class session_1(Record):
+    __slots__ = ('authenticated', 'links')
+    _fields = __slots__
+
+    def __init__(_self, authenticated, links):
+        _self.authenticated = authenticated
+        _self.links = links
+
+
+session_1.__name__ = 'session'
+
+
+class session_2(Record):
+    __slots__ = ('href', 'method')
+    _fields = __slots__
+
+    def __init__(_self, href, method):
+        _self.href = href
+        _self.method = method
+
+
+session_2.__name__ = 'session'
+
+
+class session_3(Record):
+    __slots__ = ('json', 'session', 'stat')
+    _fields = __slots__
+
+    def __init__(_self, json, session, stat):
+        _self.json = json
+        _self.session = session
+        _self.stat = stat
+
+
+session_3.__name__ = 'session'
+
+
+class site_0(Record):
+    __slots__ = ('administrators', 'time_zone', 'url')
+    _fields = __slots__
+
+    def __init__(_self, administrators, time_zone, url):
+        _self.administrators = administrators
+        _self.time_zone = time_zone
+        _self.url = url
+
+
+site_0.__name__ = 'site'
+
+
+class submitter_0(Record):
+    __slots__ = ('href', 'method', 'title')
+    _fields = __slots__
+
+    def __init__(_self, href, method, title):
+        _self.href = href
+        _self.method = method
+        _self.title = title
+
+
+submitter_0.__name__ = 'submitter'
+
+
+class svn_0(Record):
+    __slots__ = ('empty_files',)
+    _fields = __slots__
+
+    def __init__(_self, empty_files):
+        _self.empty_files = empty_files
+
+
+svn_0.__name__ = 'svn'
+
+
+class target_groups_0(Record):
+    __slots__ = ('href', 'method', 'title')
+    _fields = __slots__
+
+    def __init__(_self, href, method, title):
+        _self.href = href
+        _self.method = method
+        _self.title = title
+
+
+target_groups_0.__name__ = 'target_groups'
+
+
+class text_0(Record):
+    __slots__ = ('can_include_raw_values', 'markdown', 'per_field_text_types')
+    _fields = __slots__
+
+    def __init__(_self, can_include_raw_values, markdown,
+            per_field_text_types):
+        _self.can_include_raw_values = can_include_raw_values
+        _self.markdown = markdown
+        _self.per_field_text_types = per_field_text_types
+
+
+text_0.__name__ = 'text'
+
+
+class update_0(Record):
+    __slots__ = ('href', 'method')
+    _fields = __slots__
+
+    def __init__(_self, href, method):
+        _self.href = href
+        _self.method = method
+
+
+update_0.__name__ = 'update'
+
+
+class uri_templates_0(Record):
+    __slots__ = ('diffs', 'groups', 'info', 'repositories', 'repository',
+        'review_request', 'review_requests', 'reviews', 'root', 'session',
+        'user', 'users')
+    _fields = __slots__
+
+    def __init__(_self, diffs, groups, info, repositories, repository,
+            review_request, review_requests, reviews, root, session, user,
+            users):
+        _self.diffs = diffs
+        _self.groups = groups
+        _self.info = info
+        _self.repositories = repositories
+        _self.repository = repository
+        _self.review_request = review_request
+        _self.review_requests = review_requests
+        _self.reviews = reviews
+        _self.root = root
+        _self.session = session
+        _self.user = user
+        _self.users = users
+
+
+uri_templates_0.__name__ = 'uri_templates'
+
+
+class user_0(Record):
+    __slots__ = ()
+    _fields = __slots__
+
+    def __init__(_self):
+        pass
+
+
+user_0.__name__ = 'user'
+
+
+class user_1(Record):
+    __slots__ = ('avatar_url', 'email', 'first_name', 'fullname', 'id',
+        'is_active', 'last_name', 'links', 'url', 'username')
+    _fields = __slots__
+
+    def __init__(_self, avatar_url, email, first_name, fullname, id, is_active,
+            last_name, links, url, username):
+        _self.avatar_url = avatar_url
+        _self.email = email
+        _self.first_name = first_name
+        _self.fullname = fullname
+        _self.id = id
+        _self.is_active = is_active
+        _self.last_name = last_name
+        _self.links = links
+        _self.url = url
+        _self.username = username
+
+
+user_1.__name__ = 'user'
+
+
+class user_2(Record):
+    __slots__ = ('href', 'method', 'title')
+    _fields = __slots__
+
+    def __init__(_self, href, method, title):
+        _self.href = href
+        _self.method = method
+        _self.title = title
+
+
+user_2.__name__ = 'user'
+
+
+class user_3(Record):
+    __slots__ = ('json', 'stat', 'user')
+    _fields = __slots__
+
+    def __init__(_self, json, stat, user):
+        _self.json = json
+        _self.stat = stat
+        _self.user = user
+
+
+user_3.__name__ = 'user'
+
+
+class user_file_attachments_0(Record):
+    __slots__ = ('href', 'method')
+    _fields = __slots__
+
+    def __init__(_self, href, method):
+        _self.href = href
+        _self.method = method
+
+
+user_file_attachments_0.__name__ = 'user_file_attachments'
+
+
+class users_0(Record):
+    __slots__ = ('href', 'method')
+    _fields = __slots__
+
+    def __init__(_self, href, method):
+        _self.href = href
+        _self.method = method
+
+
+users_0.__name__ = 'users'
+
+
+class validation_0(Record):
+    __slots__ = ('href', 'method')
+    _fields = __slots__
+
+    def __init__(_self, href, method):
+        _self.href = href
+        _self.method = method
+
+
+validation_0.__name__ = 'validation'
+
+
+class watched_0(Record):
+    __slots__ = ('href', 'method')
+    _fields = __slots__
+
+    def __init__(_self, href, method):
+        _self.href = href
+        _self.method = method
+
+
+watched_0.__name__ = 'watched'
+
+
+class webhooks_0(Record):
+    __slots__ = ('href', 'method')
+    _fields = __slots__
+
+    def __init__(_self, href, method):
+        _self.href = href
+        _self.method = method
+
+
+webhooks_0.__name__ = 'webhooks'
+
+
+# Records keyed by component name and field names.
+table = {
+    ('administrators', frozenset(('email', 'name'))): administrators_0,
+    ('api_tokens', frozenset(('href', 'method'))): api_tokens_0,
+    ('archived_review_requests', frozenset(('href', 'method'))):
+        archived_review_requests_0,
+    ('branches', frozenset(('href', 'method'))): branches_0,
+    ('capabilities', frozenset(('diffs', 'scmtools', 'text'))): capabilities_0,
+    ('changes', frozenset(('href', 'method'))): changes_0,
+    ('commits', frozenset(('href', 'method'))): commits_0,
+    ('create', frozenset(('href', 'method'))): create_0,
+    ('default_reviewers', frozenset(('href', 'method'))): default_reviewers_0,
+    ('delete', frozenset(('href', 'method'))): delete_0,
+    ('diff_file_attachments', frozenset(('href', 'method'))):
+        diff_file_attachments_0,
+    ('diffs', frozenset(('base_commit_id', 'basedir', 'extra_data', 'id',
+        'links', 'name', 'revision', 'timestamp'))): diffs_0,
+    ('diffs', frozenset(('base_commit_ids', 'moved_files'))): diffs_1,
+    ('diffs', frozenset(('create', 'diffs', 'json', 'links', 'self', 'stat',
+        'total_results'))): diffs_2,
+    ('diffs', frozenset(('create', 'self'))): diffs_3,
+    ('diffs', frozenset(('diffs', 'json', 'links', 'stat', 'total_results'))):
+        diffs_4,
+    ('diffs', frozenset(('href', 'method'))): diffs_5,
+    ('draft', frozenset(('href', 'method'))): draft_0,
+    ('draft_files', frozenset(('href', 'method'))): draft_files_0,
+    ('extensions', frozenset(('href', 'method'))): extensions_0,
+    ('extra_data', frozenset(())): extra_data_0,
+    ('file_attachments', frozenset(('href', 'method'))): file_attachments_0,
+    ('files', frozenset(('href', 'method'))): files_0,
+    ('git', frozenset(('empty_files',))): git_0,
+    ('groups', frozenset(('href', 'method'))): groups_0,
+    ('hosting_service_accounts', frozenset(('href', 'method'))):
+        hosting_service_accounts_0,
+    ('hosting_services', frozenset(('href', 'method'))): hosting_services_0,
+    ('info', frozenset(('href', 'method'))): info_0,
+    ('last_update', frozenset(('href', 'method'))): last_update_0,
+    ('links', frozenset(('api_tokens', 'archived_review_requests',
+        'muted_review_requests', 'self', 'user_file_attachments', 'watched'))):
+        links_0,
+    ('links', frozenset(('branches', 'commits', 'diff_file_attachments',
+        'info', 'self'))): links_1,
+    ('links', frozenset(('changes', 'delete', 'diffs', 'draft',
+        'file_attachments', 'last_update', 'repository', 'reviews',
+        'screenshots', 'self', 'submitter', 'update'))): links_2,
+    ('links', frozenset(('create', 'next', 'self'))): links_3,
+    ('links', frozenset(('create', 'self'))): links_4,
+    ('links', frozenset(('default_reviewers', 'extensions', 'groups',
+        'hosting_service_accounts', 'hosting_services', 'info', 'repositories',
+        'review_requests', 'search', 'self', 'session', 'users', 'validation',
+        'webhooks'))): links_5,
+    ('links', frozenset(('delete', 'self', 'user'))): links_6,
+    ('links', frozenset(('draft_files', 'files', 'repository', 'self'))):
+        links_7,
+    ('mercurial', frozenset(('empty_files',))): mercurial_0,
+    ('muted_review_requests', frozenset(('href', 'method'))):
+        muted_review_requests_0,
+    ('next', frozenset(('href', 'method'))): next_0,
+    ('perforce', frozenset(('empty_files', 'moved_files'))): perforce_0,
+    ('product', frozenset(('is_release', 'name', 'package_version',
+        'version'))): product_0,
+    ('repositories', frozenset(('href', 'method'))): repositories_0,
+    ('repository', frozenset(())): repository_0,
+    ('repository', frozenset(('bug_tracker', 'id', 'links', 'mirror_path',
+        'name', 'path', 'tool', 'visible'))): repository_1,
+    ('repository', frozenset(('href', 'method', 'title'))): repository_2,
+    ('repository', frozenset(('json', 'repository', 'stat'))): repository_3,
+    ('review_request', frozenset(())): review_request_0,
+    ('review_request', frozenset(('absolute_url', 'approval_failure',
+        'approved', 'blocks', 'branch', 'bugs_closed', 'changenum',
+        'close_description', 'close_description_text_type', 'commit_id',
+        'depends_on', 'description', 'description_text_type', 'extra_data',
+        'id', 'issue_dropped_count', 'issue_open_count',
+        'issue_resolved_count', 'issue_verifying_count', 'last_updated',
+        'links', 'public', 'ship_it_count', 'status', 'summary',
+        'target_groups', 'target_people', 'testing_done',
+        'testing_done_text_type', 'text_type', 'time_added', 'url'))):
+        review_request_1,
+    ('review_request', frozenset(('json', 'review_request', 'stat'))):
+        review_request_2,
+    ('review_requests', frozenset(('absolute_url', 'approval_failure',
+        'approved', 'blocks', 'branch', 'bugs_closed', 'changenum',
+        'close_description', 'close_description_text_type', 'commit_id',
+        'depends_on', 'description', 'description_text_type', 'extra_data',
+        'id', 'issue_dropped_count', 'issue_open_count',
+        'issue_resolved_count', 'issue_verifying_count', 'last_updated',
+        'links', 'public', 'ship_it_count', 'status', 'summary',
+        'target_groups', 'target_people', 'testing_done',
+        'testing_done_text_type', 'text_type', 'time_added', 'url'))):
+        review_requests_0,
+    ('review_requests', frozenset(('create', 'json', 'links', 'next',
+        'review_requests', 'self', 'stat', 'total_results'))):
+        review_requests_1,
+    ('review_requests', frozenset(('create', 'next', 'self'))):
+        review_requests_2,
+    ('review_requests', frozenset(('href', 'method'))): review_requests_3,
+    ('review_requests', frozenset(('json', 'links', 'review_requests', 'stat',
+        'total_results'))): review_requests_4,
+    ('reviews', frozenset(('href', 'method'))): reviews_0,
+    ('root', frozenset(('capabilities', 'default_reviewers', 'extensions',
+        'groups', 'hosting_service_accounts', 'hosting_services', 'info',
+        'json', 'links', 'product', 'repositories', 'review_requests',
+        'search', 'self', 'session', 'site', 'stat', 'uri_templates', 'users',
+        'validation', 'webhooks'))): root_0,
+    ('root', frozenset(('capabilities', 'json', 'links', 'product', 'site',
+        'stat', 'uri_templates'))): root_1,
+    ('root', frozenset(('default_reviewers', 'extensions', 'groups',
+        'hosting_service_accounts', 'hosting_services', 'info', 'repositories',
+        'review_requests', 'search', 'self', 'session', 'users', 'validation',
+        'webhooks'))): root_2,
+    ('scmtools', frozenset(('git', 'mercurial', 'perforce', 'svn'))):
+        scmtools_0,
+    ('screenshots', frozenset(('href', 'method'))): screenshots_0,
+    ('search', frozenset(('href', 'method'))): search_0,
+    ('self', frozenset(('href', 'method'))): self_0,
+    ('session', frozenset(())): session_0,
+    ('session', frozenset(('authenticated', 'links'))): session_1,
+    ('session', frozenset(('href', 'method'))): session_2,
+    ('session', frozenset(('json', 'session', 'stat'))): session_3,
+    ('site', frozenset(('administrators', 'time_zone', 'url'))): site_0,
+    ('submitter', frozenset(('href', 'method', 'title'))): submitter_0,
+    ('svn', frozenset(('empty_files',))): svn_0,
+    ('target_groups', frozenset(('href', 'method', 'title'))): target_groups_0,
+    ('text', frozenset(('can_include_raw_values', 'markdown',
+        'per_field_text_types'))): text_0,
+    ('update', frozenset(('href', 'method'))): update_0,
+    ('uri_templates', frozenset(('diffs', 'groups', 'info', 'repositories',
+        'repository', 'review_request', 'review_requests', 'reviews', 'root',
+        'session', 'user', 'users'))): uri_templates_0,
+    ('user', frozenset(())): user_0,
+    ('user', frozenset(('avatar_url', 'email', 'first_name', 'fullname', 'id',
+        'is_active', 'last_name', 'links', 'url', 'username'))): user_1,
+    ('user', frozenset(('href', 'method', 'title'))): user_2,
+    ('user', frozenset(('json', 'stat', 'user'))): user_3,
+    ('user_file_attachments', frozenset(('href', 'method'))):
+        user_file_attachments_0,
+    ('users', frozenset(('href', 'method'))): users_0,
+    ('validation', frozenset(('href', 'method'))): validation_0,
+    ('watched', frozenset(('href', 'method'))): watched_0,
+    ('webhooks', frozenset(('href', 'method'))): webhooks_0,
+}
@@ -0,0 +1,115 @@
+#-------------------------------------------------------------------------------
+# rbtlib: registry.py
+#
+# Cache the named tuple types used to build composite objects.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+import collections
+from record import replace
+import records
+import threading
+
+
+class TypeRegistry(object):
+    """Bounded cache of the named tuple types used by composite objects.
+
+    Creating a named tuple type is expensive. Responses share a small number of
+    shapes, so each type is keyed by the component name and the field names
+    found in the response. Identical shapes reuse the same type along with the
+    mapping from response keys to field names.
+
+    The registry is safe to share between threads. Once full, the least
+    recently used type is discarded. A registry with a maximum size of zero
+    retains nothing and builds a new type on every lookup.
+
+    Records generated ahead of time for known components are used in place of
+    named tuples whenever the component name and field names match.
+
+    Attributes:
+        maxsize: the maximum number of types retained.
+        table: records keyed by component name and field names.
+    """
+
+    def __init__(self, maxsize = 1024, table = records.table):
+        super(TypeRegistry, self).__init__()
+        self._maxsize = maxsize
+        self._table = table
+        self._lock = threading.Lock()
+        self._types = collections.OrderedDict()
+
+    @property
+    def maxsize(self):
+        return self._maxsize
+
+    def __len__(self):
+        return len(self._types)
+
+    def clear(self):
+        """Discard all retained types."""
+        with self._lock:
+            self._types.clear()
+
+    def build(self, name, field_names):
+        """Create the named tuple type for a component.
+
+        Args:
+            name: the component name.
+            field_names: a tuple containing the keys found in the response.
+
+        Returns:
+            A tuple containing the record or named tuple type and a dictionary
+            mapping each key in the response to its field name.
+        """
+        field_map = dict((x, replace(x)) for x in field_names)
+        fields = [ field_map[x] for x in field_names ]
+        tuple_descriptor = self._table.get((replace(name), frozenset(fields)))
+        if tuple_descriptor is None:
+            tuple_descriptor = collections.namedtuple(replace(name), fields)
+        return tuple_descriptor, field_map
+
+    def lookup(self, name, field_names):
+        """Obtain the named tuple type for a component.
+
+        Args:
+            name: the component name.
+            field_names: a tuple containing the keys found in the response.
+
+        Returns:
+            A tuple containing the named tuple type and a dictionary mapping
+            each key in the response to its field name.
+        """
+        key = (name, field_names)
+        with self._lock:
+            entry = self._types.pop(key, None)
+            if entry is None:
+                entry = self.build(name, field_names)
+                if self._maxsize <= 0:
+                    return entry
+                if self._maxsize <= len(self._types):
+                    self._types.popitem(last = False)
+            self._types[key] = entry
+            return entry
+
+
+# Types shared by every resource.
+registry = TypeRegistry()
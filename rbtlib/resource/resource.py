@@ -24,9 +24,17 @@
 # FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
 # IN THE SOFTWARE.
 #-------------------------------------------------------------------------------
-import collections
+import connection
+import decoder
 from functools import wraps
+from lazy import LazyComponent
+import pool
+from raw import RawResource
+import registry
+from retry import policy
+from revalidation import conditional_headers
 import stat
+import store
 from types import DictionaryType, DictType, ListType
 
 
@@ -34,8 +42,13 @@ class BadContentType(Exception):
     """HTTP response contains unexpected content type."""
 
 
+class NotModified(Exception):
+    """HTTP response indicates the cached response remains valid."""
+
+
 content_type = {
         'accounts': 'application/vnd.reviewboard.org.hosting-service+json',
+        'api_token': 'application/vnd.reviewboard.org.api-token+json',
         'api_tokens': 'application/json',
         'archived_review_requests': 'application/json',
         'blocks': 'application/json',
@@ -97,20 +110,80 @@ class Resource(object):
     The composite contains a copy of the JSON response from Review Board. This
     permits clients to access the response using a named tuple or dictionary.
 
+    Named tuple types are obtained from a registry shared by all resources.
+
+    A lazy resource defers building the whole-part hierarchy. Each part of the
+    response is converted into a component when it is first accessed.
+
+    A resource with a revalidation cache sends conditional GET requests and
+    reuses the cached composite whenever Review Board responds with 304 Not
+    Modified.
+
+    A resource with a response store reuses fresh responses obtained using
+    HTTP GET, including those obtained by other processes.
+
+    A resource with a retry policy repeats idempotent HTTP commands (i.e., GET,
+    PUT and DELETE) whenever Review Board indicates a transient failure. By
+    default, resources share a single policy and retry budget.
+
+    A raw resource skips building the whole-part hierarchy. The decoded
+    response is returned together with a ResourceFactory for each link (see
+    RawResource). This suits callers requiring the decoded response alone.
+
+    Responses are decoded from their content by the decoder (i.e., a function
+    object accepting the bytes of the response), which defaults to the fastest
+    JSON parser installed.
+
     Attributes:
-        session: HTTP session.
+        session: HTTP session, or None to use one created by
+            connection.session().
         name: Resource name.
+        lazy: build components on first access when True.
+        revalidation: a RevalidationCache or None.
+        store: a ResponseStore or None.
+        retry: a Retry policy or None.
+        decoder: a function object decoding the response content.
+        raw: return the decoded response without building components when
+            True.
     """
 
-    def __init__(self, session, name):
+    registry = registry.registry
+
+    def __init__(self, session, name, lazy = False, revalidation = None,
+            store = None, retry = policy, decoder = decoder.loads, raw = False):
         super(Resource, self).__init__()
-        self._session = session
+        self._session = session if None != session else connection.session()
         self._name = name
+        self._lazy = lazy
+        self._revalidation = revalidation
+        self._store = store
+        self._retry = retry
+        self._decoder = decoder
+        self._raw = raw
 
     @property
     def name(self):
         return self._name
 
+    @property
+    def lazy(self):
+        return self._lazy
+
+    @property
+    def raw(self):
+        return self._raw
+
+    def options(self):
+        """Resource options shared with linked resources.
+
+        Returns:
+            A dictionary containing the keyword arguments used to construct
+            linked resources.
+        """
+        return dict(lazy = self._lazy, revalidation = self._revalidation,
+                store = self._store, retry = self._retry,
+                decoder = self._decoder, raw = self._raw)
+
     def composite(fetch):
         """Build the whole-part hierarchy from the HTTP response.
 
@@ -121,7 +194,7 @@ class Resource(object):
             A function object generating a composite from the obtained data.
         """
         @wraps(fetch)
-        def _composite(self, href, query_dict = dict()):
+        def _composite(self, href, query_dict = dict(), **kwargs):
             """Generate the composite object from the HTTP response.
 
             Args:
@@ -131,8 +204,12 @@ class Resource(object):
             Returns:
                 A composite object containing the whole-part hierarchy.
             """
-            response = fetch(self, href, query_dict)
+            response = fetch(self, href, query_dict, **kwargs)
             assert type(response) is DictType or type(response) is DictionaryType
+            if self._raw:
+                return RawResource(self._name, response)
+            if self._lazy:
+                return LazyComponent(self._name, response, { 'json': response })
             return self.component(self._name, response, { 'json': response })
         return _composite
 
@@ -146,7 +223,8 @@ class Resource(object):
             A dictionary containing the payload returned by the HTTP command.
         """
         @wraps(fetch)
-        def _contruct_dict_from_http_response(self, href, query_dict = dict()):
+        def _contruct_dict_from_http_response(self, href, query_dict = dict(),
+                **kwargs):
             """Construct a dictionary from the HTTP response.
 
             Args:
@@ -156,9 +234,43 @@ class Resource(object):
             Returns:
                 A dictionary defining the response to the HTTP command.
             """
-            return fetch(self, href, query_dict).json()
+            return self._decoder(fetch(self, href, query_dict, **kwargs).content)
         return _contruct_dict_from_http_response
 
+    def persist(fetch):
+        """Decorator reusing responses held in the response store.
+
+        Args:
+            fetch: a function object defining an HTTP command.
+
+        Returns:
+            A function object returning a stored response, if one is fresh,
+            or the response to the HTTP command otherwise.
+        """
+        @wraps(fetch)
+        def _persist(self, href, query_dict = dict(), **kwargs):
+            """Obtain the response from the store or the HTTP command.
+
+            Args:
+                href: A hypertext reference used by the HTTP command.
+                query_dict: A dictionary containing HTTP command parameters.
+
+            Returns:
+                A dictionary defining the response to the HTTP command.
+            """
+            if None == self._store:
+                return fetch(self, href, query_dict, **kwargs)
+            identity = store.identity(self._session)
+            validators = kwargs.get('validators')
+            response = self._store.get(self._name, href, query_dict, identity,
+                    validators)
+            if None == response:
+                response = fetch(self, href, query_dict, **kwargs)
+                self._store.put(self._name, href, query_dict, response,
+                        identity, validators)
+            return response
+        return _persist
+
     def validate_http_content_type(fetch):
         """Decorator validating the response's HTTP content type.
 
@@ -169,7 +281,8 @@ class Resource(object):
             A function object for checking the HTTP Content-Type.
         """
         @wraps(fetch)
-        def _validate_http_content_type(self, href, query_dict = dict()):
+        def _validate_http_content_type(self, href, query_dict = dict(),
+                **kwargs):
             """Validate the HTTP content type.
 
             Args:
@@ -179,22 +292,97 @@ class Resource(object):
             Returns:
                 A dictionary defining the response to the HTTP command.
 
+            Resources without an expected content type (e.g., those named by
+            URI templates not listed in content_type) are not validated.
+
             Raises:
                 BadContentType: The expected and returned HTTP content
                 type do not match.
+                NotModified: The response to a conditional request is 304
+                Not Modified.
             """
-            response =  fetch(self, href, query_dict)
+            response =  fetch(self, href, query_dict, **kwargs)
+            if 304 == response.status_code:
+                raise NotModified(href)
             response.raise_for_status()
-            if content_type[self._name] != response.headers['Content-Type']:
+            expected = content_type.get(self._name)
+            if None != expected and expected != response.headers['Content-Type']:
                 raise BadContentType(href, response.headers['Content-Type'],
-                        content_type[self._name], self._name)
+                        expected, self._name)
             return response
         return _validate_http_content_type
 
+    def retry(fetch):
+        """Decorator retrying transient failures.
+
+        Args:
+            fetch: a function object defining an idempotent HTTP command.
+
+        Returns:
+            A function object executing the HTTP command using the retry
+            policy.
+        """
+        @wraps(fetch)
+        def _retry(self, href, query_dict = dict(), **kwargs):
+            """Execute the HTTP command until it succeeds or the policy gives up.
+
+            Args:
+                href: A hypertext reference used by the HTTP command.
+                query_dict: A dictionary containing HTTP command parameters.
+
+            Returns:
+                The HTTP response to the last attempt.
+            """
+            if None == self._retry:
+                return fetch(self, href, query_dict, **kwargs)
+            return self._retry(lambda: fetch(self, href, query_dict, **kwargs))
+        return _retry
+
+    def revalidate(fetch):
+        """Decorator revalidating cached composites.
+
+        Args:
+            fetch: a function object defining an HTTP command.
+
+        Returns:
+            A function object returning the cached composite whenever Review
+            Board indicates it remains valid.
+        """
+        @wraps(fetch)
+        def _revalidate(self, href, query_dict = dict(), **kwargs):
+            """Obtain the composite using a conditional request.
+
+            Args:
+                href: A hypertext reference used by the HTTP command.
+                query_dict: A dictionary containing HTTP command parameters.
+
+            Returns:
+                A composite object containing the whole-part hierarchy.
+            """
+            cache = self._revalidation
+            if None == cache:
+                return fetch(self, href, query_dict, **kwargs)
+            key = cache.key((self._name, self._lazy, self._raw), href,
+                    query_dict)
+            entry = cache.lookup(key)
+            validators = dict()
+            try:
+                response = fetch(self, href, query_dict,
+                        headers = cache.headers(entry), validators = validators,
+                        **kwargs)
+            except NotModified:
+                if None == entry:
+                    raise
+                return cache.revalidated(entry)
+            cache.store(key, validators, response)
+            return response
+        return _revalidate
+
     @stat.is_valid
     @composite
     @contruct_dict_from_http_response
     @validate_http_content_type
+    @retry
     def delete(self, href, query_dict = dict()):
         """Execute HTTP DELETE command using session parameters.
 
@@ -208,20 +396,32 @@ class Resource(object):
         return self._session.delete(href, data = query_dict)
 
     @stat.is_valid
+    @revalidate
     @composite
+    @persist
     @contruct_dict_from_http_response
     @validate_http_content_type
-    def get(self, href, query_dict = dict()):
+    @retry
+    def get(self, href, query_dict = dict(), headers = None, validators = None):
         """Execute HTTP GET command using session parameters.
 
         Args:
             href: A hypertext reference used by the HTTP command.
             query_dict: A dictionary containing HTTP command parameters.
+            headers: A dictionary containing additional HTTP headers.
+            validators: A dictionary receiving the validators (e.g., ETag)
+                returned with the response.
 
         Returns:
             The HTTP response to the HTTP command.
         """
-        return self._session.get(href, params = query_dict)
+        response = self._session.get(href, params = query_dict,
+                headers = headers)
+        if None != validators:
+            for x in conditional_headers:
+                if x in response.headers:
+                    validators[x] = response.headers[x]
+        return response
 
     @stat.is_valid
     @composite
@@ -243,6 +443,7 @@ class Resource(object):
     @composite
     @contruct_dict_from_http_response
     @validate_http_content_type
+    @retry
     def put(self, href, query_dict = dict()):
         """Execute HTTP PUT command using session parameters.
 
@@ -255,6 +456,28 @@ class Resource(object):
         """
         return self._session.put(href, data = query_dict)
 
+    @stat.is_valid
+    @composite
+    @contruct_dict_from_http_response
+    @validate_http_content_type
+    def process(self, href, response):
+        """Process an HTTP response obtained without using the session.
+
+        Applies the same checks and conversions as the HTTP commands. This
+        permits other HTTP clients (e.g., an event-driven client) to obtain the
+        response and reuse the library to interpret it.
+
+        Args:
+            href: the hypertext reference used to obtain the response.
+            response: an object providing the interface of a requests
+                Response (i.e., status_code, headers, content and
+                raise_for_status()).
+
+        Returns:
+            The HTTP response.
+        """
+        return response
+
     def list_component(self, name, response):
         """Construct a list component from the response.
 
@@ -282,7 +505,7 @@ class Resource(object):
         Returns:
             A string with the required substitutions.
         """
-        return s.replace("-", "_")
+        return registry.replace(s)
 
     def component(self, name, response, extra_args = dict()):
         """Build the whole-part hierarchy making up the composite object.
@@ -300,21 +523,53 @@ class Resource(object):
             A named tuple comprising the whole-part hierarchy contained with the
             response along with any extra arguments.
         """
-        field_names = ' '.join(list(extra_args) + list(response))
+        tuple_descriptor, field_map = self.registry.lookup(name,
+                tuple(extra_args) + tuple(response))
         args = dict(extra_args)
-        for x in response:
-            y = self.replace(x)
-            if type(response[x]) is DictType or type(response[x]) is DictionaryType:
-                args[y] = self.component(x, response[x])
-            elif type(response[x]) is ListType:
-                args[y] = self.list_component(x, response[x])
+        for x, value in response.iteritems():
+            y = field_map[x]
+            if type(value) is DictType or type(value) is DictionaryType:
+                args[y] = self.component(x, value)
+            elif type(value) is ListType:
+                args[y] = self.list_component(x, value)
             else:
-                args[y] = response[x]
-        tuple_descriptor = collections.namedtuple(self.replace(name),
-                self.replace(field_names))
+                args[y] = value
         return tuple_descriptor(**args)
 
 
+# Links referring to another page of the same resource.
+pagination_links = [ 'self', 'next', 'prev' ]
+
+
+def projection(query_dict, only_fields = None, only_links = None,
+        expand = None):
+    """Add the query parameters selecting the parts of a response.
+
+    Review Board omits the fields and links not selected, and includes each
+    expanded link's resource in place of the link. Smaller responses are
+    quicker to transfer and decode, and their components use correspondingly
+    smaller types. Expanding links (e.g., submitter and repository) avoids
+    requesting each linked resource separately.
+
+    Args:
+        query_dict: a dictionary containing HTTP command parameters.
+        only_fields: a list of the fields to include or None to include every
+            field.
+        only_links: a list of the links to include or None to include every
+            link. An empty list omits every link.
+        expand: a list of the links to expand or None.
+
+    Returns:
+        A dictionary containing the HTTP command parameters.
+    """
+    query_dict = dict(query_dict or dict())
+    for name, value in [ ('only-fields', only_fields),
+            ('only-links', only_links), ('expand', expand) ]:
+        if None != value:
+            query_dict[name] = ','.join(value)
+    return query_dict
+
+
 class ResourceFactory(Resource):
     """Resource specialization by URL and HTTP command.
 
@@ -327,13 +582,16 @@ class ResourceFactory(Resource):
         name: Resource name.
         url: Resource URL.
         method: the HTTP method requred by the resource.
+        kwargs: resource options (see Resource).
     """
-    def __init__(self, session, name, url, method):
+    def __init__(self, session, name, url, method, **kwargs):
         """Construct the resource.
 
         Use the method to define a closure on the URL for the HTTP command.
         """
-        super(ResourceFactory, self).__init__(session, name)
+        super(ResourceFactory, self).__init__(session, name, **kwargs)
+        self._url = url
+        self._method = method
         if 'GET' == method:
             self._fetch = lambda query_dict = dict(): self.get(url, query_dict)
         elif 'POST' == method:
@@ -341,7 +599,16 @@ class ResourceFactory(Resource):
         else:
             assert 0, "unknown HTTP {0} command needed by {1} resource".format(method, name)
 
-    def __call__(self, query_dict = dict()):
+    @property
+    def url(self):
+        return self._url
+
+    @property
+    def method(self):
+        return self._method
+
+    def __call__(self, query_dict = dict(), raw = None, only_fields = None,
+            only_links = None, expand = None):
         """Use the getter to populate the resource.
 
         The parent resource includes the entire Review Board response and an
@@ -355,24 +622,177 @@ class ResourceFactory(Resource):
 
         Args:
             query_dict: the payload provided to the HTTP command.
+            raw: True to obtain a RawResource, False to obtain the whole-part
+                hierarchy or None to use the resource option. Linked
+                resources are obtained the same way.
+            only_fields: the fields to include (see projection).
+            only_links: the links to include (see projection).
+            expand: the links to expand (see projection).
+
+        Returns:
+            A named tuple comprising the whole-part hierarchy containing the
+            HTTP command response and ResourceFactory objects for each child
+            resource.
+        """
+        query_dict = projection(query_dict, only_fields, only_links, expand)
+        if None != raw and raw != self._raw:
+            return ResourceFactory(self._session, self._name, self._url,
+                    self._method, **dict(self.options(), raw = raw))(query_dict)
+        return self.amalgamate(self._fetch(query_dict))
+
+    def amalgamate(self, response):
+        """Combine the composite with a ResourceFactory for each link.
+
+        Args:
+            response: the composite obtained by this resource.
 
         Returns:
             A named tuple comprising the whole-part hierarchy containing the
             HTTP command response and ResourceFactory objects for each child
             resource.
         """
-        response = self._fetch(query_dict)
         args = dict()
-        if None != getattr(response, 'links', None):
-            for links in response.links:
-                link_name = type(links).__name__
-                if 'self' == link_name:
-                    args[link_name] = ResourceFactory(self._session, self.name,
-                        links.href, links.method)
-                else:
-                    args[link_name] = ResourceFactory(self._session, link_name,
-                        links.href, links.method)
+        for name, links in response.json.get('links', dict()).iteritems():
+            link_name = self.replace(name)
+            if link_name in pagination_links:
+                args[link_name] = self.link(self.name, links['href'],
+                    links['method'])
+            else:
+                args[link_name] = self.link(link_name, links['href'],
+                    links['method'])
+        if self._raw or self._lazy:
+            return response.extend(args)
         resource_tuple = self.component(self._name, args)
-        tuple_descriptor = collections.namedtuple(self._name,
-            resource_tuple._fields + response._fields)
-        return tuple_descriptor(*(resource_tuple + response))
+        fields = resource_tuple._fields + response._fields
+        tuple_descriptor, field_map = self.registry.lookup(self._name, fields)
+        return tuple_descriptor(**dict(zip(fields, resource_tuple + response)))
+
+    def iter_pages(self, query_dict = dict(), jobs = 1, only_fields = None,
+            only_links = None, expand = None):
+        """Iterate over the pages of a list resource.
+
+        The first page is obtained using the query dictionary. Subsequent pages
+        are obtained by following the next link on each page. Review Board
+        retains the query parameters (e.g., max-results) in the next link.
+        A page is not requested until the previous page has been consumed.
+
+        With more than one job, the start offset of every page is computed from
+        the total_results reported by the first page. The remaining pages are
+        requested concurrently, with at most jobs requests outstanding, and
+        yielded in order.
+
+        Args:
+            query_dict: the payload provided to the HTTP command.
+            jobs: the maximum number of pages requested concurrently.
+            only_fields: the fields to include (see projection).
+            only_links: the links to include (see projection).
+            expand: the links to expand (see projection).
+
+        Returns:
+            A generator yielding each page of the list resource.
+        """
+        query_dict = projection(query_dict, only_fields, only_links, expand)
+        page = self(query_dict)
+        if 1 < jobs:
+            for page in self._iter_pages_concurrently(page, query_dict, jobs):
+                yield page
+            return
+        while True:
+            yield page
+            links = page.json.get('links', dict())
+            if 'next' not in links:
+                return
+            page = self.link(self.name, links['next']['href'], 'GET')()
+
+    def _iter_pages_concurrently(self, page, query_dict, jobs):
+        """Iterate over the pages of a list resource concurrently.
+
+        Args:
+            page: the first page of the list resource.
+            query_dict: the payload provided to the HTTP command.
+            jobs: the maximum number of pages requested concurrently.
+
+        Returns:
+            A generator yielding each page of the list resource.
+        """
+        yield page
+        if 'next' not in page.json.get('links', dict()):
+            return
+        # Review Board caps the page size, so use the size of the first page,
+        # which is full whenever there is a next page.
+        start = int(query_dict.get('start', 0))
+        max_results = len(page.json[self.name])
+        total_results = page.json['total_results']
+        offsets = range(start + max_results, total_results, max_results)
+        fetch = lambda offset: self(dict(query_dict, start = offset,
+            **{ 'max-results': max_results }))
+        for page in pool.ordered(fetch, offsets, jobs):
+            yield page
+
+    def iter_items(self, query_dict = dict(), jobs = 1, only_fields = None,
+            only_links = None, expand = None):
+        """Iterate over the items in a list resource.
+
+        Items are obtained from the list named after the resource (e.g.,
+        review_requests). Only one page of the list resource is held at any
+        time, plus at most jobs pages requested concurrently.
+
+        Args:
+            query_dict: the payload provided to the HTTP command (e.g.,
+                max-results and start).
+            jobs: the maximum number of pages requested concurrently.
+            only_fields: the fields to include (see projection).
+            only_links: the links to include (see projection).
+            expand: the links to expand (see projection).
+
+        Returns:
+            A generator yielding each item in the list resource.
+        """
+        for page in self.iter_pages(query_dict, jobs, only_fields, only_links,
+                expand):
+            for item in getattr(page, self.replace(self.name)):
+                yield item
+
+    def link(self, name, url, method):
+        """Construct a linked resource.
+
+        The linked resource shares the HTTP session and options of this
+        resource.
+
+        Args:
+            name: Resource name.
+            url: Resource URL.
+            method: the HTTP method requred by the resource.
+
+        Returns:
+            A ResourceFactory for the linked resource.
+        """
+        return ResourceFactory(self._session, name, url, method,
+                **self.options())
+
+
+def fetch_all(factories, jobs = None):
+    """Fetch several resources concurrently.
+
+    Every fetch is attempted. A failure is reported by returning the exception
+    raised in place of the resource, so callers should check each result
+    (e.g., isinstance(result, Exception)).
+
+    The requests run on the thread pool shared by the library. At most as many
+    requests are outstanding as the smallest connection pool of the sessions
+    used holds, so no connection is opened only to be discarded.
+
+    Args:
+        factories: the ResourceFactory objects to call (e.g., links of the
+            Root List Resource).
+        jobs: the maximum number of concurrent requests; all of them, up to
+            the connection pool size, when None.
+
+    Returns:
+        A list containing the response of each factory in the order given.
+    """
+    factories = list(factories)
+    limit = min([ connection.pool_size(x._session, x._url) for x in factories ]
+            or [ 1 ])
+    jobs = max(1, min(jobs or len(factories), limit))
+    return pool.gather(factories, jobs, pool.shared(jobs))
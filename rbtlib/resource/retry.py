@@ -0,0 +1,189 @@
+#-------------------------------------------------------------------------------
+# rbtlib: retry.py
+#
+# Retry transient failures with backoff, subject to a retry budget.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+from email.utils import mktime_tz, parsedate_tz
+import random
+import threading
+import time
+
+
+# HTTP status codes indicating the server may succeed if asked again.
+retryable = [ 429, 500, 502, 503, 504 ]
+
+
+class RetryBudget(object):
+    """Limit retries to a fraction of the requests made.
+
+    Each request deposits a fraction of a retry into the budget and each retry
+    withdraws a whole one. A server failing every request therefore receives at
+    most ratio retries per request once the initial allowance is spent, instead
+    of one retry per attempt.
+
+    The budget is safe to share between threads.
+
+    Attributes:
+        ratio: the retries permitted for each request.
+        minimum: the retries permitted before any request is made.
+        capacity: the maximum number of retries saved.
+    """
+
+    def __init__(self, ratio = 0.2, minimum = 10, capacity = 100):
+        super(RetryBudget, self).__init__()
+        self._ratio = ratio
+        self._capacity = capacity
+        self._balance = float(minimum)
+        self._lock = threading.Lock()
+
+    @property
+    def balance(self):
+        return self._balance
+
+    def deposit(self):
+        """Account for a request."""
+        with self._lock:
+            self._balance = min(self._capacity, self._balance + self._ratio)
+
+    def withdraw(self):
+        """Account for a retry.
+
+        Returns:
+            True if the retry is permitted; False otherwise.
+        """
+        with self._lock:
+            if self._balance < 1:
+                return False
+            self._balance -= 1
+            return True
+
+
+def retry_after(response):
+    """Obtain the delay requested by the server.
+
+    Args:
+        response: the HTTP response.
+
+    Returns:
+        The delay in seconds or None if the server did not request one.
+    """
+    value = response.headers.get('Retry-After')
+    if None == value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    date = parsedate_tz(value)
+    if None == date:
+        return None
+    return max(0.0, mktime_tz(date) - time.time())
+
+
+class Retry(object):
+    """Retry policy for idempotent HTTP commands.
+
+    Responses whose status is retryable are requested again after a delay
+    drawn uniformly between zero and an exponentially increasing bound (i.e.,
+    full jitter), so clients failing together do not retry together. A delay
+    requested using Retry-After is honoured, unless it exceeds the maximum
+    delay, in which case the response is returned.
+
+    The policy is safe to share between threads.
+
+    Attributes:
+        attempts: the maximum number of attempts, including the first.
+        base: the bound on the delay before the first retry, in seconds.
+        cap: the maximum delay, in seconds.
+        budget: a RetryBudget shared by every command using the policy.
+        retries: the number of retries made.
+        delay: the total delay added by retries, in seconds.
+        exhausted: the number of retries refused by the budget.
+    """
+
+    def __init__(self, attempts = 4, base = 0.5, cap = 30.0, budget = None,
+            sleep = time.sleep):
+        super(Retry, self).__init__()
+        self._attempts = attempts
+        self._base = base
+        self._cap = cap
+        self._budget = budget if None != budget else RetryBudget()
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self.retries = 0
+        self.delay = 0.0
+        self.exhausted = 0
+
+    @property
+    def budget(self):
+        return self._budget
+
+    def backoff(self, attempt, response):
+        """Compute the delay before the next attempt.
+
+        Args:
+            attempt: the number of attempts made.
+            response: the HTTP response to the last attempt.
+
+        Returns:
+            The delay in seconds or None if the command should not be retried.
+        """
+        delay = retry_after(response)
+        if None == delay:
+            return random.uniform(0, min(self._cap,
+                self._base * 2 ** (attempt - 1)))
+        return delay if delay <= self._cap else None
+
+    def __call__(self, send):
+        """Execute an HTTP command, retrying transient failures.
+
+        Args:
+            send: a function object executing the HTTP command.
+
+        Returns:
+            The HTTP response to the last attempt.
+        """
+        self._budget.deposit()
+        attempt = 1
+        while True:
+            response = send()
+            if response.status_code not in retryable \
+                    or attempt >= self._attempts:
+                return response
+            delay = self.backoff(attempt, response)
+            if None == delay:
+                return response
+            if not self._budget.withdraw():
+                with self._lock:
+                    self.exhausted += 1
+                return response
+            with self._lock:
+                self.retries += 1
+                self.delay += delay
+            self._sleep(delay)
+            attempt += 1
+
+
+# Policy shared by resources that do not specify one.
+policy = Retry()
@@ -0,0 +1,152 @@
+#-------------------------------------------------------------------------------
+# rbtlib: revalidation.py
+#
+# Revalidate cached composites using HTTP conditional requests.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+import collections
+import threading
+
+
+# A composite and the validators returned with it.
+Entry = collections.namedtuple('Entry', 'validators composite')
+
+
+# Validators returned by Review Board and the conditional request headers
+# echoing them.
+conditional_headers = {
+        'ETag': 'If-None-Match',
+        'Last-Modified': 'If-Modified-Since',
+}
+
+
+class RevalidationCache(object):
+    """Bounded cache of composites obtained using HTTP GET.
+
+    Each composite is stored together with the validators (ETag and
+    Last-Modified) returned with it. Subsequent requests for the same resource
+    send the validators in conditional request headers. A 304 Not Modified
+    response lets the cached composite be returned without transferring or
+    decoding the response again.
+
+    The cache is safe to share between threads. Once full, the least recently
+    used composite is discarded.
+
+    Attributes:
+        maxsize: the maximum number of composites retained.
+        hits: the number of responses revalidated by the server.
+        misses: the number of responses transferred in full.
+    """
+
+    def __init__(self, maxsize = 256):
+        super(RevalidationCache, self).__init__()
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self):
+        return self._maxsize
+
+    def __len__(self):
+        return len(self._entries)
+
+    def key(self, name, href, query_dict):
+        """Construct the key identifying a response.
+
+        Args:
+            name: the resource name, or any value identifying the resource and
+                the options used to build its composite.
+            href: the hypertext reference used by the HTTP command.
+            query_dict: a dictionary containing HTTP command parameters.
+
+        Returns:
+            A hashable key.
+        """
+        return (name, href, tuple(sorted((x, unicode(y)) for x, y in
+            (query_dict or dict()).iteritems())))
+
+    def lookup(self, key):
+        """Obtain the cached composite.
+
+        Args:
+            key: the key identifying the response.
+
+        Returns:
+            The entry containing the composite and its validators or None.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._entries[key] = entry
+            return entry
+
+    def headers(self, entry):
+        """Construct the conditional request headers for a cached composite.
+
+        Args:
+            entry: the entry containing the composite and its validators or
+                None.
+
+        Returns:
+            A dictionary containing the HTTP headers.
+        """
+        if entry is None:
+            return dict()
+        return dict((conditional_headers[x], y) for x, y in
+                entry.validators.iteritems())
+
+    def revalidated(self, entry):
+        """Account for a response revalidated by the server.
+
+        Args:
+            entry: the entry containing the composite and its validators.
+
+        Returns:
+            The cached composite.
+        """
+        with self._lock:
+            self.hits += 1
+        return entry.composite
+
+    def store(self, key, validators, composite):
+        """Cache a composite.
+
+        Composites without validators are not cached.
+
+        Args:
+            key: the key identifying the response.
+            validators: a dictionary containing the validators returned with
+                the response.
+            composite: the composite built from the response.
+        """
+        with self._lock:
+            self.misses += 1
+            self._entries.pop(key, None)
+            if 0 == len(validators) or self._maxsize <= 0:
+                return
+            if self._maxsize <= len(self._entries):
+                self._entries.popitem(last = False)
+            self._entries[key] = Entry(dict(validators), composite)
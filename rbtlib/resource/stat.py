@@ -37,7 +37,7 @@ def is_valid(fetch):
         A function object capable of ensuring the response is valid.
     """
     @wraps(fetch)
-    def _is_valid(self, url, query_dict = None):
+    def _is_valid(self, url, query_dict = None, **kwargs):
         """Check the stat returned by Review Board.
 
         Args:
@@ -47,7 +47,7 @@ def is_valid(fetch):
         Returns:
             The Review Board response.
         """
-        response = fetch(self, url, query_dict)
+        response = fetch(self, url, query_dict, **kwargs)
         assert 'ok' == response.stat or 'fail' == response.stat
         return response
     return _is_valid
@@ -0,0 +1,225 @@
+#-------------------------------------------------------------------------------
+# rbtlib: store.py
+#
+# Persistent cache for responses obtained using HTTP GET.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import urllib
+
+
+# Seconds a response remains fresh, by resource name. The Root List Resource
+# includes the server capabilities.
+ttl = {
+        'info': 24 * 60 * 60,
+        'root': 24 * 60 * 60,
+}
+
+
+# Seconds a response remains fresh for resources not listed in ttl.
+default_ttl = 60
+
+
+# Version of the schema. Stores using another version are emptied.
+schema_version = 2
+
+
+schema = [
+    '''CREATE TABLE IF NOT EXISTS responses (
+        key TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        body TEXT NOT NULL,
+        validators TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        expires REAL NOT NULL,
+        accessed REAL NOT NULL)''',
+    'CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)',
+]
+
+
+def identity(session):
+    """Identify the credentials carried by an HTTP session.
+
+    Responses depend upon the access rights of the user, so responses obtained
+    using different credentials are stored separately.
+
+    Args:
+        session: the HTTP session.
+
+    Returns:
+        A digest of the API token and session cookie, or None if the session
+        carries neither.
+    """
+    cookies = getattr(session, 'cookies', None) or dict()
+    credentials = (getattr(session, 'headers', dict()).get('Authorization'),
+            cookies.get('rbsessionid'))
+    if (None, None) == credentials:
+        return None
+    return hashlib.sha256(repr(credentials)).hexdigest()
+
+
+class ResponseStore(object):
+    """Size-bounded SQLite cache of decoded responses.
+
+    Responses are keyed by URL, the normalized query dictionary and the
+    identity of the credentials used to obtain them, and expire after a
+    time-to-live chosen by resource name. The validators returned with each
+    response (e.g., ETag) are stored with it. Once the stored responses
+    exceed the size limit, the least recently used responses are discarded.
+
+    Many processes may share one store. SQLite serializes writers and each
+    connection waits for locks held by other processes.
+
+    Attributes:
+        path: the database file name.
+        max_bytes: the maximum size of the stored responses.
+        ttl: a dictionary mapping resource names to time-to-live in seconds.
+        default_ttl: the time-to-live for resources not found in ttl.
+    """
+
+    def __init__(self, path, max_bytes = 64 * 1024 * 1024, ttl = ttl,
+            default_ttl = default_ttl):
+        super(ResponseStore, self).__init__()
+        self._path = os.path.expanduser(path)
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._default_ttl = default_ttl
+        self._local = threading.local()
+        with self._connection() as connection:
+            version, = connection.execute('PRAGMA user_version').fetchone()
+            if schema_version != version:
+                connection.execute('DROP TABLE IF EXISTS responses')
+                connection.execute('PRAGMA user_version = {0}'.format(
+                    schema_version))
+            for statement in schema:
+                connection.execute(statement)
+
+    @property
+    def path(self):
+        return self._path
+
+    def _connection(self):
+        """Obtain the database connection used by this thread."""
+        connection = getattr(self._local, 'connection', None)
+        if None == connection:
+            connection = sqlite3.connect(self._path, timeout = 30)
+            connection.execute('PRAGMA journal_mode=WAL')
+            self._local.connection = connection
+        return connection
+
+    def key(self, href, query_dict, identity = None):
+        """Construct the key identifying a response.
+
+        Args:
+            href: the hypertext reference used by the HTTP command.
+            query_dict: a dictionary containing HTTP command parameters.
+            identity: the identity of the credentials (see identity) or None.
+
+        Returns:
+            The URL including the query parameters in sorted order, preceded
+            by the identity, if any.
+        """
+        query = sorted((x, unicode(y).encode('utf-8')) for x, y in
+                (query_dict or dict()).iteritems())
+        url = href + ('?' + urllib.urlencode(query) if query else '')
+        return url if None == identity else identity + ' ' + url
+
+    def get(self, name, href, query_dict, identity = None, validators = None):
+        """Obtain a stored response.
+
+        Args:
+            name: the resource name.
+            href: the hypertext reference used by the HTTP command.
+            query_dict: a dictionary containing HTTP command parameters.
+            identity: the identity of the credentials (see identity) or None.
+            validators: a dictionary receiving the validators stored with the
+                response or None.
+
+        Returns:
+            The decoded response or None if no fresh response is stored.
+        """
+        now = time.time()
+        key = self.key(href, query_dict, identity)
+        with self._connection() as connection:
+            row = connection.execute('SELECT body, validators FROM responses '
+                    'WHERE key = ? AND expires > ?', (key, now)).fetchone()
+            if None == row:
+                return None
+            connection.execute('UPDATE responses SET accessed = ? '
+                    'WHERE key = ?', (now, key))
+        if None != validators:
+            validators.update(json.loads(row[1]))
+        return json.loads(row[0])
+
+    def put(self, name, href, query_dict, response, identity = None,
+            validators = None):
+        """Store a response.
+
+        Args:
+            name: the resource name.
+            href: the hypertext reference used by the HTTP command.
+            query_dict: a dictionary containing HTTP command parameters.
+            response: the decoded response.
+            identity: the identity of the credentials (see identity) or None.
+            validators: a dictionary containing the validators returned with
+                the response or None.
+        """
+        now = time.time()
+        body = json.dumps(response, separators = (',', ':'))
+        expires = now + self._ttl.get(name, self._default_ttl)
+        with self._connection() as connection:
+            connection.execute('INSERT OR REPLACE INTO responses '
+                    '(key, name, body, validators, size, expires, accessed) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)', (self.key(href, query_dict,
+                        identity), name, body, json.dumps(validators or dict()),
+                        len(body), expires, now))
+            self._evict(connection, now)
+
+    def _evict(self, connection, now):
+        """Discard expired and least recently used responses.
+
+        Args:
+            connection: the database connection.
+            now: the current time.
+        """
+        connection.execute('DELETE FROM responses WHERE expires <= ?', (now,))
+        size, = connection.execute('SELECT TOTAL(size) FROM responses').fetchone()
+        rows = connection.execute('SELECT key, size FROM responses '
+                'ORDER BY accessed')
+        discard = list()
+        for key, row_size in rows:
+            if size <= self._max_bytes:
+                break
+            discard.append((key,))
+            size -= row_size
+        connection.executemany('DELETE FROM responses WHERE key = ?', discard)
+
+    def clear(self):
+        """Discard all stored responses."""
+        with self._connection() as connection:
+            connection.execute('DELETE FROM responses')
@@ -0,0 +1,85 @@
+#-------------------------------------------------------------------------------
+# rbtlib: test_connection.py
+#
+# Tests for connection.py.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+import connection
+from requests.adapters import HTTPAdapter
+from resource import Resource
+import socket
+
+
+def test_session_pool_size():
+    """Sessions keep the requested number of connections for each host."""
+    session = connection.session(pool_maxsize = 32)
+    adapter = session.get_adapter('https://reviews.example.com')
+    pool = adapter.poolmanager.connection_from_url('https://reviews.example.com')
+    assert 32 == pool.pool.maxsize
+
+
+def test_pool_size():
+    """The connection pool size of a session is found for a host."""
+    session = connection.session(pool_maxsize = 32)
+    assert 32 == connection.pool_size(session, 'https://reviews.example.com')
+    assert 10 == connection.pool_size(object(), 'https://reviews.example.com')
+
+
+def test_session_socket_options():
+    """Connections disable Nagle's algorithm and enable keep-alive probes."""
+    adapter = connection.session().get_adapter('http://reviews.example.com')
+    options = adapter.poolmanager.connection_pool_kw['socket_options']
+    assert (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1) in options
+    assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in options
+    adapter = connection.Adapter(nodelay = False, keep_alive = False)
+    assert [] == adapter.poolmanager.connection_pool_kw['socket_options']
+
+
+def test_default_timeout(monkeypatch):
+    """Requests without a timeout use the default timeout."""
+    timeouts = list()
+    def send(self, request, **kwargs):
+        timeouts.append(kwargs['timeout'])
+    monkeypatch.setattr(HTTPAdapter, 'send', send)
+    adapter = connection.Adapter(timeout = 5)
+    adapter.send(None)
+    adapter.send(None, timeout = 1)
+    assert [ 5, 1 ] == timeouts
+
+
+def test_statistics():
+    """Statistics count connections opened and reused."""
+    session = connection.session()
+    assert connection.Statistics(0, 0, 0) == connection.statistics(session)
+    adapter = session.get_adapter('https://reviews.example.com')
+    pool = adapter.poolmanager.connection_from_url('https://reviews.example.com')
+    pool.num_connections = 2
+    pool.num_requests = 5
+    assert connection.Statistics(2, 5, 3) == connection.statistics(session)
+
+
+def test_resource_creates_session():
+    """Resources without a session use one sized for concurrent use."""
+    resource = Resource(None, 'root')
+    assert isinstance(resource._session.get_adapter('https://reviews.example.com'),
+            connection.Adapter)
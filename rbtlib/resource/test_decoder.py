@@ -0,0 +1,65 @@
+#-------------------------------------------------------------------------------
+# rbtlib: test_decoder.py
+#
+# Tests for decoder.py.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+import decoder
+import json
+import pytest
+from resource import Resource
+
+
+@pytest.mark.parametrize('encoding', [ 'utf-8', 'utf-8-sig', 'utf-16-le',
+    'utf-16-be', 'utf-32-le', 'utf-32-be' ])
+def test_loads_detects_encoding(encoding):
+    """Content is decoded in each encoding permitted for JSON."""
+    content = u'{"summary": "caf\u00e9"}'.encode(encoding)
+    assert { u'summary': u'caf\xe9' } == decoder.loads(content)
+
+
+def test_loads_uses_parser():
+    """Content is passed to the parser without decoding it first."""
+    contents = list()
+    def parse(content):
+        contents.append(content)
+        return json.loads(content)
+    decoder.loads('{"stat": "ok"}', parse)
+    assert [ '{"stat": "ok"}' ] == contents
+
+
+def test_fastest_falls_back_to_json():
+    """The json module is used when no faster parser is installed."""
+    assert json.loads == decoder.fastest(( 'no_such_json_parser', ))
+
+
+def test_resource_decoder(recorded_session):
+    """Resources decode responses using their decoder."""
+    contents = list()
+    def decode(content):
+        contents.append(content)
+        return decoder.loads(content)
+    href = 'https://reviews.example.com/api/'
+    root = Resource(recorded_session, 'root', decoder = decode).get(href)
+    assert 'ok' == root.stat
+    assert [ recorded_session.get(href).content ] == contents
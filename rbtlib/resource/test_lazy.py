@@ -0,0 +1,76 @@
+#-------------------------------------------------------------------------------
+# rbtlib: test_lazy.py
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+import pytest
+from conftest import recorded_url
+from lazy import LazyComponent
+from resource import Resource, ResourceFactory
+
+
+response = {
+    'stat': 'ok',
+    'total_results': 2,
+    'links': { 'self': { 'href': '/', 'method': 'GET' } },
+    'review_requests': [ { 'id': 1, 'max-results': 2 }, { 'id': 2, 'max-results': 2 } ],
+}
+
+
+@pytest.fixture
+def lazy():
+    """Construct a lazy component."""
+    return LazyComponent('review_requests', response, { 'json': response })
+
+
+def test_lazy_attributes(lazy):
+    """Lazy components provide the same attributes as named tuples."""
+    eager = Resource(None, 'review_requests').component('review_requests',
+            response, { 'json': response })
+    assert sorted(eager._fields) == sorted(lazy._fields)
+    assert eager.stat == lazy.stat and eager.json is lazy.json
+    assert eager.links.self.href == lazy.links.self.href
+    assert [ x.id for x in eager.review_requests ] == [ x.id for x in lazy.review_requests ]
+    assert 2 == lazy.review_requests[-1].max_results
+
+
+def test_lazy_parts_are_built_once(lazy):
+    """Parts are built on first access and cached."""
+    assert 0 == len(lazy._parts)
+    assert lazy.review_requests[0] is lazy.review_requests[0]
+    assert [ 'review_requests' ] == list(lazy._parts)
+
+
+def test_lazy_attribute_error(lazy):
+    """Accessing a non-existent part raises an error."""
+    with pytest.raises(AttributeError):
+        lazy.foo
+
+
+def test_lazy_resource_factory(recorded_session):
+    """Lazy resources provide links to linked resources."""
+    root = ResourceFactory(recorded_session, 'root', recorded_url + '/api/',
+            'GET', lazy = True)()
+    assert 'ok' == root.stat and 'ok' == root.json['stat']
+    assert isinstance(root.review_requests, ResourceFactory)
+    assert root.review_requests.lazy
+    assert 'root' == root.self.name
@@ -0,0 +1,90 @@
+#-------------------------------------------------------------------------------
+# rbtlib: test_pool.py
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+import pool
+import pytest
+import threading
+import time
+
+
+def test_ordered_preserves_order():
+    """Results are yielded in the order of the arguments."""
+    def function(x):
+        time.sleep(0.01 * (5 - x))
+        return x
+    assert range(5) == list(pool.ordered(function, range(5), 5))
+
+
+def test_ordered_is_bounded():
+    """No more than the requested number of calls are outstanding."""
+    lock = threading.Lock()
+    state = dict(running = 0, highest = 0)
+    def function(x):
+        with lock:
+            state['running'] += 1
+            state['highest'] = max(state['highest'], state['running'])
+        time.sleep(0.01)
+        with lock:
+            state['running'] -= 1
+        return x
+    assert range(20) == list(pool.ordered(function, range(20), 3))
+    assert 3 >= state['highest']
+
+
+def test_ordered_raises():
+    """Exceptions are raised when their result is reached."""
+    def function(x):
+        if 2 == x:
+            raise ValueError(x)
+        return x
+    results = pool.ordered(function, range(5), 2)
+    assert [ 0, 1 ] == [ next(results), next(results) ]
+    with pytest.raises(ValueError):
+        next(results)
+
+
+def test_gather_collects_exceptions():
+    """Exceptions are returned in place of results."""
+    def fail():
+        raise ValueError()
+    results = pool.gather([ lambda: 1, fail, lambda: 3 ], 3)
+    assert 1 == results[0] and 3 == results[2]
+    assert isinstance(results[1], ValueError)
+
+
+def test_shared_is_reused_and_grows():
+    """The shared pool is reused until a caller needs more threads."""
+    threads = pool.shared(2)
+    assert threads is pool.shared(1)
+    assert threads is not pool.shared(64)
+    assert range(5) == list(pool.ordered(lambda x: x, range(5), 2,
+        pool.shared(2)))
+
+
+def test_shared_remains_usable_after_growing():
+    """Callers still using a replaced shared pool complete their calls."""
+    results = pool.ordered(lambda x: x, range(5), 2, pool.shared(2))
+    assert 0 == next(results)
+    pool.shared(pool._shared_size + 1)
+    assert range(1, 5) == list(results)
@@ -0,0 +1,83 @@
+#-------------------------------------------------------------------------------
+# rbtlib: test_raw.py
+#
+# Tests for raw.py.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+import pytest
+from conftest import recorded_url
+from raw import RawResource
+from resource import ResourceFactory
+
+
+response = {
+    'stat': 'ok',
+    'total_results': 2,
+    'review_requests': [ { 'id': 1, 'max-results': 2 }, { 'id': 2 } ],
+}
+
+
+def test_raw_attributes():
+    """Top-level parts are returned as decoded."""
+    raw = RawResource('review_requests', response)
+    assert response is raw.json
+    assert 'ok' == raw.stat
+    assert 2 == raw.review_requests[0]['max-results']
+    with pytest.raises(AttributeError):
+        raw.foo
+
+
+def test_raw_extend():
+    """Extending a raw resource leaves the original unchanged."""
+    raw = RawResource('review_requests', response)
+    extended = raw.extend({ 'self': 'link' })
+    assert 'link' == extended.self
+    with pytest.raises(AttributeError):
+        raw.self
+
+
+def test_raw_resource_factory(recorded_session):
+    """Raw resources provide links to linked resources."""
+    root = ResourceFactory(recorded_session, 'root', recorded_url + '/api/',
+            'GET', raw = True)()
+    assert isinstance(root, RawResource)
+    assert 'ok' == root.stat and 'ok' == root.json['stat']
+    assert isinstance(root.review_requests, ResourceFactory)
+    assert root.review_requests.raw
+
+
+def test_raw_per_call(recorded_session):
+    """Raw resources are obtained on request."""
+    root = ResourceFactory(recorded_session, 'root', recorded_url + '/api/',
+            'GET')
+    assert isinstance(root(raw = True), RawResource)
+    assert root(raw = True).review_requests.raw
+    assert not isinstance(root(), RawResource)
+
+
+def test_raw_iter_items(review_requests_session):
+    """Items of raw list resources are returned as decoded."""
+    review_requests = ResourceFactory(review_requests_session,
+            'review_requests', recorded_url + '/api/review-requests/', 'GET',
+            raw = True)
+    assert range(60) == [ x['id'] for x in review_requests.iter_items() ]
@@ -0,0 +1,108 @@
+#-------------------------------------------------------------------------------
+# rbtlib: test_registry.py
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+import codegen
+import pytest
+from record import Record
+from registry import TypeRegistry
+from resource import Resource
+
+
+@pytest.fixture
+def registry():
+    """Construct a small type registry."""
+    return TypeRegistry(maxsize = 2)
+
+
+def test_registry_reuses_types(registry):
+    """Identical shapes share one named tuple type."""
+    lhs = registry.lookup('links', ('self', 'next'))
+    rhs = registry.lookup('links', ('self', 'next'))
+    assert lhs[0] is rhs[0] and 1 == len(registry)
+
+
+def test_registry_sanitizes_field_names(registry):
+    """Field names are mapped to valid named tuple field names."""
+    tuple_descriptor, field_map = registry.lookup('review-requests',
+            ('max-results',))
+    assert 'review_requests' == tuple_descriptor.__name__
+    assert 'max_results' == field_map['max-results']
+
+
+def test_registry_is_bounded(registry):
+    """The least recently used type is discarded."""
+    first = registry.lookup('a', ('x',))[0]
+    registry.lookup('b', ('x',))
+    registry.lookup('c', ('x',))
+    assert 2 == len(registry)
+    assert first is not registry.lookup('a', ('x',))[0]
+
+
+def test_registry_without_cache():
+    """A registry without capacity builds a new type each time."""
+    registry = TypeRegistry(maxsize = 0)
+    assert registry.lookup('a', ('x',))[0] is not registry.lookup('a', ('x',))[0]
+    assert 0 == len(registry)
+
+
+def test_component_shares_types():
+    """Components built by different resources share types."""
+    response = { 'stat': 'ok', 'links': { 'self': { 'href': '/', 'method': 'GET' } } }
+    lhs = Resource(None, 'root').component('root', response, { 'json': response })
+    rhs = Resource(None, 'root').component('root', response, { 'json': response })
+    assert type(lhs) is type(rhs)
+    assert type(lhs.links.self) is type(rhs.links.self)
+    assert 'ok' == lhs.stat and '/' == lhs.links.self.href
+
+
+def test_registry_uses_records(registry):
+    """Known components use records generated ahead of time."""
+    tuple_descriptor, field_map = registry.lookup('links', ('href', 'method'))
+    assert not issubclass(tuple_descriptor, Record)
+    tuple_descriptor, field_map = registry.lookup('self', ('method', 'href'))
+    assert issubclass(tuple_descriptor, Record)
+    assert 'self' == tuple_descriptor.__name__
+
+
+def test_record_behaves_as_named_tuple(registry):
+    """Records provide the named tuple interface without a tuple."""
+    tuple_descriptor, field_map = registry.lookup('self', ('method', 'href'))
+    record = tuple_descriptor(href = '/', method = 'GET')
+    assert not isinstance(record, tuple)
+    assert not hasattr(record, '__dict__')
+    assert '/' == record.href and 'GET' == record.method
+    assert ('/', 'GET') == record and ('/', 'GET') == tuple(record)
+    assert '/' == record[0] and 2 == len(record)
+    assert record == tuple_descriptor._make(record)
+    assert dict(href = '/', method = 'GET') == dict(record._asdict())
+    assert 'POST' == record._replace(method = 'POST').method
+    with pytest.raises(TypeError):
+        tuple_descriptor(href = '/')
+
+
+def test_codegen_records():
+    """Generated records cover every component in the responses."""
+    response = { 'stat': 'ok', 'links': { 'self': { 'href': '/', 'method': 'GET' } } }
+    names = [ x for x, fields in codegen.records([ ('root', response) ]) ]
+    assert [ 'links', 'root', 'root', 'root', 'self' ] == names
@@ -22,8 +22,11 @@
 # FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
 # IN THE SOFTWARE.
 #-------------------------------------------------------------------------------
+import pool
 import pytest
-from resource import Resource, BadContentType
+import requests
+from conftest import recorded_review_requests, recorded_url
+from resource import Resource, ResourceFactory, BadContentType, fetch_all
 from types import DictionaryType, DictType, ListType
 
 
@@ -139,3 +142,115 @@ def test_linked_resource_method(server_response, root_resource_link):
     """Confirm named tuple linked components contain HTTP method definitions."""
     assert None != getattr(getattr(server_response.links,
         root_resource_link, None), 'method', None)
+
+
+def test_resource_factory_links(recorded_session):
+    """Confirm linked resources are wrapped in resource factories."""
+    root = ResourceFactory(recorded_session, 'root', recorded_url + '/api/', 'GET')()
+    assert isinstance(root.review_requests, ResourceFactory)
+    assert 'review_requests' == root.review_requests.name
+    assert 'root' == root.self.name
+    assert root.links.review_requests.href == recorded_url + '/api/review-requests/'
+
+
+def test_resource_factory_iter_pages(review_requests_session):
+    """Confirm pages are obtained by following the next link."""
+    review_requests = ResourceFactory(review_requests_session,
+            'review_requests', recorded_url + '/api/review-requests/', 'GET')
+    pages = list(review_requests.iter_pages({ 'max-results': 25 }))
+    assert [ 25, 25, 10 ] == [ len(x.review_requests) for x in pages ]
+    assert 'review_requests' == pages[0].next.name
+
+
+def test_resource_factory_iter_items(review_requests_session):
+    """Confirm items are obtained from every page."""
+    review_requests = ResourceFactory(review_requests_session,
+            'review_requests', recorded_url + '/api/review-requests/', 'GET')
+    assert range(5, 60) == [ x.id for x in review_requests.iter_items({
+        'start': 5, 'max-results': 20 }) ]
+
+
+def test_resource_factory_iter_items_stops_early(review_requests_session):
+    """Confirm pages are not requested until they are needed."""
+    review_requests = ResourceFactory(review_requests_session,
+            'review_requests', recorded_url + '/api/review-requests/', 'GET')
+    for item in review_requests.iter_items():
+        break
+    assert 1 == len(review_requests_session.requests)
+
+
+def test_resource_factory_iter_items_concurrently(review_requests_session):
+    """Confirm pages requested concurrently are yielded in order."""
+    review_requests = ResourceFactory(review_requests_session,
+            'review_requests', recorded_url + '/api/review-requests/', 'GET')
+    assert range(3, 60) == [ x.id for x in review_requests.iter_items({
+        'start': 3, 'max-results': 7 }, jobs = 4) ]
+    assert 9 == len(review_requests_session.requests)
+
+
+def test_resource_factory_iter_items_concurrently_beyond_page_limit(
+        recorded_session):
+    """Confirm concurrent pages use the page size the server returns."""
+    recorded_session.add('GET', recorded_url + '/api/review-requests/',
+            recorded_review_requests(60, max_results_limit = 10),
+            'application/vnd.reviewboard.org.review-requests+json')
+    review_requests = ResourceFactory(recorded_session, 'review_requests',
+            recorded_url + '/api/review-requests/', 'GET')
+    assert range(60) == [ x.id for x in review_requests.iter_items({
+        'max-results': 25 }, jobs = 4) ]
+    assert 6 == len(recorded_session.requests)
+    assert all(10 == int(x[2]['max-results'])
+        for x in recorded_session.requests[1:])
+
+
+def test_resource_process(recorded_session):
+    """Confirm responses obtained elsewhere are processed like the getter's."""
+    href = recorded_url + '/api/'
+    response = Resource(recorded_session, 'root').process(href,
+            recorded_session.get(href))
+    assert 'ok' == response.stat and 'ok' == response.json['stat']
+    with pytest.raises(BadContentType):
+        Resource(recorded_session, 'session').process(href,
+                recorded_session.get(href))
+
+
+def test_fetch_all(review_requests_session):
+    """Confirm failures are returned in place without aborting the others."""
+    review_requests_session.add('GET', recorded_url + '/api/session/', None,
+            'text/html', 500)
+    root = ResourceFactory(review_requests_session, 'root',
+            recorded_url + '/api/', 'GET', retry = None)()
+    review_requests, session, me = fetch_all([ root.review_requests,
+        root.session, root.self ])
+    assert 60 == review_requests.total_results
+    assert isinstance(session, requests.exceptions.HTTPError)
+    assert 'ok' == me.stat
+
+
+def test_fetch_all_is_bounded_by_connection_pool(monkeypatch, recorded_session):
+    """Confirm no more requests are outstanding than connections are kept."""
+    jobs = list()
+    def gather(functions, n, threads = None):
+        jobs.append(n)
+        return [ x() for x in functions ]
+    monkeypatch.setattr(pool, 'gather', gather)
+    root = ResourceFactory(recorded_session, 'root', recorded_url + '/api/',
+            'GET')
+    assert 12 == len(fetch_all([ root ] * 12))
+    assert 12 == len(fetch_all([ root ] * 12, jobs = 3))
+    assert [ 10, 3 ] == jobs
+
+
+def test_resource_factory_projection(review_requests_session):
+    """Confirm the parts of the response to include are sent to Review Board."""
+    review_requests = ResourceFactory(review_requests_session,
+            'review_requests', recorded_url + '/api/review-requests/', 'GET')
+    review_requests(only_fields = [ 'id', 'summary' ], only_links = [],
+            expand = [ 'submitter' ])
+    assert { 'only-fields': 'id,summary', 'only-links': '',
+            'expand': 'submitter' } == review_requests_session.requests[-1][2]
+    pages = review_requests.iter_pages({ 'max-results': 20 }, jobs = 2,
+            only_fields = [ 'id' ])
+    assert 3 == len(list(pages))
+    assert all('id' == x[2]['only-fields'] for x in
+            review_requests_session.requests[-3:])
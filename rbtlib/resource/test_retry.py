@@ -0,0 +1,147 @@
+#-------------------------------------------------------------------------------
+# rbtlib: test_retry.py
+#
+# Tests for retry.py.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+from email.utils import formatdate
+import pytest
+import requests
+from resource import Resource
+from retry import Retry, RetryBudget, retry_after
+import time
+
+
+def response(status_code, **headers):
+    """Construct an HTTP response."""
+    r = requests.Response()
+    r.status_code = status_code
+    r.headers.update(headers)
+    return r
+
+
+class Sleep(object):
+    """Record delays instead of sleeping."""
+
+    def __init__(self):
+        self.delays = list()
+
+    def __call__(self, delay):
+        self.delays.append(delay)
+
+
+def replay(*responses):
+    """Return a function object replaying responses in order."""
+    responses = list(responses)
+    return lambda: responses.pop(0)
+
+
+def test_budget():
+    """Retries are refused once the budget is spent."""
+    budget = RetryBudget(ratio = 0.5, minimum = 1)
+    assert budget.withdraw()
+    assert False == budget.withdraw()
+    budget.deposit()
+    budget.deposit()
+    assert budget.withdraw()
+
+
+def test_retry_after():
+    """Retry-After is given in seconds or as an HTTP date."""
+    assert None == retry_after(response(503))
+    assert 2.0 == retry_after(response(503, **{ 'Retry-After': '2' }))
+    delay = retry_after(response(503,
+        **{ 'Retry-After': formatdate(time.time() + 60, usegmt = True) }))
+    assert 55 < delay <= 60
+
+
+def test_retry_transient_failures():
+    """Transient failures are retried with increasing delays."""
+    sleep = Sleep()
+    policy = Retry(attempts = 4, base = 1, sleep = sleep)
+    r = policy(replay(response(502), response(503), response(500),
+        response(200)))
+    assert 200 == r.status_code
+    assert 3 == policy.retries
+    assert 3 == len(sleep.delays)
+    assert all(0 <= x <= 2 ** i for i, x in enumerate(sleep.delays))
+    assert sum(sleep.delays) == policy.delay
+
+
+def test_retry_gives_up():
+    """The last response is returned once every attempt is made."""
+    policy = Retry(attempts = 2, sleep = Sleep())
+    assert 503 == policy(replay(response(503), response(503))).status_code
+    assert 1 == policy.retries
+
+
+@pytest.mark.parametrize('status_code', [ 200, 400, 404 ])
+def test_retry_permanent_failures(status_code):
+    """Only transient failures are retried."""
+    policy = Retry(sleep = Sleep())
+    assert status_code == policy(replay(response(status_code))).status_code
+    assert 0 == policy.retries
+
+
+def test_retry_honours_retry_after():
+    """The delay requested by the server is used."""
+    sleep = Sleep()
+    policy = Retry(cap = 10, sleep = sleep)
+    policy(replay(response(429, **{ 'Retry-After': '3' }), response(200)))
+    assert [ 3.0 ] == sleep.delays
+    r = policy(replay(response(429, **{ 'Retry-After': '60' })))
+    assert 429 == r.status_code
+
+
+def test_retry_budget_is_shared():
+    """Retries stop once the shared budget is spent."""
+    policy = Retry(budget = RetryBudget(ratio = 0, minimum = 1),
+            sleep = Sleep())
+    policy(replay(response(503), response(200)))
+    assert 503 == policy(replay(response(503))).status_code
+    assert 1 == policy.exhausted
+
+
+def test_resource_retries_get(recorded_session):
+    """Resources retry GET commands."""
+    api = 'https://reviews.example.com/api/'
+    failures = [ response(503) ]
+    get = recorded_session.get
+    recorded_session.get = lambda url, **kwargs: \
+            failures.pop() if failures else get(url, **kwargs)
+    policy = Retry(sleep = Sleep())
+    root = Resource(recorded_session, 'root', retry = policy).get(api)
+    assert 'ok' == root.stat
+    assert 1 == policy.retries
+
+
+def test_resource_does_not_retry_post(recorded_session):
+    """Resources never retry POST commands."""
+    api = 'https://reviews.example.com/api/'
+    recorded_session.add('POST', api + 'review-requests/', None,
+            'text/html', 503)
+    policy = Retry(sleep = Sleep())
+    with pytest.raises(requests.exceptions.HTTPError):
+        Resource(recorded_session, 'review_request', retry = policy).post(
+                api + 'review-requests/')
+    assert 0 == policy.retries
@@ -0,0 +1,88 @@
+#-------------------------------------------------------------------------------
+# rbtlib: test_revalidation.py
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+from conftest import recorded_url, RecordedSession
+import pytest
+from resource import ResourceFactory
+from revalidation import RevalidationCache
+
+
+class ConditionalSession(RecordedSession):
+    """HTTP session honouring conditional requests."""
+
+    def request(self, method, url, params = None, data = None, headers = None,
+            **kwargs):
+        response = super(ConditionalSession, self).request(method, url, params,
+                data, headers, **kwargs)
+        if 'v1' == (headers or dict()).get('If-None-Match'):
+            response.status_code = 304
+            response._content = ''
+            del response.headers['Content-Type']
+        response.headers['ETag'] = 'v1'
+        return response
+
+
+@pytest.fixture
+def session(recorded_session):
+    """Return an HTTP session honouring conditional requests."""
+    session = ConditionalSession()
+    session.responses = recorded_session.responses
+    return session
+
+
+def test_revalidation_returns_cached_composite(session):
+    """Responses revalidated by the server reuse the cached composite."""
+    cache = RevalidationCache()
+    root = ResourceFactory(session, 'root', recorded_url + '/api/', 'GET',
+            revalidation = cache)
+    first = root.get(recorded_url + '/api/')
+    second = root.get(recorded_url + '/api/')
+    assert first is second and 'ok' == second.stat
+    assert 'v1' == session.requests[-1][3]['If-None-Match']
+    assert 1 == cache.hits and 1 == cache.misses
+
+
+def test_revalidation_cache_is_shared_with_links(session):
+    """Linked resources share the revalidation cache."""
+    cache = RevalidationCache()
+    root = ResourceFactory(session, 'root', recorded_url + '/api/', 'GET',
+            revalidation = cache)
+    root().self()
+    assert 1 == cache.hits
+
+
+def test_revalidation_cache_is_bounded():
+    """The least recently used composite is discarded."""
+    cache = RevalidationCache(maxsize = 1)
+    cache.store(cache.key('root', '/a', None), { 'ETag': 'x' }, 'a')
+    cache.store(cache.key('root', '/b', None), { 'ETag': 'x' }, 'b')
+    assert None == cache.lookup(cache.key('root', '/a', None))
+    assert 'b' == cache.lookup(cache.key('root', '/b', None)).composite
+
+
+def test_revalidation_requires_validators():
+    """Responses without validators are not cached."""
+    cache = RevalidationCache()
+    cache.store(cache.key('root', '/a', { 'start': 1 }), dict(), 'a')
+    assert 0 == len(cache)
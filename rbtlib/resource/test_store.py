@@ -0,0 +1,124 @@
+#-------------------------------------------------------------------------------
+# rbtlib: test_store.py
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+from conftest import recorded_url
+import pytest
+from resource import ResourceFactory
+from revalidation import RevalidationCache
+import store as response_store
+from store import ResponseStore
+
+
+@pytest.fixture
+def store(tmpdir):
+    """Construct a response store."""
+    return ResponseStore(str(tmpdir.join('cache.sqlite')), max_bytes = 64)
+
+
+def test_store_key_normalizes_query(store):
+    """Query parameters are stored in sorted order."""
+    assert store.key('/api/', { 'b': 1, 'a': True }) == '/api/?a=True&b=1'
+    assert store.key('/api/', None) == '/api/'
+
+
+def test_store_get(store):
+    """Stored responses are shared with other stores using the same file."""
+    store.put('root', '/api/', None, { 'stat': 'ok' })
+    assert { 'stat': 'ok' } == ResponseStore(store.path).get('root', '/api/', None)
+    assert None == store.get('root', '/api/', { 'start': 1 })
+
+
+def test_store_expires(tmpdir):
+    """Responses are not returned once they expire."""
+    store = ResponseStore(str(tmpdir.join('cache.sqlite')), ttl = dict(),
+            default_ttl = 0)
+    store.put('root', '/api/', None, { 'stat': 'ok' })
+    assert None == store.get('root', '/api/', None)
+
+
+def test_store_is_bounded(store):
+    """The least recently used responses are discarded."""
+    store.put('root', '/a/', None, { 'stat': 'ok', 'x': 'a' * 10 })
+    store.put('root', '/b/', None, { 'stat': 'ok', 'x': 'b' * 10 })
+    store.get('root', '/a/', None)
+    store.put('root', '/c/', None, { 'stat': 'ok', 'x': 'c' * 10 })
+    assert None == store.get('root', '/b/', None)
+    assert None != store.get('root', '/a/', None)
+    assert None != store.get('root', '/c/', None)
+
+
+def test_store_resource(recorded_session, tmpdir):
+    """Resources reuse stored responses instead of issuing HTTP commands."""
+    store = ResponseStore(str(tmpdir.join('cache.sqlite')))
+    root = ResourceFactory(recorded_session, 'root', recorded_url + '/api/',
+            'GET', store = store)
+    assert 'ok' == root().stat and 'ok' == root().self().stat
+    assert 1 == len(recorded_session.requests)
+
+
+def test_store_key_includes_identity(store):
+    """Responses obtained using different credentials are stored apart."""
+    store.put('root', '/api/', None, { 'stat': 'ok' }, identity = 'alice')
+    assert None == store.get('root', '/api/', None)
+    assert None == store.get('root', '/api/', None, identity = 'bob')
+    assert { 'stat': 'ok' } == store.get('root', '/api/', None,
+            identity = 'alice')
+
+
+def test_store_identity(recorded_session):
+    """Sessions are identified by their API token and session cookie."""
+    assert None == response_store.identity(recorded_session)
+    recorded_session.headers['Authorization'] = 'token secret'
+    identity = response_store.identity(recorded_session)
+    assert None != identity and 'secret' not in identity
+    recorded_session.headers['Authorization'] = 'token other'
+    assert identity != response_store.identity(recorded_session)
+
+
+def test_store_resource_per_identity(recorded_session, tmpdir):
+    """Resources do not reuse responses obtained using other credentials."""
+    store = ResponseStore(str(tmpdir.join('cache.sqlite')))
+    root = ResourceFactory(recorded_session, 'root', recorded_url + '/api/',
+            'GET', store = store)
+    root()
+    recorded_session.headers['Authorization'] = 'token secret'
+    root()
+    assert 2 == len(recorded_session.requests)
+
+
+def test_store_keeps_validators(recorded_session, tmpdir):
+    """Stored responses keep their validators for revalidation."""
+    recorded_session.responses[('GET', recorded_url + '/api/')] = \
+            recorded_session.responses[('GET', recorded_url + '/api/')][:3] + \
+            ({ 'ETag': 'v1' },)
+    store = ResponseStore(str(tmpdir.join('cache.sqlite')))
+    cache = RevalidationCache()
+    root = ResourceFactory(recorded_session, 'root', recorded_url + '/api/',
+            'GET', store = store, revalidation = cache)
+    root.get(recorded_url + '/api/')
+    root.get(recorded_url + '/api/')
+    assert 1 == len(recorded_session.requests) and 1 == len(cache)
+    validators = dict()
+    store.get('root', recorded_url + '/api/', None, validators = validators)
+    assert { 'ETag': 'v1' } == validators
@@ -26,6 +26,42 @@
 #-------------------------------------------------------------------------------
 import collections
 from resource import ResourceFactory
+import string
+import threading
+from urllib import quote
+
+
+def compile_template(template):
+    """Compile a URI template.
+
+    Review Board URI templates contain simple {name} expressions only.
+
+    Args:
+        template: the URI template.
+
+    Returns:
+        A list of tuples containing the literal text preceding each expression
+        and the expression's name (None for the text following the last one).
+    """
+    return [ (literal, name) for literal, name, spec, conversion in
+            string.Formatter().parse(template) ]
+
+
+def expand(template, params):
+    """Expand a compiled URI template.
+
+    Args:
+        template: the compiled URI template.
+        params: a dictionary containing the value of each expression.
+
+    Returns:
+        The URI.
+
+    Raises:
+        KeyError: an expression has no value.
+    """
+    return ''.join(literal + (quote(unicode(params[name]).encode('utf-8'),
+        safe = '') if None != name else '') for literal, name in template)
 
 
 class Root(ResourceFactory):
@@ -35,14 +71,61 @@ class Root(ResourceFactory):
     used by the Review Board instance to query. The caller needn't specify the
     entire URL to the Root List Resource.
 
-    Other Web API resources should rely upon the parent class.
+    Other Web API resources should rely upon the parent class, or resolve()
+    when they are named by one of the URI templates in the Root List Resource.
 
     Attributes:
-        session: the HTTP session.
+        session: the HTTP session, or None to create one.
         url: the URL defining the resource location.
         name: the resource name.
+        kwargs: resource options (see Resource).
     """
     name = 'root'
-    def __init__(self, session, url):
+    def __init__(self, session, url, **kwargs):
         """Construct a Root List Resource."""
-        super(Root, self).__init__(session, self.name, url + '/api/', 'GET')
+        super(Root, self).__init__(session, self.name, url + '/api/', 'GET',
+                **kwargs)
+        self._templates = None
+        self._lock = threading.Lock()
+
+    def __call__(self, query_dict = dict(), raw = None, **kwargs):
+        """Obtain the Root List Resource and compile its URI templates.
+
+        Args:
+            query_dict: the payload provided to the HTTP command.
+            raw: True to obtain a RawResource (see ResourceFactory).
+            kwargs: the parts of the response to include (see projection).
+
+        Returns:
+            The Root List Resource.
+        """
+        response = super(Root, self).__call__(query_dict, raw, **kwargs)
+        templates = dict((x, compile_template(y)) for x, y in
+                response.json.get('uri_templates', dict()).iteritems())
+        with self._lock:
+            self._templates = templates
+        return response
+
+    def resolve(self, template_name, **params):
+        """Construct a resource named by a URI template.
+
+        The Root List Resource is obtained once, when no earlier call obtained
+        it, so reaching a resource requires a single request rather than
+        traversing the resources linking to it.
+
+        Args:
+            template_name: the URI template name (e.g., review_request).
+            params: the value of each expression in the URI template (e.g.,
+                review_request_id).
+
+        Returns:
+            A ResourceFactory for the resource.
+
+        Raises:
+            KeyError: there is no such URI template or an expression has no
+                value.
+        """
+        if None == self._templates:
+            self()
+        url = expand(self._templates[template_name], params)
+        return self.link(template_name, url, 'GET')
@@ -0,0 +1,312 @@
+#-------------------------------------------------------------------------------
+# rbtlib: app.py
+#
+# WSGI application standing in for a Review Board server.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+import Cookie
+import cgi
+import collections
+from data import Dataset, Record, timestamp_format
+import datetime
+from functools import partial
+import hashlib
+import itertools
+import json
+import payload
+import re
+from rbtlib.resource.resource import content_type
+import urlparse
+import uuid
+
+
+# Login page, worded as on demo.reviewboard.org so clients can find the
+# credentials.
+login_page = """<html>
+<head><title>Log In | Review Board</title></head>
+<body>
+<p>To log into the demo server, use username &quot;{0}&quot;, password &quot;{1}&quot;</p>
+<form method="post" action="/account/login/">
+<input type="hidden" name="csrfmiddlewaretoken" value="{2}">
+<input type="text" name="username">
+<input type="password" name="password">
+</form>
+</body>
+</html>
+"""
+
+
+Request = collections.namedtuple('Request', [ 'method', 'path', 'url',
+    'query_dict', 'form', 'cookies', 'headers' ])
+
+
+def request(environ):
+    """Describe the HTTP command in a WSGI environment.
+
+    Args:
+        environ: the WSGI environment.
+
+    Returns:
+        A Request.
+    """
+    form = dict()
+    if 'POST' == environ['REQUEST_METHOD']:
+        fields = cgi.FieldStorage(fp = environ['wsgi.input'],
+                environ = dict(environ, QUERY_STRING = ''),
+                keep_blank_values = True)
+        form = dict((x.name, x.value) for x in fields.list or list())
+    cookies = Cookie.SimpleCookie(environ.get('HTTP_COOKIE', ''))
+    return Request(environ['REQUEST_METHOD'], environ['PATH_INFO'],
+            environ['wsgi.url_scheme'] + '://' + environ['HTTP_HOST'],
+            dict(urlparse.parse_qsl(environ.get('QUERY_STRING', ''),
+                keep_blank_values = True)), form,
+            dict((x, y.value) for x, y in cookies.iteritems()),
+            dict((x[5:], y) for x, y in environ.iteritems()
+                if x.startswith('HTTP_')))
+
+
+class Application(object):
+    """Stand-in Review Board server.
+
+    Serves the Root List Resource, every resource it links to, review requests
+    and the login page, each with the Content-Type Review Board uses. JSON
+    responses carry an ETag and requests carrying a matching If-None-Match are
+    answered with 304 Not Modified.
+
+    Logging in sets the rbsessionid cookie, as Review Board does. Logged in
+    users can create API tokens, which are accepted in place of the session
+    cookies. Either is accepted by the Session Resource and is needed to create
+    a review request. Created review requests are unpublished, so they are
+    reached using their URL but never listed and the dataset is unchanged.
+
+    Attributes:
+        dataset: the review requests served.
+        username: the user name accepted by the login page.
+        password: the password accepted by the login page.
+        anonymous: whether the API is available before logging in.
+    """
+
+    def __init__(self, dataset = None, username = 'guest', password = 'guest',
+            anonymous = True):
+        self.dataset = dataset or Dataset()
+        self.username = username
+        self.password = password
+        self.anonymous = anonymous
+        self._sessions = dict()
+        self._tokens = dict()
+        self._drafts = dict()
+        self._ids = itertools.count(len(self.dataset) + 1)
+        self.routes = [
+            ('GET', re.compile(r'^/$'), self.dashboard),
+            ('POST', re.compile(r'^/$'), self.dashboard),
+            ('GET', re.compile(r'^/account/login/$'), self.login_page),
+            ('POST', re.compile(r'^/account/login/$'), self.login),
+            ('GET', re.compile(r'^/api/$'), self.root),
+            ('GET', re.compile(r'^/api/info/$'), self.info),
+            ('GET', re.compile(r'^/api/review-requests/$'),
+                self.review_requests),
+            ('POST', re.compile(r'^/api/review-requests/$'), self.create),
+            ('GET', re.compile(r'^/api/review-requests/(\d+)/$'),
+                self.review_request),
+            ('GET', re.compile(r'^/api/search/$'), self.search),
+            ('GET', re.compile(r'^/api/session/$'), self.session),
+            ('GET', re.compile(r'^/api/validation/$'), self.validation),
+            ('POST', re.compile(r'^/api/users/([^/]+)/api-tokens/$'),
+                self.api_token),
+        ]
+        for name, path in sorted(payload.lists.iteritems()):
+            self.routes.append(('GET', re.compile('^/api/' + path + '$'),
+                partial(self.resources, name)))
+
+    def __call__(self, environ, start_response):
+        status, headers, body = self.dispatch(request(environ))
+        start_response(status, headers + [ ('Content-Length', str(len(body))) ])
+        return [ body ]
+
+    def dispatch(self, request):
+        """Route an HTTP command to its handler.
+
+        Args:
+            request: the HTTP command.
+
+        Returns:
+            A tuple containing the HTTP status, headers and body.
+        """
+        if not self.anonymous and request.path.startswith('/api/') \
+                and None == self.user(request):
+            return self.error('401 Unauthorized', 103, 'You are not logged in')
+        allowed = list()
+        for method, path, handler in self.routes:
+            match = path.match(request.path)
+            if None == match:
+                continue
+            if method != request.method:
+                allowed.append(method)
+                continue
+            try:
+                return handler(request, *match.groups())
+            except ValueError as e:
+                return self.error('400 Bad Request', 105, str(e))
+        if allowed:
+            return self.error('405 Method Not Allowed', 101,
+                    'Method not allowed')
+        return self.error('404 Not Found', 100, 'Object does not exist')
+
+    def json(self, request, name, body, status = '200 OK'):
+        """Create a JSON response.
+
+        Args:
+            request: the HTTP command.
+            name: the resource name, which determines the Content-Type.
+            body: a dictionary containing the response.
+            status: the HTTP status.
+
+        Returns:
+            A tuple containing the HTTP status, headers and body.
+        """
+        body = json.dumps(body)
+        etag = '"{0}"'.format(hashlib.sha1(body).hexdigest())
+        if etag == request.headers.get('IF_NONE_MATCH'):
+            return '304 Not Modified', [ ('ETag', etag) ], ''
+        return status, [ ('Content-Type', content_type[name]),
+                ('ETag', etag) ], body
+
+    def error(self, status, code, msg):
+        """Create an error response.
+
+        Args:
+            status: the HTTP status.
+            code: the Review Board error code.
+            msg: the error message.
+
+        Returns:
+            A tuple containing the HTTP status, headers and body.
+        """
+        return status, [ ('Content-Type', 'application/json') ], \
+                json.dumps(payload.error(code, msg))
+
+    def user(self, request):
+        """Identify the logged in user.
+
+        Args:
+            request: the HTTP command.
+
+        Returns:
+            The user name or None.
+        """
+        scheme, token = request.headers.get('AUTHORIZATION', ' ').split(' ', 1)
+        if 'token' == scheme:
+            return self._tokens.get(token)
+        return self._sessions.get(request.cookies.get('rbsessionid'))
+
+    def dashboard(self, request):
+        return '200 OK', [ ('Content-Type', 'text/html; charset=utf-8') ], \
+                '<html><body>Dashboard</body></html>\n'
+
+    def login_page(self, request):
+        token = request.cookies.get('csrftoken') or uuid.uuid4().hex
+        return '200 OK', [ ('Content-Type', 'text/html; charset=utf-8'),
+                ('Set-Cookie', 'csrftoken={0}; Path=/'.format(token)) ], \
+                login_page.format(self.username, self.password, token)
+
+    def login(self, request):
+        token = request.cookies.get('csrftoken')
+        if None == token or token != request.form.get('csrfmiddlewaretoken'):
+            return '403 Forbidden', [ ('Content-Type', 'text/html') ], \
+                    '<html><body>CSRF verification failed.</body></html>\n'
+        if (self.username, self.password) != (request.form.get('username'),
+                request.form.get('password')):
+            return self.login_page(request)
+        session_id = uuid.uuid4().hex
+        self._sessions[session_id] = self.username
+        return '302 Found', [
+                ('Location', request.url + request.form.get('next', '/')),
+                ('Set-Cookie', 'rbsessionid={0}; Path=/'.format(session_id)),
+                ], ''
+
+    def root(self, request):
+        return self.json(request, 'root', payload.root(request.url))
+
+    def review_requests(self, request):
+        return self.json(request, 'review_requests',
+                payload.review_requests(self.dataset, request.url,
+                    request.query_dict))
+
+    def create(self, request):
+        username = self.user(request)
+        if None == username:
+            return self.error('401 Unauthorized', 103, 'You are not logged in')
+        now = datetime.datetime.utcnow().strftime(timestamp_format)
+        record = Record(next(self._ids), 'pending', username,
+                request.form.get('repository'), '', now, now, 0)
+        self._drafts[record.id] = record
+        return self.json(request, 'review_request', {
+            'review_request': payload.review_request(record, request.url,
+                public = False),
+            'stat': 'ok',
+        }, '201 Created')
+
+    def review_request(self, request, i):
+        record = self.dataset.get(int(i))
+        public = None != record
+        record = record or self._drafts.get(int(i))
+        if None == record:
+            return self.error('404 Not Found', 100, 'Object does not exist')
+        return self.json(request, 'review_request', {
+            'review_request': payload.project(payload.review_request(record,
+                request.url, public), request.query_dict),
+            'stat': 'ok',
+        })
+
+    def api_token(self, request, username):
+        if username != self.user(request):
+            return self.error('403 Forbidden', 101,
+                    'You don\'t have permission for this')
+        token = uuid.uuid4().hex
+        self._tokens[token] = username
+        return self.json(request, 'api_token', {
+            'api_token': {
+                'id': len(self._tokens),
+                'note': request.form.get('note', ''),
+                'token': token,
+            },
+            'stat': 'ok',
+        }, '201 Created')
+
+    def info(self, request):
+        return self.json(request, 'info', payload.info(request.url))
+
+    def resources(self, name, request):
+        return self.json(request, name, payload.resources(request.url, name,
+            request.query_dict))
+
+    def search(self, request):
+        return self.json(request, 'search', payload.search(request.url))
+
+    def validation(self, request):
+        return self.json(request, 'validation',
+                payload.validation(request.url))
+
+    def session(self, request):
+        return self.json(request, 'session', payload.session(request.url,
+            self.user(request)))
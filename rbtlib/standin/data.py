@@ -0,0 +1,201 @@
+#-------------------------------------------------------------------------------
+# rbtlib: data.py
+#
+# Synthetic review requests served by the stand-in Review Board server.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+import bisect
+import collections
+import datetime
+from operator import attrgetter
+import random
+from rbtlib import timerange
+
+
+# Review request statuses and the share of review requests having each.
+statuses = [ ('pending', 20), ('submitted', 65), ('discarded', 15) ]
+
+
+submitters = [ 'admin', 'alice', 'bob', 'carol', 'dave', 'erin' ]
+
+
+repositories = [ 'rbtlib', 'reviewboard', 'djblets', 'rbtools' ]
+
+
+# Words used to build review request summaries.
+words = [ 'add', 'crash', 'diff', 'documentation', 'fix', 'login', 'page',
+    'parser', 'remove', 'repository', 'review', 'session', 'support', 'test',
+    'update', 'upload' ]
+
+
+# Format of the time stamps in review requests.
+timestamp_format = '%Y-%m-%dT%H:%M:%SZ'
+
+
+Record = collections.namedtuple('Record', [ 'id', 'status', 'submitter',
+    'repository', 'summary', 'time_added', 'last_updated', 'ship_it_count' ])
+
+
+def timestamp(value):
+    """Convert a date and time in a Review Board query to a time stamp.
+
+    Args:
+        value: a date and time in one of timerange.input_formats or None.
+
+    Returns:
+        The time stamp, which compares correctly with those in records, or
+        None.
+
+    Raises:
+        ValueError: the value is not in a supported format.
+    """
+    if None == value:
+        return None
+    return timerange.parse(value).strftime(timestamp_format)
+
+
+class Dataset(object):
+    """Synthetic review requests.
+
+    Review requests are generated from a seed, so every dataset created using
+    the same arguments is identical. Identifiers start at 1 and review requests
+    are added in order of identifier, about one per interval. Each is updated
+    up to 30 days after being added.
+
+    Only the fields needed to filter and order review requests are held, so a
+    dataset of 100,000 review requests is generated in a second or two.
+    Selections are cached, so paging through one costs a slice per page.
+
+    Attributes:
+        records: the review requests, in order of identifier.
+    """
+
+    def __init__(self, count = 1000, seed = 0,
+            start = datetime.datetime(2016, 1, 1), interval = 3600,
+            maxsize = 32):
+        """Generate the review requests.
+
+        Args:
+            count: the number of review requests.
+            seed: the seed of the random number generator.
+            start: the datetime the first review request is added after.
+            interval: the mean time, in seconds, between review requests.
+            maxsize: the number of selections cached.
+        """
+        start = start.replace(microsecond = 0)
+        uniform = random.Random(seed).random
+        choice = lambda x: x[int(uniform() * len(x))]
+        population = [ x for x, y in statuses for i in range(y) ]
+        self.records = list()
+        for i in range(1, count + 1):
+            added = start + datetime.timedelta(seconds = (i - 1) * interval +
+                    int(uniform() * interval))
+            updated = added + datetime.timedelta(seconds =
+                    int(uniform() * 30 * 24 * 3600))
+            self.records.append(Record(i, choice(population),
+                choice(submitters), choice(repositories),
+                ' '.join([ choice(words), choice(words),
+                    choice(words) ]).capitalize(),
+                added.isoformat() + 'Z', updated.isoformat() + 'Z',
+                int(uniform() * 4)))
+        self._by_status = dict(all = self.records)
+        for status, share in statuses:
+            self._by_status[status] = [ x for x in self.records
+                    if status == x.status ]
+        self._time_added = dict((x, [ z.time_added for z in y ])
+                for x, y in self._by_status.iteritems())
+        self._maxsize = maxsize
+        self._selections = dict()
+
+    def __len__(self):
+        return len(self.records)
+
+    def get(self, i):
+        """Find a review request.
+
+        Args:
+            i: the review request identifier.
+
+        Returns:
+            The review request or None if there is no such review request.
+        """
+        if 0 < i <= len(self.records):
+            return self.records[i - 1]
+        return None
+
+    def _filter(self, status, time_added_from, time_added_to,
+            last_updated_from):
+        """Filter review requests, in order of identifier.
+
+        Review requests are in order of the time they were added, so the time
+        added range is found by bisection.
+        """
+        records = self._by_status.get(status, list())
+        time_added = self._time_added.get(status, list())
+        lo = bisect.bisect_left(time_added, time_added_from or '')
+        hi = len(records)
+        if None != time_added_to:
+            hi = bisect.bisect_left(time_added, time_added_to)
+        if None == last_updated_from:
+            return records[lo:hi]
+        return [ x for x in records[lo:hi] if last_updated_from <= x.last_updated ]
+
+    def count(self, status = 'pending', time_added_from = None,
+            time_added_to = None, last_updated_from = None):
+        """Count the review requests matching a query.
+
+        Args:
+            status: pending, submitted, discarded or all.
+            time_added_from: the time stamp of the earliest review request.
+            time_added_to: the time stamp following the latest review request.
+            last_updated_from: the time stamp of the earliest update.
+
+        Returns:
+            The number of review requests.
+        """
+        return len(self._filter(status, time_added_from, time_added_to,
+            last_updated_from))
+
+    def select(self, status = 'pending', time_added_from = None,
+            time_added_to = None, last_updated_from = None):
+        """Select the review requests matching a query.
+
+        Args:
+            status: pending, submitted, discarded or all.
+            time_added_from: the time stamp of the earliest review request.
+            time_added_to: the time stamp following the latest review request.
+            last_updated_from: the time stamp of the earliest update.
+
+        Returns:
+            A list containing the review requests, most recently updated first,
+            as Review Board lists them.
+        """
+        key = (status, time_added_from, time_added_to, last_updated_from)
+        selected = self._selections.get(key)
+        if None == selected:
+            selected = sorted(self._filter(*key),
+                    key = attrgetter('last_updated', 'id'), reverse = True)
+            if self._maxsize <= len(self._selections):
+                self._selections.clear()
+            self._selections[key] = selected
+        return selected
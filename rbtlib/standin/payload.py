@@ -0,0 +1,410 @@
+#-------------------------------------------------------------------------------
+# rbtlib: payload.py
+#
+# Resources returned by the stand-in Review Board server.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+from data import repositories, submitters, timestamp
+import urllib
+
+
+# The largest page Review Board returns.
+max_results_limit = 200
+
+
+# Values of the counts-only parameter requesting a count.
+counts_only = [ '1', 'true', 'True' ]
+
+
+# List resources linked from the Root List Resource and their paths.
+lists = dict((x, x.replace('_', '-') + '/') for x in [ 'default_reviewers',
+    'extensions', 'groups', 'hosting_service_accounts', 'hosting_services',
+    'repositories', 'users', 'webhooks' ])
+
+
+def link(href, method = 'GET', title = None):
+    """Create a link.
+
+    Args:
+        href: the URL.
+        method: the HTTP method.
+        title: the title of the linked resource, if any.
+
+    Returns:
+        A dictionary containing the link.
+    """
+    result = { 'href': href, 'method': method }
+    if None != title:
+        result['title'] = title
+    return result
+
+
+def error(code, msg):
+    """Create an error response.
+
+    Args:
+        code: the Review Board error code.
+        msg: the error message.
+
+    Returns:
+        A dictionary containing the error.
+    """
+    return { 'err': { 'code': code, 'msg': msg }, 'stat': 'fail' }
+
+
+def server_info(url):
+    """Describe the server, as the Root List Resource and Server Info do.
+
+    Args:
+        url: the server URL.
+
+    Returns:
+        A dictionary containing the capabilities, product and site.
+    """
+    return {
+        'capabilities': {
+            'diffs': { 'moved_files': True },
+            'review_requests': { 'commit_ids': True },
+        },
+        'product': {
+            'is_release': True,
+            'name': 'Review Board',
+            'package_version': '2.0.24',
+            'version': '2.0.24',
+        },
+        'site': {
+            'administrators': [ { 'email': 'admin@example.com', 'name': 'Admin' } ],
+            'time_zone': 'UTC',
+            'url': url + '/',
+        },
+    }
+
+
+def root(url):
+    """Create the Root List Resource.
+
+    Args:
+        url: the server URL.
+
+    Returns:
+        A dictionary containing the Root List Resource.
+    """
+    api = url + '/api/'
+    paths = dict(lists, info = 'info/', review_requests = 'review-requests/',
+            search = 'search/', session = 'session/',
+            validation = 'validation/')
+    uri_templates = dict((x, api + y) for x, y in paths.iteritems())
+    uri_templates.update(
+            repository = api + 'repositories/{repository_id}/',
+            review_request = api + 'review-requests/{review_request_id}/')
+    return dict(server_info(url),
+            links = dict([ (x, link(api + y)) for x, y in paths.iteritems() ],
+                self = link(api)),
+            stat = 'ok',
+            uri_templates = uri_templates)
+
+
+def info(url):
+    """Create the Server Info Resource.
+
+    Args:
+        url: the server URL.
+
+    Returns:
+        A dictionary containing the Server Info Resource.
+    """
+    return { 'info': server_info(url), 'stat': 'ok' }
+
+
+def search(url):
+    """Create the Search Resource, which finds nothing.
+
+    Args:
+        url: the server URL.
+
+    Returns:
+        A dictionary containing the Search Resource.
+    """
+    return {
+        'search': { 'groups': [], 'review_requests': [], 'users': [] },
+        'stat': 'ok',
+    }
+
+
+def validation(url):
+    """Create the Validation Resource.
+
+    Args:
+        url: the server URL.
+
+    Returns:
+        A dictionary containing the Validation Resource.
+    """
+    api = url + '/api/validation/'
+    return {
+        'links': {
+            'diffs': link(api + 'diffs/'),
+            'self': link(api),
+        },
+        'stat': 'ok',
+    }
+
+
+def items(url, name):
+    """Create the items of a list resource linked from the Root List Resource.
+
+    The submitters and repositories in the dataset are listed. The other list
+    resources are empty.
+
+    Args:
+        url: the server URL.
+        name: the name of the list resource.
+
+    Returns:
+        A list containing the items.
+    """
+    api = url + '/api/'
+    if 'users' == name:
+        return [ {
+            'email': x + '@example.com',
+            'fullname': x.capitalize(),
+            'id': i,
+            'links': { 'self': link(api + 'users/{0}/'.format(x)) },
+            'url': '/users/{0}/'.format(x),
+            'username': x,
+        } for i, x in enumerate(submitters, 1) ]
+    if 'repositories' == name:
+        return [ {
+            'id': i,
+            'links': { 'self': link(api + 'repositories/{0}/'.format(i)) },
+            'name': x,
+            'path': 'https://github.com/reviewboard/{0}.git'.format(x),
+            'tool': 'Git',
+            'visible': True,
+        } for i, x in enumerate(repositories, 1) ]
+    return list()
+
+
+def resources(url, name, query_dict = dict()):
+    """Create a list resource linked from the Root List Resource.
+
+    Every item is on the first page. Supports the counts-only parameter.
+
+    Args:
+        url: the server URL.
+        name: the name of the list resource.
+        query_dict: the HTTP command parameters.
+
+    Returns:
+        A dictionary containing the list resource.
+    """
+    selected = items(url, name)
+    if query_dict.get('counts-only') in counts_only:
+        return { 'count': len(selected), 'stat': 'ok' }
+    return {
+        'links': { 'self': link(url + '/api/' + lists[name]) },
+        name: selected,
+        'stat': 'ok',
+        'total_results': len(selected),
+    }
+
+
+def review_request(record, url, public = True):
+    """Create a review request resembling those returned by Review Board.
+
+    Args:
+        record: the review request in the dataset.
+        url: the server URL.
+        public: whether the review request is published.
+
+    Returns:
+        A dictionary containing the review request.
+    """
+    href = url + '/api/review-requests/{0}/'.format(record.id)
+    relative = lambda name, method = 'GET': link(href + name + '/' if name else
+            href, method)
+    links = {
+        'changes': relative('changes'),
+        'delete': relative('', 'DELETE'),
+        'diffs': relative('diffs'),
+        'draft': relative('draft'),
+        'file_attachments': relative('file-attachments'),
+        'last_update': relative('last-update'),
+        'reviews': relative('reviews'),
+        'screenshots': relative('screenshots'),
+        'self': relative(''),
+        'submitter': link(url + '/api/users/{0}/'.format(record.submitter),
+            title = record.submitter),
+        'update': relative('', 'PUT'),
+    }
+    if record.repository in repositories:
+        links['repository'] = link(url + '/api/repositories/{0}/'.format(
+            repositories.index(record.repository) + 1),
+            title = record.repository)
+    return {
+        'absolute_url': url + '/r/{0}/'.format(record.id),
+        'approval_failure': None,
+        'approved': False,
+        'blocks': [],
+        'branch': 'master',
+        'bugs_closed': [ str(record.id % 10000) ],
+        'changenum': None,
+        'close_description': None,
+        'close_description_text_type': 'plain',
+        'commit_id': None,
+        'depends_on': [],
+        'description': 'Description of review request {0}.'.format(record.id),
+        'description_text_type': 'markdown',
+        'extra_data': {},
+        'id': record.id,
+        'issue_dropped_count': 0,
+        'issue_open_count': record.id % 6,
+        'issue_resolved_count': 0,
+        'issue_verifying_count': 0,
+        'last_updated': record.last_updated,
+        'links': links,
+        'public': public,
+        'ship_it_count': record.ship_it_count,
+        'status': record.status,
+        'summary': record.summary,
+        'target_groups': [],
+        'target_people': [ link(url + '/api/users/reviewer/',
+            title = 'reviewer') ],
+        'testing_done': 'Ran the test suite.',
+        'testing_done_text_type': 'markdown',
+        'text_type': None,
+        'time_added': record.time_added,
+        'url': '/r/{0}/'.format(record.id),
+    }
+
+
+def project(item, query_dict):
+    """Apply the only-fields and only-links parameters to an item.
+
+    Args:
+        item: a dictionary containing the item.
+        query_dict: the HTTP command parameters.
+
+    Returns:
+        A dictionary containing the requested fields and links.
+    """
+    result = item
+    if 'only-fields' in query_dict:
+        fields = query_dict['only-fields'].split(',')
+        result = dict((x, y) for x, y in item.iteritems()
+                if x in fields or 'links' == x)
+    if 'only-links' in query_dict:
+        names = query_dict['only-links'].split(',')
+        result = dict(result, links = dict((x, y) for x, y in
+            item['links'].iteritems() if x in names))
+    return result
+
+
+def page_link(href, query_dict, start, max_results):
+    """Link to a page of a list resource.
+
+    The link retains the query parameters, as Review Board does.
+
+    Args:
+        href: the URL of the list resource.
+        query_dict: the HTTP command parameters.
+        start: the index of the first item on the page.
+        max_results: the number of items on the page.
+
+    Returns:
+        A dictionary containing the link.
+    """
+    query_dict = dict(query_dict, start = start,
+            **{ 'max-results': max_results })
+    return link(href + '?' + urllib.urlencode(sorted(query_dict.items())))
+
+
+def review_requests(dataset, url, query_dict = dict()):
+    """Create a page of the Review Request List Resource.
+
+    Supports the status, time-added-from, time-added-to, last-updated-from,
+    counts-only, start, max-results, only-fields and only-links parameters.
+
+    Args:
+        dataset: the review requests.
+        url: the server URL.
+        query_dict: the HTTP command parameters.
+
+    Returns:
+        A dictionary containing the Review Request List Resource.
+
+    Raises:
+        ValueError: a parameter is invalid.
+    """
+    href = url + '/api/review-requests/'
+    query = dict(status = query_dict.get('status', 'pending'),
+            time_added_from = timestamp(query_dict.get('time-added-from')),
+            time_added_to = timestamp(query_dict.get('time-added-to')),
+            last_updated_from = timestamp(query_dict.get('last-updated-from')))
+    if query_dict.get('counts-only') in counts_only:
+        return { 'count': dataset.count(**query), 'stat': 'ok' }
+    selected = dataset.select(**query)
+    start = max(0, int(query_dict.get('start', 0)))
+    max_results = min(max_results_limit,
+            int(query_dict.get('max-results', 25)))
+    links = {
+        'create': link(href, 'POST'),
+        'self': link(href),
+    }
+    if start + max_results < len(selected):
+        links['next'] = page_link(href, query_dict, start + max_results,
+                max_results)
+    if 0 < start:
+        links['prev'] = page_link(href, query_dict,
+                max(0, start - max_results), max_results)
+    return {
+        'links': links,
+        'review_requests': [ project(review_request(x, url), query_dict)
+            for x in selected[start:start + max_results] ],
+        'stat': 'ok',
+        'total_results': len(selected),
+    }
+
+
+def session(url, username = None):
+    """Create the Session Resource.
+
+    Args:
+        url: the server URL.
+        username: the logged in user or None.
+
+    Returns:
+        A dictionary containing the Session Resource.
+    """
+    api = url + '/api/'
+    links = {
+        'delete': link(api + 'session/', 'DELETE'),
+        'self': link(api + 'session/'),
+    }
+    if None != username:
+        links['user'] = link(api + 'users/{0}/'.format(username),
+                title = username)
+    return {
+        'session': { 'authenticated': None != username, 'links': links },
+        'stat': 'ok',
+    }
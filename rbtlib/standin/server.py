@@ -0,0 +1,112 @@
+#-------------------------------------------------------------------------------
+# rbtlib: server.py
+#
+# Stand-in Review Board server running on localhost.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+from app import Application
+from SocketServer import ThreadingMixIn
+import threading
+from wsgiref.simple_server import make_server
+from wsgiref.simple_server import WSGIRequestHandler
+from wsgiref.simple_server import WSGIServer
+
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    """WSGI server handling each request in its own thread."""
+
+    daemon_threads = True
+    request_queue_size = 64
+
+
+class RequestHandler(WSGIRequestHandler):
+    """WSGI request handler that does not log requests."""
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Server(object):
+    """Stand-in Review Board server.
+
+    The server runs in a background thread, handling each request in its own
+    thread, so concurrent clients can be tested. Use it as a context manager
+    or call start and stop::
+
+        with Server(Application(Dataset(count = 100000))) as server:
+            root = Root(None, server.url)()
+
+    Attributes:
+        application: the WSGI application.
+    """
+
+    def __init__(self, application = None, host = '127.0.0.1', port = 0):
+        """Create the server.
+
+        Args:
+            application: the WSGI application. Defaults to an Application
+                serving the default Dataset.
+            host: the address the server listens on.
+            port: the port the server listens on. Defaults to any free port.
+        """
+        self.application = application or Application()
+        self._host = host
+        self._port = port
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def fqdn(self):
+        return '{0}:{1}'.format(self._host, self.port)
+
+    @property
+    def port(self):
+        return self._httpd.server_port if self._httpd else self._port
+
+    @property
+    def url(self):
+        return 'http://' + self.fqdn
+
+    def start(self):
+        """Start serving requests."""
+        self._httpd = make_server(self._host, self._port, self.application,
+                server_class = ThreadingWSGIServer,
+                handler_class = RequestHandler)
+        self._thread = threading.Thread(target = self._httpd.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Stop serving requests."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join()
+        self._httpd = None
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
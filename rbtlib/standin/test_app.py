@@ -0,0 +1,128 @@
+#-------------------------------------------------------------------------------
+# rbtlib: test_app.py
+#
+# Tests for app.py, using the stand-in server on localhost.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+import pytest
+from rbtlib import Root, user
+from rbtlib.resource.revalidation import RevalidationCache
+from rbtlib.standin import Application, Dataset, Server
+import requests
+
+
+def test_root(standin):
+    """The Root List Resource is served with its Content-Type."""
+    root = Root(None, standin.url)()
+    assert 'ok' == root.stat
+    assert standin.url + '/api/review-requests/' == \
+            root.links.review_requests.href
+
+
+def test_review_requests_pages(standin):
+    """Paging visits every review request once, with or without jobs."""
+    review_requests = Root(None, standin.url)().review_requests
+    query_dict = { 'status': 'all', 'max-results': 100 }
+    for jobs in ( 1, 4 ):
+        ids = [ x['id'] for page in review_requests.iter_pages(query_dict,
+            jobs = jobs) for x in page.json['review_requests'] ]
+        assert range(1, 1001) == sorted(ids)
+
+
+def test_review_requests_counts_only(standin):
+    """Time filters apply to counts-only requests."""
+    review_requests = Root(None, standin.url)().review_requests
+    dataset = standin.application.dataset
+    count = review_requests({ 'counts-only': 1, 'status': 'all',
+        'time-added-from': '2016-01-10', 'time-added-to': '2016-01-20' }).count
+    assert 240 == count
+    assert count == len([ x for x in dataset.records
+        if '2016-01-10' <= x.time_added < '2016-01-20' ])
+
+
+def test_review_request(standin):
+    """Review requests are reached using the URI templates."""
+    review_request = Root(None, standin.url).resolve('review_request',
+            review_request_id = 7)().review_request
+    assert 7 == review_request.id
+
+
+def test_review_request_not_found(standin):
+    """Missing review requests are reported as Review Board does."""
+    response = requests.get(standin.url + '/api/review-requests/1001/')
+    assert 404 == response.status_code
+    assert { 'err': { 'code': 100, 'msg': 'Object does not exist' },
+            'stat': 'fail' } == response.json()
+
+
+def test_revalidation(standin):
+    """Unchanged resources are revalidated using their ETag."""
+    cache = RevalidationCache()
+    review_requests = Root(None, standin.url,
+            revalidation = cache)().review_requests
+    first = review_requests()
+    assert first.json == review_requests().json
+    assert 1 == cache.hits
+
+
+def test_session_before_login(standin, session):
+    """The session is not authenticated before logging in."""
+    assert False == Root(session, standin.url)().session().session.authenticated
+
+
+def test_session_after_login(standin, session, standin_login):
+    """The session is authenticated after logging in."""
+    account = Root(session, standin.url)().session().session
+    assert True == account.authenticated
+    assert 'guest' == account.links.user.title
+
+
+def test_login_fail(standin, session):
+    """Logging in with the wrong password does not start a session."""
+    assert 200 == user.login(session, standin.url, 'guest', 'wrong')
+    assert 'rbsessionid' not in session.cookies
+
+
+def test_root_links(standin):
+    """Every resource linked from the Root List Resource can be fetched."""
+    root = Root(None, standin.url)()
+    for name in root.json['links']:
+        assert 'ok' == getattr(root, name)().stat
+    assert 6 == root.users().total_results
+    assert 4 == root.repositories({ 'counts-only': 'true' }).count
+
+
+def test_create_review_request(session):
+    """Created review requests are reached using their URL but not listed."""
+    with Server(Application(Dataset(count = 10))) as server:
+        review_requests = Root(session, server.url)().review_requests
+        with pytest.raises(requests.exceptions.HTTPError):
+            review_requests().create()
+        assert 200 == user.login(session, server.url, 'guest', 'guest')
+        create = review_requests().create()
+        assert 11 == create.review_request.id
+        assert False == create.review_request.public
+        assert 'guest' == create.review_request.links.submitter.title
+        assert 11 == Root(session, server.url).resolve('review_request',
+                review_request_id = 11)().review_request.id
+        assert 10 == review_requests({ 'status': 'all' }).total_results
@@ -0,0 +1,103 @@
+#-------------------------------------------------------------------------------
+# rbtlib: test_data.py
+#
+# Tests for data.py.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+from data import Dataset, timestamp
+import payload
+
+
+def test_dataset_is_deterministic():
+    """Datasets generated from the same seed are identical."""
+    assert Dataset(50).records == Dataset(50).records
+    assert Dataset(50).records != Dataset(50, seed = 1).records
+
+
+def test_dataset_time_added_is_ordered_by_id():
+    """Review requests are added in order of identifier."""
+    dataset = Dataset(200)
+    assert range(1, 201) == [ x.id for x in dataset.records ]
+    assert sorted(x.time_added for x in dataset.records) == \
+            [ x.time_added for x in dataset.records ]
+    assert all(x.time_added <= x.last_updated for x in dataset.records)
+
+
+def test_dataset_get():
+    """Review requests are found by identifier."""
+    dataset = Dataset(10)
+    assert 10 == dataset.get(10).id
+    assert None == dataset.get(0) and None == dataset.get(11)
+
+
+def test_dataset_select_matches_count():
+    """Selections are filtered like counts and most recently updated first."""
+    dataset = Dataset(500)
+    query = dict(status = 'submitted',
+            time_added_from = timestamp('2016-01-05'),
+            time_added_to = timestamp('2016-01-15'),
+            last_updated_from = timestamp('2016-01-20'))
+    selected = dataset.select(**query)
+    assert len(selected) == dataset.count(**query)
+    assert selected == sorted([ x for x in dataset.records
+        if 'submitted' == x.status
+        and '2016-01-05T00:00:00Z' <= x.time_added < '2016-01-15T00:00:00Z'
+        and '2016-01-20T00:00:00Z' <= x.last_updated ],
+        key = lambda x: (x.last_updated, x.id), reverse = True)
+    assert selected is dataset.select(**query)
+
+
+def test_dataset_status_all():
+    """Every review request has the status all."""
+    dataset = Dataset(100)
+    assert 100 == dataset.count('all')
+    assert 100 == sum(dataset.count(x) for x in ( 'pending', 'submitted',
+        'discarded' ))
+
+
+def test_review_requests_pages():
+    """Pages link to the next page, retaining the query parameters."""
+    dataset = Dataset(60)
+    query_dict = { 'status': 'all', 'max-results': '25', 'start': '25' }
+    page = payload.review_requests(dataset, 'http://localhost', query_dict)
+    assert 60 == page['total_results'] and 25 == len(page['review_requests'])
+    assert 'http://localhost/api/review-requests/?max-results=25&start=50&status=all' \
+            == page['links']['next']['href']
+    assert 'start=0' in page['links']['prev']['href']
+
+
+def test_review_requests_counts_only():
+    """Counts-only requests return the count of matching review requests."""
+    dataset = Dataset(60)
+    assert { 'count': dataset.count('pending'), 'stat': 'ok' } == \
+            payload.review_requests(dataset, 'http://localhost',
+                    { 'counts-only': '1' })
+
+
+def test_review_requests_projection():
+    """Only the requested fields and links are returned."""
+    item = payload.review_requests(Dataset(10), 'http://localhost',
+            { 'status': 'all', 'only-fields': 'id,summary',
+                'only-links': 'submitter' })['review_requests'][0]
+    assert [ 'id', 'links', 'summary' ] == sorted(item.keys())
+    assert [ 'submitter' ] == item['links'].keys()
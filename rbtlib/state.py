@@ -0,0 +1,103 @@
+#-------------------------------------------------------------------------------
+# rbtlib: state.py
+#
+# Location of the state retained between rbt invocations.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+import errno
+import json
+import os
+import tempfile
+
+
+def home():
+    """Obtain the directory containing the state.
+
+    The directory is named by the RBTLIB_HOME environment variable and
+    defaults to ~/.rbtlib. It is created, readable only by its owner, if it
+    does not exist.
+
+    Returns:
+        The directory name.
+    """
+    directory = os.path.expanduser(os.environ.get('RBTLIB_HOME', '~/.rbtlib'))
+    try:
+        os.makedirs(directory, 0700)
+    except OSError as e:
+        if errno.EEXIST != e.errno:
+            raise
+    return directory
+
+
+def path(*components):
+    """Obtain the name of a file within the state directory.
+
+    Args:
+        components: path components relative to the state directory.
+
+    Returns:
+        The file name.
+    """
+    return os.path.join(home(), *components)
+
+
+def load(file_name, default = None):
+    """Read a JSON file.
+
+    Args:
+        file_name: the file name.
+        default: the value returned if the file is missing or unreadable.
+
+    Returns:
+        The decoded file contents.
+    """
+    try:
+        with open(file_name) as f:
+            return json.load(f)
+    except (IOError, ValueError):
+        return default
+
+
+def save(file_name, value, mode = 0600):
+    """Write a JSON file atomically.
+
+    The file is written under a temporary name and renamed, so concurrent
+    readers never observe a partially written file.
+
+    Args:
+        file_name: the file name.
+        value: the value to encode.
+        mode: the file permissions.
+    """
+    directory = os.path.dirname(file_name)
+    if not os.path.isdir(directory):
+        os.makedirs(directory, 0700)
+    fd, temporary = tempfile.mkstemp(dir = directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(value, f)
+        os.chmod(temporary, mode)
+        os.rename(temporary, file_name)
+    except:
+        os.unlink(temporary)
+        raise
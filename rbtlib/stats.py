@@ -0,0 +1,202 @@
+#-------------------------------------------------------------------------------
+# rbtlib: stats.py
+#
+# Review request statistics computed using NumPy.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+import collections
+from mirror import title
+from timerange import utc_offset
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# Percentiles reported for the time taken to close review requests.
+percentiles = [ 50, 90, 99 ]
+
+
+def timestamps(values):
+    """Parse Review Board timestamps.
+
+    The date and time are parsed in bulk. Timestamps with a UTC offset are
+    converted to UTC.
+
+    Args:
+        values: a list of timestamps (e.g., 2016-05-01T12:00:00Z or
+            2016-05-01T05:00:00-07:00).
+
+    Returns:
+        A NumPy array of datetime64 values in UTC, in seconds.
+    """
+    local = numpy.array(values, dtype = 'S19').astype('datetime64[s]')
+    offsets = numpy.array([ utc_offset(x) for x in values ],
+            dtype = 'timedelta64[s]')
+    return local - offsets
+
+
+def columns(review_requests):
+    """Arrange review requests into columns.
+
+    Args:
+        review_requests: an iterable containing review requests, as returned
+            by Review Board (e.g., from the iter_items method of a raw
+            ResourceFactory or from Mirror.query).
+
+    Returns:
+        A dictionary of NumPy arrays containing the id, status, submitter,
+        time_added and last_updated of each review request.
+    """
+    values = collections.defaultdict(list)
+    for x in review_requests:
+        values['id'].append(x['id'])
+        values['status'].append(x.get('status') or '')
+        values['submitter'].append(title(x, 'submitter') or '')
+        values['time_added'].append(x['time_added'])
+        values['last_updated'].append(x['last_updated'])
+    return dict(
+            id = numpy.array(values['id'], dtype = numpy.int64),
+            status = numpy.array(values['status'], dtype = unicode),
+            submitter = numpy.array(values['submitter'], dtype = unicode),
+            time_added = timestamps(values['time_added']),
+            last_updated = timestamps(values['last_updated']))
+
+
+def hours(start, end):
+    """Compute the hours elapsed between timestamps.
+
+    Args:
+        start: a NumPy array of datetime64 values.
+        end: a NumPy array of datetime64 values.
+
+    Returns:
+        A NumPy array of floats.
+    """
+    return (end - start).astype('timedelta64[s]').astype(numpy.float64) / 3600
+
+
+def distribution(values):
+    """Summarize a distribution.
+
+    Args:
+        values: a NumPy array of floats.
+
+    Returns:
+        A dictionary containing the mean and percentiles of the values, or
+        None for each if there are no values.
+    """
+    if 0 == len(values):
+        quantiles = [ None ] * len(percentiles)
+        mean = None
+    else:
+        quantiles = [ round(x, 2) for x in numpy.percentile(values, percentiles) ]
+        mean = round(numpy.mean(values), 2)
+    result = collections.OrderedDict([ ('mean', mean) ])
+    result.update(('p{0}'.format(x), y) for x, y in zip(percentiles, quantiles))
+    return result
+
+
+def weeks(time_added):
+    """Find the week in which each review request is added.
+
+    Args:
+        time_added: a NumPy array of datetime64 values.
+
+    Returns:
+        A NumPy array containing the Monday starting each week.
+    """
+    days = time_added.astype('datetime64[D]')
+    # 1970-01-01 is a Thursday, the third day after Monday.
+    return days - (days.astype(numpy.int64) + 3) % 7
+
+
+def summarize(columns):
+    """Compute review request statistics.
+
+    The time to close is the time between a review request being added and
+    its last update, for review requests that are submitted or discarded.
+
+    Args:
+        columns: the columns returned by columns().
+
+    Returns:
+        A dictionary containing the number of review requests, the number
+        with each status, the distribution of the hours taken to close them,
+        the number added by each submitter, with the median hours to close, and
+        the number added each week.
+    """
+    closed = columns['status'] != u'pending'
+    close_hours = hours(columns['time_added'][closed],
+            columns['last_updated'][closed])
+    statuses, status_counts = numpy.unique(columns['status'],
+            return_counts = True)
+    submitters, submitter_counts = numpy.unique(columns['submitter'],
+            return_counts = True)
+    closed_submitters = columns['submitter'][closed]
+    order = numpy.argsort(closed_submitters, kind = 'mergesort')
+    names, starts = numpy.unique(closed_submitters[order], return_index = True)
+    medians = dict((x, numpy.median(y)) for x, y in zip(names,
+        numpy.split(close_hours[order], starts[1:])))
+    monday, week_counts = numpy.unique(weeks(columns['time_added']),
+            return_counts = True)
+    return collections.OrderedDict([
+        ('count', len(columns['id'])),
+        ('status', collections.OrderedDict((str(x), int(y)) for x, y in
+            zip(statuses, status_counts))),
+        ('close_hours', distribution(close_hours)),
+        ('submitters', [ collections.OrderedDict([
+            ('submitter', x),
+            ('count', int(y)),
+            ('close_hours_p50', round(medians[x], 2) if x in medians else None),
+        ]) for x, y in sorted(zip(submitters, submitter_counts),
+            key = lambda x: (-x[1], x[0])) ]),
+        ('weekly', [ collections.OrderedDict([ ('week', str(x)),
+            ('count', int(y)) ]) for x, y in zip(monday, week_counts) ]),
+    ])
+
+
+def records(summary):
+    """Flatten statistics into records.
+
+    Args:
+        summary: the statistics returned by summarize().
+
+    Returns:
+        A list of dictionaries containing a metric, key and value, suitable
+        for CSV output.
+    """
+    record = lambda metric, key, value: collections.OrderedDict([
+        ('metric', metric), ('key', key), ('value', value) ])
+    result = [ record('count', None, summary['count']) ]
+    result.extend(record('status', x, y) for x, y in
+            summary['status'].iteritems())
+    result.extend(record('close_hours', x, y) for x, y in
+            summary['close_hours'].iteritems())
+    for x in summary['submitters']:
+        result.append(record('submitter_count', x['submitter'], x['count']))
+        result.append(record('submitter_close_hours_p50', x['submitter'],
+            x['close_hours_p50']))
+    result.extend(record('weekly', x['week'], x['count']) for x in
+            summary['weekly'])
+    return result
@@ -0,0 +1,90 @@
+#-------------------------------------------------------------------------------
+# rbtlib: test_formats.py
+#
+# Tests for formats.py.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+import formats
+import json
+import StringIO
+
+
+pages = [
+    [ { 'id': 1, 'summary': u'caf\xe9', 'links': { 'submitter': { 'title': 'a' } } } ],
+    [ { 'id': 2, 'summary': 'b,c', 'links': {} } ],
+]
+
+
+class Stream(StringIO.StringIO):
+    """Record the output written before each flush."""
+
+    def __init__(self):
+        StringIO.StringIO.__init__(self)
+        self.flushed = list()
+
+    def flush(self):
+        self.flushed.append(self.getvalue())
+
+
+def test_select():
+    """Nested fields are selected using their path."""
+    record = formats.select(pages[0][0], [ 'id', 'links.submitter.title',
+        'links.repository.title' ])
+    assert [ 1, 'a', None ] == record.values()
+    assert pages[0][0] is formats.select(pages[0][0], None)
+
+
+def test_write_json():
+    """Records are written as a JSON array."""
+    stream = Stream()
+    formats.write(stream, pages, 'json')
+    assert [ 1, 2 ] == [ x['id'] for x in json.loads(stream.getvalue()) ]
+    stream = Stream()
+    formats.write(stream, [], 'json')
+    assert [] == json.loads(stream.getvalue())
+
+
+def test_write_ndjson():
+    """Records are written one per line, flushing after each page."""
+    stream = Stream()
+    formats.write(stream, pages, 'ndjson', [ 'id', 'summary' ])
+    lines = stream.getvalue().splitlines()
+    assert [ { 'id': 1, 'summary': u'caf\xe9' }, { 'id': 2, 'summary': 'b,c' } ] \
+            == [ json.loads(x) for x in lines ]
+    assert lines[0] + '\n' == stream.flushed[0]
+
+
+def test_write_csv():
+    """Records are written as rows following a header."""
+    stream = Stream()
+    formats.write(stream, pages, 'csv', [ 'id', 'summary',
+        'links.submitter.title' ])
+    assert [ 'id,summary,links.submitter.title', '1,caf\xc3\xa9,a', '2,"b,c",' ] \
+            == stream.getvalue().splitlines()
+
+
+def test_write_csv_every_field():
+    """Without fields, the columns are the fields of the first record."""
+    stream = Stream()
+    formats.write(stream, pages[1:], 'csv')
+    assert [ 'id,links,summary', '2,{},"b,c"' ] == stream.getvalue().splitlines()
@@ -0,0 +1,81 @@
+#-------------------------------------------------------------------------------
+# rbtlib: test_hosts.py
+#
+# Tests for hosts.py.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+import collections
+from conftest import recorded_url
+from hosts import HostTable
+import pytest
+import rbt
+
+
+@pytest.fixture
+def hosts(tmpdir):
+    """Construct a host table."""
+    return HostTable(str(tmpdir.join('hosts.json')))
+
+
+def test_hosts_remember(hosts):
+    """Recorded schemes are available to other host tables."""
+    hosts.remember('reviews.example.com', 'https')
+    assert 'https' == HostTable(hosts.path).lookup('reviews.example.com')
+    assert None == hosts.lookup('demo.example.com')
+
+
+def test_hosts_expire(tmpdir):
+    """Expired entries are ignored."""
+    hosts = HostTable(str(tmpdir.join('hosts.json')), ttl = 0)
+    hosts.remember('reviews.example.com', 'https')
+    assert None == hosts.lookup('reviews.example.com')
+
+
+def test_hosts_forget(hosts):
+    """Forgotten entries are discarded."""
+    hosts.remember('reviews.example.com', 'https')
+    hosts.forget('reviews.example.com')
+    assert None == hosts.lookup('reviews.example.com')
+
+
+@pytest.fixture
+def context(recorded_session, hosts):
+    """Mock-up of the Click context using a host table."""
+    ctx = collections.namedtuple('ctx', 'obj')
+    return ctx(dict(session = recorded_session, hosts = hosts))
+
+
+def test_canonify_url_remembers_scheme(context, recorded_session):
+    """Only the first URL without a scheme requires a probe."""
+    fqdn = recorded_url.split('://')[1]
+    assert recorded_url == rbt.canonify_url(context, fqdn)
+    assert recorded_url == rbt.canonify_url(context, fqdn)
+    assert 1 == len(recorded_session.requests)
+    assert 'https' == context.obj['hosts'].lookup(fqdn)
+
+
+def test_root_list_reuses_probe(context, recorded_session):
+    """The probe response provides the Root List Resource."""
+    url = rbt.canonify_url(context, recorded_url.split('://')[1])
+    assert 'ok' == rbt.root_list(context, url).stat
+    assert 1 == len(recorded_session.requests)
@@ -0,0 +1,209 @@
+#-------------------------------------------------------------------------------
+# rbtlib: test_mirror.py
+#
+# Tests for mirror.py.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+from conftest import recorded_url, review_request, review_request_history
+import mirror as mirror_module
+from mirror import FullTextUnavailable, Mirror
+import pytest
+from resource import ResourceFactory
+
+
+@pytest.fixture
+def history():
+    """Provide the review requests on the server."""
+    return [ review_request(i, last_updated = '2016-01-0{0}T00:00:00Z'.format(i))
+            for i in range(1, 6) ]
+
+
+@pytest.fixture
+def review_requests(recorded_session, history):
+    """Provide the Review Request List Resource."""
+    href = recorded_url + '/api/review-requests/'
+    recorded_session.add('GET', href, review_request_history(history),
+            'application/vnd.reviewboard.org.review-requests+json')
+    return ResourceFactory(recorded_session, 'review_requests', href, 'GET',
+            raw = True)
+
+
+@pytest.fixture
+def mirror(tmpdir):
+    """Provide an empty mirror."""
+    mirror = Mirror(str(tmpdir.join('mirror.sqlite')))
+    yield mirror
+    mirror.close()
+
+
+def test_sync(mirror, review_requests):
+    """Every review request is stored by the first sync."""
+    result = mirror.sync(review_requests, max_results = 2)
+    assert (5, 0, '2016-01-05T00:00:00Z') == result
+    assert 5 == len(mirror)
+    assert 'Review request 3' == mirror.get(3)['summary']
+
+
+def test_sync_requests_updates_only(mirror, review_requests, history,
+        recorded_session):
+    """Later syncs request review requests updated since the watermark."""
+    mirror.sync(review_requests)
+    history[1].update(status = 'submitted', last_updated = '2016-02-01T00:00:00Z')
+    history.append(review_request(6, last_updated = '2016-02-02T00:00:00Z'))
+    del recorded_session.requests[:]
+    result = mirror.sync(review_requests, prune = False)
+    assert (3, 0, '2016-02-02T00:00:00Z') == result # 5 is at the watermark
+    assert '2016-01-05T00:00:00Z' == recorded_session.requests[0][2]['last-updated-from']
+    assert 'all' == recorded_session.requests[0][2]['status']
+    assert 'submitted' == mirror.get(2)['status']
+    assert 6 == len(mirror)
+
+
+def test_sync_prunes_deleted(mirror, review_requests, history,
+        recorded_session):
+    """Review requests deleted from the server are deleted."""
+    mirror.sync(review_requests)
+    del history[0]
+    recorded_session.add('GET', review_requests.url + '1/', { 'stat': 'fail',
+        'err': { 'code': 100, 'msg': 'Object does not exist' } },
+        'application/json', 404)
+    assert 1 == mirror.sync(review_requests).deleted
+    assert None == mirror.get(1)
+    assert 4 == len(mirror)
+
+
+def test_sync_keeps_review_requests_missing_from_listing(mirror,
+        review_requests, history, recorded_session):
+    """Review requests skipped by the listing but still on the server are kept.
+    """
+    mirror.sync(review_requests)
+    skipped = history.pop(1)
+    recorded_session.add('GET', review_requests.url + '2/', { 'stat': 'ok',
+        'review_request': skipped },
+        'application/vnd.reviewboard.org.review-request+json')
+    assert 0 == mirror.sync(review_requests).deleted
+    assert 5 == len(mirror)
+
+
+def test_sync_keeps_watermark_when_items_are_skipped(mirror, history,
+        recorded_session):
+    """Review requests skipped by a deletion during a sync are not lost."""
+    page = review_request_history(history)
+    def delete_during_sync(query_dict):
+        if 0 < int(query_dict.get('start', 0)):
+            history[:] = [ x for x in history if 5 != x['id'] ]
+        return page(query_dict)
+    href = recorded_url + '/api/review-requests/'
+    recorded_session.add('GET', href, delete_during_sync,
+            'application/vnd.reviewboard.org.review-requests+json')
+    review_requests = ResourceFactory(recorded_session, 'review_requests',
+            href, 'GET', raw = True)
+    assert (4, 0, None) == mirror.sync(review_requests, prune = False,
+            max_results = 2) # 3 moved to the first page
+    assert None == mirror.get(3)
+    assert (4, 0, '2016-01-04T00:00:00Z') == mirror.sync(review_requests,
+            prune = False, max_results = 2)
+    assert 'Review request 3' == mirror.get(3)['summary']
+
+
+def test_sync_rejects_other_servers(mirror, review_requests, recorded_session):
+    """A mirror contains the review requests of one server."""
+    mirror.sync(review_requests)
+    other = ResourceFactory(recorded_session, 'review_requests',
+            'https://other.example.com/api/review-requests/', 'GET')
+    with pytest.raises(ValueError):
+        mirror.sync(other)
+
+
+@pytest.fixture
+def indexed(mirror):
+    """Provide a mirror containing review requests to query."""
+    mirror.store([
+        review_request(1, summary = 'Fix crash on login', submitter = 'alice',
+            time_added = '2016-01-01T00:00:00Z'),
+        review_request(2, summary = 'Add login page', status = 'submitted',
+            submitter = 'bob', time_added = '2016-02-01T00:00:00Z'),
+        review_request(3, summary = 'Speed up exports', repository = 'rbt',
+            description = 'Avoids crashing exports.', submitter = 'alice',
+            time_added = '2016-03-01T00:00:00Z'),
+    ])
+    return mirror
+
+
+def ids(review_requests):
+    return [ x['id'] for x in review_requests ]
+
+
+def test_query_filters(indexed):
+    """Review requests are filtered by their attributes."""
+    assert [ 3, 2, 1 ] == ids(indexed.query())
+    assert [ 2 ] == ids(indexed.query(status = 'submitted'))
+    assert [ 3, 1 ] == ids(indexed.query(submitter = 'alice'))
+    assert [ 3 ] == ids(indexed.query(repository = 'rbt'))
+    assert [ 2 ] == ids(indexed.query(time_added_from = '2016-02-01',
+        time_added_to = '2016-03-01'))
+    assert [ 3 ] == ids(indexed.query(limit = 1))
+
+
+def test_query_text(indexed):
+    """Review requests are found by the words they contain."""
+    assert [ 1, 3 ] == sorted(ids(indexed.query('crash')))
+    assert [ 1 ] == ids(indexed.query('summary:crash'))
+    assert [ 1 ] == ids(indexed.query('login', status = 'pending'))
+
+
+def test_query_index_is_updated(indexed):
+    """The index follows review requests as they are replaced and deleted."""
+    indexed.store([ review_request(1, summary = 'Fix hang on logout') ])
+    assert [ 3 ] == ids(indexed.query('crash'))
+    assert [ 1 ] == ids(indexed.query('hang'))
+    indexed.prune([ 2, 3 ])
+    assert [] == ids(indexed.query('hang'))
+
+
+def test_query_index_is_built(tmpdir):
+    """Review requests stored before the index existed are indexed."""
+    path = str(tmpdir.join('mirror.sqlite'))
+    mirror = Mirror(path)
+    mirror.store([ review_request(1, summary = 'Fix crash') ])
+    mirror._connection.execute('DROP TABLE review_requests_text')
+    mirror.close()
+    assert [ 1 ] == ids(Mirror(path).query('crash'))
+
+
+def test_mirror_without_full_text(monkeypatch, tmpdir):
+    """Mirrors are kept without full-text search when SQLite lacks it."""
+    path = str(tmpdir.join('mirror.sqlite'))
+    Mirror(path).close()
+    monkeypatch.setattr(mirror_module, 'full_text_supported', lambda x: False)
+    mirror = Mirror(path)
+    mirror.store([ review_request(1, summary = 'Fix crash on login') ])
+    assert False == mirror.full_text
+    assert [ 1 ] == ids(mirror.query(status = 'pending'))
+    with pytest.raises(FullTextUnavailable):
+        mirror.query('crash')
+    mirror.close()
+    monkeypatch.undo()
+    mirror = Mirror(path)
+    assert [ 1 ] == ids(mirror.query('crash'))
+    mirror.close()
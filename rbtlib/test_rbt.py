@@ -26,8 +26,12 @@
 #-------------------------------------------------------------------------------
 from click.testing import CliRunner
 import collections
+from conftest import recorded_url, review_request, review_request_history
+import json
+from mirror import Mirror
 import pytest
 import rbt
+from rbtlib.standin import Application, Dataset, Server
 import requests
 
 
@@ -108,3 +112,139 @@ def test_rbt_with_subcommand_url_wrong_position(context, subcommand, server):
     result = runner.invoke(rbt.rbt, args, obj = dict())
     assert result.output == 'Usage: rbt [OPTIONS] COMMAND [ARGS]...\n\nError: No such command "{}".\n'.format(server.fqdn)
     assert 0 != result.exit_code
+
+
+@pytest.fixture
+def recorded_rbt(monkeypatch, recorded_session):
+    """Make rbt commands use the recorded session.
+
+    Returns:
+        The recorded session.
+    """
+    monkeypatch.setattr(rbt.connection, 'session',
+            lambda **kwargs: recorded_session)
+    return recorded_session
+
+
+@pytest.mark.parametrize('error', [ requests.exceptions.ConnectionError,
+    rbt.BadContentType, ValueError ])
+def test_authenticate_without_token(monkeypatch, context, error):
+    """The session is used whenever an API token cannot be created."""
+    def create_token(session, url):
+        raise error('cannot create token')
+    monkeypatch.setattr(rbt, 'login', lambda *args: 200)
+    monkeypatch.setattr(rbt.user, 'create_token', create_token)
+    assert True == rbt.authenticate(context, recorded_url,
+            dict(username = 'admin', password = 'secret'))
+    assert None == rbt.state.load(rbt.user.token_file(recorded_url))
+
+
+def test_post_with_saved_session(tmpdir, session):
+    """Saved sessions are restored before the Root List Resource is fetched."""
+    patch = tmpdir.join('patch')
+    patch.write('diff')
+    application = Application(Dataset(count = 10), anonymous = False)
+    with Server(application) as server:
+        assert 200 == rbt.user.login(session, server.url, 'guest', 'guest')
+        rbt.user.save_session(session, server.url)
+        result = CliRunner().invoke(rbt.rbt, [ 'post', server.url,
+            str(patch) ], obj = {})
+    assert 0 == result.exit_code
+    assert 'posted review 11\n' == result.output
+
+
+@pytest.mark.parametrize('subcommand', [ 'root', 'review-requests' ])
+def test_saved_token(session, subcommand):
+    """Every command authenticates using the saved API token."""
+    application = Application(Dataset(count = 10), anonymous = False)
+    with Server(application) as server:
+        assert 200 == rbt.user.login(session, server.url, 'guest', 'guest')
+        rbt.user.save_token(server.url,
+                rbt.user.create_token(session, server.url))
+        result = CliRunner().invoke(rbt.rbt, [ subcommand, server.url ],
+                obj = {})
+    assert 0 == result.exit_code
+    assert 'ok' == json.loads(result.output)['stat']
+
+
+def test_review_requests_ndjson(recorded_rbt, review_requests_session):
+    """Ensure every review request is printed on its own line."""
+    result = CliRunner().invoke(rbt.rbt, [ 'review-requests', '--all',
+        '--format', 'ndjson', '--fields', 'id', 'reviews.example.com' ],
+        obj = {})
+    assert 0 == result.exit_code
+    assert [ { 'id': x } for x in range(60) ] == [ json.loads(x) for x in
+            result.output.splitlines() ]
+
+
+def test_sync(tmpdir, recorded_rbt):
+    """Ensure review requests are mirrored."""
+    recorded_rbt.add('GET', recorded_url + '/api/review-requests/',
+            review_request_history([ review_request(1), review_request(2) ]),
+            'application/vnd.reviewboard.org.review-requests+json')
+    db = str(tmpdir.join('mirror.sqlite'))
+    result = CliRunner().invoke(rbt.rbt, [ 'sync', '--db', db,
+        'reviews.example.com' ], obj = {})
+    assert 0 == result.exit_code
+    assert 2 == len(Mirror(db))
+
+
+def test_query(tmpdir):
+    """Ensure review requests are found in the mirror."""
+    db = str(tmpdir.join('mirror.sqlite'))
+    mirror = Mirror(db)
+    mirror.store([ review_request(1, summary = 'Fix crash'),
+        review_request(2, summary = 'Add page') ])
+    mirror.close()
+    result = CliRunner().invoke(rbt.rbt, [ 'query', '--db', db, '--format',
+        'csv', '--fields', 'id,summary', 'crash' ], obj = {})
+    assert 0 == result.exit_code
+    assert [ 'id,summary', '1,Fix crash' ] == result.output.splitlines()
+    result = CliRunner().invoke(rbt.rbt, [ 'query', '--db', db, 'AND' ],
+            obj = {})
+    assert 2 == result.exit_code
+
+
+def test_stats(recorded_rbt):
+    """Ensure statistics are computed from the review requests."""
+    pytest.importorskip('numpy')
+    recorded_rbt.add('GET', recorded_url + '/api/review-requests/',
+            review_request_history([ review_request(1),
+                review_request(2, time_added = '2016-02-01T00:00:00Z') ]),
+            'application/vnd.reviewboard.org.review-requests+json')
+    result = CliRunner().invoke(rbt.rbt, [ 'stats', '--time-added-from',
+        '2016-02-01', 'reviews.example.com' ], obj = {})
+    assert 0 == result.exit_code
+    assert 1 == json.loads(result.output)['count']
+
+
+def test_review_requests_bucket(recorded_rbt):
+    """Ensure review requests are counted in each bucket."""
+    recorded_rbt.add('GET', recorded_url + '/api/review-requests/',
+            review_request_history([ review_request(1,
+                time_added = '2016-01-05T00:00:00') ]),
+            'application/vnd.reviewboard.org.review-requests+json')
+    result = CliRunner().invoke(rbt.rbt, [ 'review-requests', '--bucket',
+        'week', '--time-added-from', '2016-01-01', '--time-added-to',
+        '2016-01-11', '--format', 'csv', 'reviews.example.com' ], obj = {})
+    assert 0 == result.exit_code
+    assert [ 'from,to,count', '2016-01-01T00:00:00,2016-01-04T00:00:00,0',
+        '2016-01-04T00:00:00,2016-01-11T00:00:00,1' ] == result.output.splitlines()
+    result = CliRunner().invoke(rbt.rbt, [ 'review-requests', '--bucket',
+        'week', 'reviews.example.com' ], obj = {})
+    assert 2 == result.exit_code
+
+
+def test_review_requests_shard(recorded_rbt):
+    """Ensure every review request is printed once when sharding."""
+    recorded_rbt.add('GET', recorded_url + '/api/review-requests/',
+            review_request_history([ review_request(x,
+                time_added = '2016-01-{0:02}T00:00:00'.format(x))
+                for x in range(1, 11) ]),
+            'application/vnd.reviewboard.org.review-requests+json')
+    result = CliRunner().invoke(rbt.rbt, [ 'review-requests', '--shard',
+        'auto', '--shard-size', '3', '--format', 'ndjson', '--fields', 'id',
+        '--time-added-from', '2016-01-01', 'reviews.example.com' ], obj = {})
+    assert 0 == result.exit_code
+    assert range(1, 11) == sorted(json.loads(x)['id'] for x in
+            result.output.splitlines())
@@ -24,6 +24,7 @@
 # FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
 # IN THE SOFTWARE.
 #-------------------------------------------------------------------------------
+from conftest import recorded_url
 import pytest
 from root import Root
 
@@ -152,3 +153,39 @@ def test_review_request_create(login, root, root_query):
     review_requests = root(root_query).review_requests()
     create = review_requests.create()
     assert 'ok' == create.stat and 0 <= create.review_request.id
+
+
+def test_root_resolve(recorded_session):
+    """Confirm URI templates reach a resource using a single request."""
+    href = recorded_url + '/api/review-requests/12345/'
+    recorded_session.add('GET', href, {
+        'stat': 'ok',
+        'review_request': { 'id': 12345, 'summary': 'Fix' },
+    }, 'application/vnd.reviewboard.org.review-request+json')
+    root = Root(recorded_session, recorded_url)
+    review_request = root.resolve('review_request', review_request_id = 12345)
+    assert href == review_request.url
+    assert 12345 == review_request().review_request.id
+    root.resolve('review_request', review_request_id = 12345)()
+    assert [ recorded_url + '/api/', href, href ] == [ x[1] for x in
+            recorded_session.requests ]
+
+
+def test_root_resolve_without_content_type(recorded_session):
+    """Confirm templates without a known content type can be called."""
+    href = recorded_url + '/api/users/admin/'
+    recorded_session.add('GET', href, {
+        'stat': 'ok',
+        'user': { 'id': 1, 'username': 'admin' },
+    }, 'application/vnd.reviewboard.org.user+json')
+    root = Root(recorded_session, recorded_url)
+    assert 'admin' == root.resolve('user', username = 'admin')().user.username
+
+
+def test_root_resolve_unknown(recorded_session):
+    """Confirm unknown URI templates and missing values are rejected."""
+    root = Root(recorded_session, recorded_url)
+    with pytest.raises(KeyError):
+        root.resolve('diff')
+    with pytest.raises(KeyError):
+        root.resolve('review_request')
@@ -0,0 +1,92 @@
+#-------------------------------------------------------------------------------
+# rbtlib: test_stats.py
+#
+# Tests for stats.py.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+from conftest import review_request
+import pytest
+import stats
+
+numpy = pytest.importorskip('numpy')
+
+
+review_requests = [
+    review_request(1, submitter = 'alice', status = 'submitted',
+        time_added = '2016-01-04T00:00:00Z', last_updated = '2016-01-04T10:00:00Z'),
+    review_request(2, submitter = 'alice', status = 'discarded',
+        time_added = '2016-01-10T12:00:00Z', last_updated = '2016-01-11T08:00:00Z'),
+    review_request(3, submitter = 'bob', status = 'pending',
+        time_added = '2016-01-11T00:00:00Z'),
+]
+
+
+def test_columns():
+    """Review requests are arranged into typed columns."""
+    columns = stats.columns(review_requests)
+    assert [ 1, 2, 3 ] == columns['id'].tolist()
+    assert [ u'alice', u'alice', u'bob' ] == columns['submitter'].tolist()
+    assert numpy.datetime64('2016-01-04T10:00:00') == columns['last_updated'][0]
+
+
+def test_timestamps_with_utc_offset():
+    """Timestamps with a UTC offset are converted to UTC."""
+    assert [ numpy.datetime64('2016-05-01T12:00:00') ] * 4 == \
+            stats.timestamps([ '2016-05-01T12:00:00Z',
+                '2016-05-01T05:00:00-07:00', '2016-05-01T17:30:00.250+0530',
+                '2016-05-01T12:00:00' ]).tolist()
+
+
+def test_weeks():
+    """Weeks start on Monday."""
+    assert [ '2016-01-04', '2016-01-04', '2016-01-11' ] == [ str(x) for x in
+            stats.weeks(stats.columns(review_requests)['time_added']) ]
+
+
+def test_summarize():
+    """Statistics are computed for each group."""
+    summary = stats.summarize(stats.columns(review_requests))
+    assert 3 == summary['count']
+    assert { 'discarded': 1, 'pending': 1, 'submitted': 1 } == summary['status']
+    assert 15.0 == summary['close_hours']['mean']
+    assert 15.0 == summary['close_hours']['p50']
+    assert [ ('alice', 2, 15.0), ('bob', 1, None) ] == [ tuple(x.values())
+            for x in summary['submitters'] ]
+    assert [ ('2016-01-04', 2), ('2016-01-11', 1) ] == [ tuple(x.values())
+            for x in summary['weekly'] ]
+
+
+def test_summarize_nothing():
+    """Statistics are computed without review requests."""
+    summary = stats.summarize(stats.columns([]))
+    assert 0 == summary['count']
+    assert None == summary['close_hours']['p50']
+    assert [ 'count' ] + [ 'close_hours' ] * 4 == [ x['metric'] for x in
+            stats.records(summary) ]
+
+
+def test_records():
+    """Statistics are flattened into metric, key and value records."""
+    records = stats.records(stats.summarize(stats.columns(review_requests)))
+    assert ('count', None, 3) == tuple(records[0].values())
+    assert ('weekly', '2016-01-11', 1) == tuple(records[-1].values())
@@ -0,0 +1,136 @@
+#-------------------------------------------------------------------------------
+# rbtlib: test_timerange.py
+#
+# Tests for timerange.py.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+from conftest import recorded_url, review_request, review_request_history
+from datetime import datetime
+import pytest
+from resource import ResourceFactory
+import timerange
+
+
+def test_parse():
+    """Dates and times are accepted in the formats Review Board accepts."""
+    assert datetime(2016, 1, 2) == timerange.parse('2016-01-02')
+    assert datetime(2016, 1, 2, 3, 4, 5) == timerange.parse('2016-01-02 03:04:05')
+    assert datetime(2016, 1, 2, 3, 4, 5) == timerange.parse('2016-01-02T03:04:05Z')
+    with pytest.raises(ValueError):
+        timerange.parse('yesterday')
+
+
+def test_parse_with_utc_offset():
+    """Dates and times with a UTC offset are converted to UTC."""
+    assert datetime(2016, 1, 1, 7) == timerange.parse('2016-01-01T00:00:00-07:00')
+    assert datetime(2015, 12, 31, 18, 30) == \
+            timerange.parse('2016-01-01 00:00:00+0530')
+    with pytest.raises(ValueError):
+        timerange.parse('2016-01-01T00:00:00-xx')
+
+
+@pytest.mark.parametrize('size,boundaries', [
+    ('day', [ '2016-01-30T12:00:00', '2016-01-31T00:00:00',
+        '2016-02-01T00:00:00', '2016-02-01T06:00:00' ]),
+    ('week', [ '2016-01-30T12:00:00', '2016-02-01T00:00:00',
+        '2016-02-01T06:00:00' ]),
+    ('month', [ '2016-01-30T12:00:00', '2016-02-01T00:00:00',
+        '2016-02-01T06:00:00' ]),
+])
+def test_buckets(size, boundaries):
+    """Buckets are aligned on days, Mondays and months."""
+    buckets = timerange.buckets(datetime(2016, 1, 30, 12),
+            datetime(2016, 2, 1, 6), size)
+    assert zip(boundaries, boundaries[1:]) == [ (timerange.isoformat(x),
+        timerange.isoformat(y)) for x, y in buckets ]
+
+
+def test_buckets_across_years():
+    """Months roll over into the next year."""
+    assert [ datetime(2016, 12, 1), datetime(2017, 1, 1) ] == [ x for x, y in
+            timerange.buckets(datetime(2016, 12, 1), datetime(2017, 2, 1),
+                'month') ]
+
+
+def test_histogram(recorded_session):
+    """Review requests are counted in each bucket."""
+    href = recorded_url + '/api/review-requests/'
+    recorded_session.add('GET', href, review_request_history([
+        review_request(x, time_added = '2016-01-0{0}T12:00:00'.format(x))
+        for x in [ 1, 1, 3 ] ]), 'application/vnd.reviewboard.org.review-requests+json')
+    review_requests = ResourceFactory(recorded_session, 'review_requests',
+            href, 'GET')
+    histogram = timerange.histogram(review_requests, datetime(2016, 1, 1),
+            datetime(2016, 1, 4), 'day', { 'status': 'all' }, jobs = 3)
+    assert [ 2, 0, 1 ] == [ x[2] for x in histogram ]
+    assert all('all' == x[2]['status'] and x[2]['counts-only'] for x in
+            recorded_session.requests)
+
+
+@pytest.fixture
+def history(recorded_session):
+    """Provide a Review Request List Resource of review requests added daily."""
+    href = recorded_url + '/api/review-requests/'
+    recorded_session.add('GET', href, review_request_history([
+        review_request(x, time_added = '2016-01-{0:02}T12:00:00'.format(x))
+        for x in range(1, 31) ]),
+        'application/vnd.reviewboard.org.review-requests+json')
+    return ResourceFactory(recorded_session, 'review_requests', href, 'GET',
+            raw = True)
+
+
+def test_plan(history):
+    """Shards hold at most the requested number of review requests."""
+    shards = timerange.plan(history, datetime(1970, 1, 1),
+            datetime(2017, 1, 1), size = 4)
+    assert all(0 < x[2] <= 4 for x in shards)
+    assert 30 == sum(x[2] for x in shards)
+    assert shards == sorted(shards)
+
+
+def test_iter_shards(history):
+    """Every review request is obtained once, in order of time added."""
+    items = [ x['id'] for shard in timerange.iter_shards(history,
+        datetime(2016, 1, 1), datetime(2016, 2, 1), size = 7, jobs = 4)
+        for x in shard ]
+    assert range(1, 31) == sorted(items)
+    assert len(items) == len(set(items))
+
+
+def test_iter_shards_with_only_fields(history):
+    """Review requests are told apart when only-fields leaves out the id."""
+    shards = timerange.iter_shards(history, datetime(2016, 1, 1),
+            datetime(2016, 2, 1), { 'only-fields': 'summary' }, size = 7,
+            jobs = 4)
+    items = [ x for shard in shards for x in shard ]
+    assert 30 == len(items)
+    assert all([ 'summary' ] == x.keys() for x in items)
+
+
+def test_iter_shards_removes_duplicates(history, monkeypatch):
+    """Review requests in more than one shard are obtained once."""
+    monkeypatch.setattr(timerange, 'plan', lambda *args: [
+        (datetime(2016, 1, 1), datetime(2016, 1, 10), 9),
+        (datetime(2016, 1, 5), datetime(2016, 1, 20), 15) ])
+    shards = list(timerange.iter_shards(history, None, None))
+    assert [ 9, 10 ] == [ len(x) for x in shards ]
@@ -0,0 +1,111 @@
+#-------------------------------------------------------------------------------
+# rbtlib: test_user.py
+#
+# Tests for user.py.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+import os
+import pytest
+import requests
+import stat
+import time
+import user
+
+
+url = 'https://reviews.example.com'
+
+
+@pytest.fixture(autouse = True)
+def home(monkeypatch, tmpdir):
+    """Keep saved sessions in a temporary directory."""
+    monkeypatch.setenv('RBTLIB_HOME', str(tmpdir))
+    return tmpdir
+
+
+def test_save_session_is_private():
+    """Saved sessions are readable only by their owner."""
+    session = requests.Session()
+    session.cookies.set('rbsessionid', 'secret', domain = 'reviews.example.com')
+    user.save_session(session, url)
+    assert 0600 == stat.S_IMODE(os.stat(user.session_file(url)).st_mode)
+
+
+def test_load_session():
+    """Saved cookies are restored into a new session."""
+    session = requests.Session()
+    session.cookies.set('rbsessionid', 'secret', domain = 'reviews.example.com')
+    user.save_session(session, url)
+    session = requests.Session()
+    assert user.load_session(session, url)
+    assert 'secret' == session.cookies['rbsessionid']
+
+
+def test_load_session_skips_expired_cookies():
+    """Expired cookies are not restored."""
+    session = requests.Session()
+    session.cookies.set('rbsessionid', 'secret', expires = int(time.time()) - 1)
+    user.save_session(session, url)
+    assert False == user.load_session(requests.Session(), url)
+
+
+def test_load_session_per_server():
+    """Sessions are saved separately for each server."""
+    assert False == user.load_session(requests.Session(), 'http://demo.example.com')
+
+
+def test_token_login():
+    """Token authentication applies to every request made by the session."""
+    session = requests.Session()
+    user.token_login(session, 'secret')
+    assert 'token secret' == session.headers['Authorization']
+    user.token_logout(session)
+    assert 'Authorization' not in session.headers
+
+
+def test_load_token():
+    """Saved tokens authenticate a new session."""
+    user.save_token(url, 'secret')
+    assert 0600 == stat.S_IMODE(os.stat(user.token_file(url)).st_mode)
+    session = requests.Session()
+    assert user.load_token(session, url)
+    assert 'token secret' == session.headers['Authorization']
+    assert False == user.load_token(requests.Session(), 'http://demo.example.com')
+
+
+def test_create_token(recorded_session):
+    """Tokens are created for the user owning the session."""
+    api = url + '/api/'
+    recorded_session.add('GET', api + 'session/', {
+        'stat': 'ok',
+        'session': {
+            'authenticated': True,
+            'links': { 'user': { 'href': api + 'users/admin/', 'method': 'GET' } },
+        },
+    }, 'application/vnd.reviewboard.org.session+json')
+    recorded_session.add('POST', api + 'users/admin/api-tokens/', {
+        'stat': 'ok',
+        'api_token': { 'id': 1, 'note': 'rbt', 'token': 'secret' },
+    }, 'application/vnd.reviewboard.org.api-token+json', 201)
+    assert 'secret' == user.create_token(recorded_session, url)
+    assert ('POST', api + 'users/admin/api-tokens/', dict(note = 'rbt')) \
+            == recorded_session.requests[-1][:3]
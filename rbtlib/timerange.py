@@ -0,0 +1,283 @@
+#-------------------------------------------------------------------------------
+# rbtlib: timerange.py
+#
+# Divide time ranges into buckets for review request queries.
+#-------------------------------------------------------------------------------
+# The MIT License (MIT)
+# Copyright (c) 2016 Brian Minard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#-------------------------------------------------------------------------------
+import datetime
+from resource import pool
+
+
+# Formats accepted for dates and times, which are in UTC.
+input_formats = [ '%Y-%m-%dT%H:%M:%SZ', '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%d %H:%M:%S', '%Y-%m-%d' ]
+
+
+# Bucket sizes accepted by buckets.
+sizes = [ 'day', 'week', 'month' ]
+
+
+def utc_offset(value):
+    """Find the UTC offset of a Review Board timestamp.
+
+    Args:
+        value: a timestamp (e.g., 2016-05-01T12:00:00Z,
+            2016-05-01T12:00:00.123-07:00 or 2016-05-01T12:00:00+0530).
+
+    Returns:
+        The offset from UTC, in seconds.
+    """
+    suffix = value[19:].lstrip('.0123456789')
+    if suffix in ( '', 'Z' ):
+        return 0
+    digits = suffix[1:].replace(':', '')
+    offset = int(digits[:2]) * 3600 + int(digits[2:4] or 0) * 60
+    return -offset if '-' == suffix[0] else offset
+
+
+def parse(value):
+    """Parse a date and time.
+
+    A date and time with a UTC offset is converted to UTC.
+
+    Args:
+        value: a date and time in one of input_formats, in UTC unless a UTC
+            offset is appended (e.g., 2016-01-01, 2016-01-01T12:00:00 or
+            2016-01-01T12:00:00-07:00).
+
+    Returns:
+        A datetime in UTC.
+
+    Raises:
+        ValueError: the value is not in a supported format.
+    """
+    if value[19:].lstrip('.0123456789')[:1] in ( '+', '-' ):
+        try:
+            offset = utc_offset(value)
+        except ValueError:
+            raise ValueError('unsupported date/time: {0}'.format(value))
+        return parse(value[:19]) - datetime.timedelta(seconds = offset)
+    for input_format in input_formats:
+        try:
+            return datetime.datetime.strptime(value, input_format)
+        except ValueError:
+            pass
+    raise ValueError('unsupported date/time: {0}'.format(value))
+
+
+def isoformat(value):
+    """Format a date and time for use in Review Board queries.
+
+    Args:
+        value: a datetime.
+
+    Returns:
+        The date and time in ISO 8601 format (e.g., 2016-01-01T12:00:00).
+    """
+    return value.strftime('%Y-%m-%dT%H:%M:%S')
+
+
+def next_boundary(value, size):
+    """Find the start of the bucket following the one containing a time.
+
+    Days start at midnight, weeks on Monday and months on the first.
+
+    Args:
+        value: a datetime.
+        size: day, week or month.
+
+    Returns:
+        A datetime.
+    """
+    day = datetime.datetime(value.year, value.month, value.day)
+    if 'day' == size:
+        return day + datetime.timedelta(days = 1)
+    if 'week' == size:
+        return day + datetime.timedelta(days = 7 - day.weekday())
+    if 12 == value.month:
+        return datetime.datetime(value.year + 1, 1, 1)
+    return datetime.datetime(value.year, value.month + 1, 1)
+
+
+def buckets(start, end, size):
+    """Divide a time range into buckets.
+
+    The first and last buckets are shortened to fit the range.
+
+    Args:
+        start: the datetime starting the range.
+        end: the datetime ending the range, which it excludes.
+        size: day, week or month.
+
+    Returns:
+        A list of tuples containing the datetimes starting and ending each
+        bucket.
+    """
+    result = list()
+    while start < end:
+        boundary = min(end, next_boundary(start, size))
+        result.append((start, boundary))
+        start = boundary
+    return result
+
+
+def count(review_requests, query_dict, start, end):
+    """Count the review requests added in a time range.
+
+    Args:
+        review_requests: the Review Request List Resource (a
+            ResourceFactory).
+        query_dict: a dictionary containing other HTTP command parameters.
+        start: the datetime starting the range.
+        end: the datetime ending the range, which it excludes.
+
+    Returns:
+        The number of review requests.
+    """
+    query_dict = dict(query_dict, **{ 'counts-only': 1,
+        'time-added-from': isoformat(start), 'time-added-to': isoformat(end) })
+    return review_requests(query_dict).json['count']
+
+
+def histogram(review_requests, start, end, size, query_dict = dict(),
+        jobs = 8):
+    """Count the review requests added in each bucket of a time range.
+
+    Each bucket is counted by a counts-only request. The requests are made
+    concurrently.
+
+    Args:
+        review_requests: the Review Request List Resource (a
+            ResourceFactory).
+        start: the datetime starting the range.
+        end: the datetime ending the range, which it excludes.
+        size: day, week or month.
+        query_dict: a dictionary containing other HTTP command parameters
+            (e.g., status).
+        jobs: the maximum number of requests made concurrently.
+
+    Returns:
+        A list of tuples containing the datetimes starting and ending each
+        bucket and the number of review requests added in it.
+    """
+    ranges = buckets(start, end, size)
+    counts = pool.ordered(lambda x: count(review_requests, query_dict, *x),
+            ranges, jobs)
+    return [ x + (y,) for x, y in zip(ranges, counts) ]
+
+
+def plan(review_requests, start, end, query_dict = dict(), size = 1000,
+        jobs = 8):
+    """Divide a time range into shards holding about the same number of items.
+
+    Ranges holding more than size review requests are divided into equal
+    parts, as many as required were the review requests added at a constant
+    rate. Each part is counted again, and divided again if required, until
+    every shard holds at most size review requests or lasts one second. The
+    counts-only requests made at each step are made concurrently.
+
+    Args:
+        review_requests: the Review Request List Resource (a
+            ResourceFactory).
+        start: the datetime starting the range.
+        end: the datetime ending the range, which it excludes.
+        query_dict: a dictionary containing other HTTP command parameters
+            (e.g., status).
+        size: the number of review requests each shard should hold.
+        jobs: the maximum number of requests made concurrently.
+
+    Returns:
+        A list of tuples containing the datetimes starting and ending each
+        shard and the number of review requests added in it, in order. Shards
+        without review requests are omitted.
+    """
+    pending = [ (start.replace(microsecond = 0), end.replace(microsecond = 0)) ]
+    shards = list()
+    while pending:
+        counts = pool.ordered(lambda x: count(review_requests, query_dict, *x),
+                pending, jobs)
+        divided = list()
+        for (first, last), n in zip(pending, counts):
+            seconds = int((last - first).total_seconds())
+            if n <= size or seconds <= 1:
+                if 0 < n:
+                    shards.append((first, last, n))
+                continue
+            parts = min(seconds, -(-n // size))
+            boundaries = [ first + datetime.timedelta(seconds = seconds * i //
+                parts) for i in range(parts) ] + [ last ]
+            divided.extend(zip(boundaries, boundaries[1:]))
+        pending = divided
+    return sorted(shards)
+
+
+def iter_shards(review_requests, start, end, query_dict = dict(),
+        size = 1000, jobs = 8):
+    """Obtain the review requests added in a time range, shard by shard.
+
+    The range is divided into shards (see plan). Up to jobs shards are
+    obtained concurrently, each by following its own next links, so no
+    request uses a large start offset and a failed request affects one shard
+    only. Review requests are yielded once, even if they appear in more than
+    one shard (e.g., when they change during the export). Duplicates are found
+    by id, so the id is always requested; it is removed from the review
+    requests yielded if only-fields leaves it out.
+
+    Args:
+        review_requests: the Review Request List Resource (a
+            ResourceFactory).
+        start: the datetime starting the range.
+        end: the datetime ending the range, which it excludes.
+        query_dict: a dictionary containing other HTTP command parameters
+            (e.g., status or only-fields).
+        size: the number of review requests each shard should hold.
+        jobs: the maximum number of requests made concurrently.
+
+    Returns:
+        A generator yielding a list of the review requests in each shard.
+        Shards may complete in any order but are yielded in the order of
+        their time ranges. Within a shard, review requests are in the order
+        Review Board lists them (most recently updated first), not the order
+        they were added. Review requests are returned as decoded (i.e.,
+        dictionaries).
+    """
+    fields = query_dict.get('only-fields')
+    strip = None != fields and 'id' not in fields.split(',')
+    shard_query = dict(query_dict, **{ 'only-fields': fields + ',id' }) \
+            if strip else query_dict
+    def fetch(shard):
+        shard_dict = dict(shard_query, **{ 'max-results': 200,
+            'time-added-from': isoformat(shard[0]),
+            'time-added-to': isoformat(shard[1]) })
+        return [ x for page in review_requests.iter_pages(shard_dict) for x in
+                page.json['review_requests'] ]
+    seen = set()
+    shards = plan(review_requests, start, end, query_dict, size, jobs)
+    for items in pool.ordered(fetch, shards, jobs):
+        unique = list()
+        for x in items:
+            i = x.pop('id') if strip else x['id']
+            if i not in seen:
+                seen.add(i)
+                unique.append(x)
+        yield unique
@@ -24,6 +24,11 @@
 # FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
 # IN THE SOFTWARE.
 #-------------------------------------------------------------------------------
+from resource import Resource
+from root import Root
+import state
+import time
+from urlparse import urlparse
 
 
 def login(session, url, username, password):
@@ -46,3 +51,134 @@ def login(session, url, username, password):
             csrfmiddlewaretoken = session.cookies['csrftoken'], next = '/')
         r = session.post(URL, data = login_data, headers = dict(Referer = URL))
     return r.status_code
+
+
+def session_file(url):
+    """Name the file holding the session saved for a Review Board server.
+
+    Args:
+        url: the Review Board URL.
+
+    Returns:
+        The file name.
+    """
+    return state.path('sessions', urlparse(url).netloc.replace(':', '_') + '.json')
+
+
+def save_session(session, url):
+    """Save the session cookies for use by later invocations.
+
+    The file is readable only by its owner.
+
+    Args:
+        session: the HTTP session.
+        url: the Review Board URL.
+    """
+    state.save(session_file(url), [ dict(name = x.name, value = x.value,
+        domain = x.domain, path = x.path, expires = x.expires,
+        secure = x.secure) for x in session.cookies ], mode = 0600)
+
+
+def load_session(session, url):
+    """Restore the session cookies saved by an earlier invocation.
+
+    The session is not validated. Review Board rejects requests made with an
+    expired session, so callers should log in again whenever this happens.
+
+    Args:
+        session: the HTTP session.
+        url: the Review Board URL.
+
+    Returns:
+        True if unexpired cookies were restored; False otherwise.
+    """
+    now = time.time()
+    restored = False
+    for cookie in state.load(session_file(url), list()):
+        if None != cookie['expires'] and cookie['expires'] <= now:
+            continue
+        session.cookies.set(cookie['name'], cookie['value'],
+                domain = cookie['domain'], path = cookie['path'],
+                expires = cookie['expires'], secure = cookie['secure'])
+        restored = True
+    return restored
+
+
+def token_login(session, token):
+    """Authenticate using an API token.
+
+    Every request made using the session, including those made by resources,
+    carries the token. No login requests are required.
+
+    Args:
+        session: the HTTP session.
+        token: the API token.
+    """
+    session.headers['Authorization'] = 'token ' + token
+
+
+def token_logout(session):
+    """Stop authenticating using an API token.
+
+    Args:
+        session: the HTTP session.
+    """
+    session.headers.pop('Authorization', None)
+
+
+def create_token(session, url, note = 'rbt'):
+    """Create an API token for the logged in user.
+
+    Args:
+        session: the HTTP session of a logged in user.
+        url: the Review Board URL.
+        note: a description of the token.
+
+    Returns:
+        The API token.
+    """
+    account = Root(session, url)().session()
+    href = account.json['session']['links']['user']['href'] + 'api-tokens/'
+    response = Resource(session, 'api_token').post(href, dict(note = note))
+    return response.api_token.token
+
+
+def token_file(url):
+    """Name the file holding the API token saved for a Review Board server.
+
+    Args:
+        url: the Review Board URL.
+
+    Returns:
+        The file name.
+    """
+    return state.path('tokens', urlparse(url).netloc.replace(':', '_') + '.json')
+
+
+def save_token(url, token):
+    """Save an API token for use by later invocations.
+
+    The file is readable only by its owner.
+
+    Args:
+        url: the Review Board URL.
+        token: the API token.
+    """
+    state.save(token_file(url), dict(token = token), mode = 0600)
+
+
+def load_token(session, url):
+    """Authenticate using the API token saved by an earlier invocation.
+
+    Args:
+        session: the HTTP session.
+        url: the Review Board URL.
+
+    Returns:
+        True if a token was saved for the server; False otherwise.
+    """
+    token = state.load(token_file(url), dict()).get('token')
+    if None == token:
+        return False
+    token_login(session, token)
+    return True
@@ -113,6 +113,15 @@ def test_review_requests_with_count_only_option(script, p1, p2, server):
     assert 'ok' == output['stat']
 
 
+@pytest.mark.parametrize("script", scripts)
+def test_review_requests_with_all_option(script, server):
+    """Validate the review requests from every page are printed as an array."""
+    output = json.loads(check_output(script, 'review-requests', server.url,
+        '--all', '--time-added-from=2016-03-19', '--time-added-to=2016-03-20'))
+    assert isinstance(output, list)
+    assert all('id' in x for x in output)
+
+
 post_parameters = [
      pkg_resources.resource_filename(__name__, "test_text_file")
 ]
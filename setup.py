@@ -77,6 +77,8 @@ setup(
     version = __version__,
     packages = [
         'rbtlib',
+        'rbtlib.resource',
+        'rbtlib.standin',
     ],
     install_requires = [
         'Click',
@@ -85,6 +87,12 @@ setup(
         'Sphinx',
     ],
     extras_require = {
+        'speedups': [
+            'ujson',
+        ],
+        'stats': [
+            'numpy',
+        ],
         'test': [
             'pytest',
             'radon',